@@ -0,0 +1,276 @@
+"""
+Persistent audio I/O for the Halloween Roaster.
+
+Opening ALSA devices on the Pi is slow and sometimes pops, so the mic and
+speaker streams are opened once at startup and run in PyAudio callback
+mode for the life of the process:
+
+  - playback: model audio is written into a lock-free byte ring; the
+    output callback drains it and pads with silence when it runs dry.
+  - capture:  the input callback appends every mic buffer to an always-on
+    capture ring; consumers skip to "now" with `mic_reset()` and then
+    pull CHUNK-sized reads with `read_mic()`.
+
+Both rings are single-producer / single-consumer: the producer only ever
+advances the write counter and the consumer only the read counter, so no
+lock is shared with the audio callbacks.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import pyaudio
+
+from audio_io import AudioIO
+
+
+class ByteRing:
+    """
+    Single-producer / single-consumer byte ring buffer.
+
+    `_w` and `_r` are monotonically increasing byte counts; each is written
+    by exactly one side, which is what makes it safe without a lock under
+    the GIL.  `request_clear()` may be called from any thread — it only
+    records a mark that the consumer jumps to on its next read.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf     = bytearray(capacity)
+        self._w       = 0
+        self._r       = 0
+        self._skip_to = 0
+
+    def available(self) -> int:
+        return self._w - max(self._r, self._skip_to)
+
+    def free(self) -> int:
+        return self.capacity - (self._w - self._r)
+
+    def write(self, data) -> int:
+        """Producer side. Returns bytes written (short when the ring is full)."""
+        mv  = memoryview(data)
+        n   = min(len(mv), self.free())
+        if n <= 0:
+            return 0
+        pos   = self._w % self.capacity
+        first = min(n, self.capacity - pos)
+        self._buf[pos:pos + first] = mv[:first]
+        if n > first:
+            self._buf[:n - first] = mv[first:n]
+        self._w += n            # publish only after the bytes are in place
+        return n
+
+    def read_into(self, out: memoryview) -> int:
+        """Consumer side. Fills `out` from the ring, returns bytes copied."""
+        if self._skip_to > self._r:
+            self._r = min(self._skip_to, self._w)
+        n = min(len(out), self._w - self._r)
+        if n <= 0:
+            return 0
+        pos   = self._r % self.capacity
+        first = min(n, self.capacity - pos)
+        out[:first] = self._buf[pos:pos + first]
+        if n > first:
+            out[first:n] = self._buf[:n - first]
+        self._r += n
+        return n
+
+    def request_clear(self):
+        """Discard everything written so far (applied by the consumer)."""
+        self._skip_to = self._w
+
+
+class AudioEngine(AudioIO):
+    """
+    Mic + speaker streams opened once and driven by PyAudio callbacks.
+
+    Args:
+        pa:            An initialised pyaudio.PyAudio instance, or None to
+                       create one (terminated again by `stop()`).
+        mic_rate:      Capture rate (Hz), 16-bit mono.
+        speaker_rate:  Playback rate (Hz), 16-bit mono.
+        chunk:         Frames per device buffer.
+        input_device:  PortAudio device index of the mic (None = default).
+        output_device: PortAudio device index of the speaker (None = default).
+        on_playback:   Optional hook called with each buffer as it is handed
+                       to the speaker (e.g. EchoGate.note_playback).
+    """
+
+    def __init__(
+        self,
+        pa: Optional[pyaudio.PyAudio],
+        mic_rate: int = 16000,
+        speaker_rate: int = 24000,
+        chunk: int = 1024,
+        playback_seconds: float = 60.0,
+        capture_seconds: float = 10.0,
+        on_playback: Optional[Callable[[bytes], None]] = None,
+        input_device: Optional[int] = None,
+        output_device: Optional[int] = None,
+    ):
+        self._own_pa      = pa is None
+        self.pa           = pa if pa is not None else pyaudio.PyAudio()
+        self.mic_rate     = mic_rate
+        self.speaker_rate = speaker_rate
+        self.chunk        = chunk
+        self.on_playback  = on_playback
+        self.input_device  = input_device
+        self.output_device = output_device
+
+        self.playback = ByteRing(int(speaker_rate * 2 * playback_seconds))
+        self.capture  = ByteRing(int(mic_rate * 2 * capture_seconds))
+
+        self._out_buf     = bytearray(chunk * 2)
+        self._mic_evt     = threading.Event()
+        self._expect_more = False   # a model turn is still streaming in
+        self._capturing   = False   # someone is consuming the capture ring
+        self._out = None
+        self._in  = None
+
+        # Metrics
+        self.underruns        = 0   # speaker callback starved mid-turn
+        self.overruns         = 0   # capture ring full while being consumed
+        self.device_underflow = 0   # PortAudio output underflow flags
+        self.device_overflow  = 0   # PortAudio input overflow flags
+        self.playback_dropped = 0   # bytes refused because the playback ring was full
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    def start(self):
+        self._out = self.pa.open(
+            format=pyaudio.paInt16, channels=1, rate=self.speaker_rate,
+            output=True, output_device_index=self.output_device,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._out_callback,
+        )
+        self._in = self.pa.open(
+            format=pyaudio.paInt16, channels=1, rate=self.mic_rate,
+            input=True, input_device_index=self.input_device,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._in_callback,
+        )
+        self._out.start_stream()
+        self._in.start_stream()
+
+    def stop(self):
+        for stream in (self._in, self._out):
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+        self._in = self._out = None
+        if self._own_pa:
+            self.pa.terminate()
+
+    # --------------------------------------------------------------------
+    # PortAudio callbacks (audio thread — keep them cheap)
+    # --------------------------------------------------------------------
+
+    def _out_callback(self, in_data, frame_count, time_info, status):
+        if status & pyaudio.paOutputUnderflow:
+            self.device_underflow += 1
+        nbytes = frame_count * 2
+        if len(self._out_buf) < nbytes:
+            self._out_buf = bytearray(nbytes)
+        out = memoryview(self._out_buf)[:nbytes]
+        got = self.playback.read_into(out)
+        if got < nbytes:
+            if self._expect_more:
+                self.underruns += 1
+            out[got:] = bytes(nbytes - got)
+        data = bytes(out)
+        if got and self.on_playback is not None:
+            self.on_playback(data)
+        return data, pyaudio.paContinue
+
+    def _in_callback(self, in_data, frame_count, time_info, status):
+        if status & pyaudio.paInputOverflow:
+            self.device_overflow += 1
+        if self.capture.write(in_data) < len(in_data) and self._capturing:
+            self.overruns += 1
+        self._mic_evt.set()
+        return None, pyaudio.paContinue
+
+    # --------------------------------------------------------------------
+    # Playback API
+    # --------------------------------------------------------------------
+
+    def play(self, pcm: bytes):
+        """Queue 16-bit PCM for the speaker without blocking."""
+        self._expect_more = True
+        written = self.playback.write(pcm)
+        self.playback_dropped += len(pcm) - written
+
+    def finish(self):
+        """The current turn has no more audio coming — silence is not an underrun."""
+        self._expect_more = False
+
+    def flush(self):
+        """Drop everything queued for the speaker (barge-in)."""
+        self._expect_more = False
+        self.playback.request_clear()
+
+    @property
+    def is_playing(self) -> bool:
+        return self.playback.available() > 0
+
+    def wait_drained(self, timeout: float = 15.0) -> bool:
+        """Block until queued audio has been handed to the device and played."""
+        deadline = time.monotonic() + timeout
+        while self.playback.available() > 0:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.02)
+        if self._out is not None:
+            time.sleep(self._out.get_output_latency())
+        return True
+
+    # --------------------------------------------------------------------
+    # Capture API
+    # --------------------------------------------------------------------
+
+    def mic_reset(self):
+        """Start consuming from "now": discard everything captured so far."""
+        self.capture.request_clear()
+        self._capturing = True
+
+    def mic_idle(self):
+        """Nobody is reading — a full capture ring is expected, not an overrun."""
+        self._capturing = False
+
+    def read_mic(self, nbytes: Optional[int] = None, timeout: float = 1.0) -> bytes:
+        """Blocking read of exactly `nbytes` (default one CHUNK) of mic PCM."""
+        nbytes   = nbytes or self.chunk * 2
+        out      = bytearray(nbytes)
+        mv       = memoryview(out)
+        got      = 0
+        deadline = time.monotonic() + timeout
+        while got < nbytes:
+            got += self.capture.read_into(mv[got:])
+            if got >= nbytes:
+                break
+            self._mic_evt.clear()
+            if self.capture.available() > 0:
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Device stalled — pad with silence rather than hang the caller
+                break
+            self._mic_evt.wait(remaining)
+        return bytes(out)
+
+    # --------------------------------------------------------------------
+    # Metrics
+    # --------------------------------------------------------------------
+
+    def metrics(self) -> dict:
+        return {
+            "underruns":        self.underruns,
+            "overruns":         self.overruns,
+            "device_underflow": self.device_underflow,
+            "device_overflow":  self.device_overflow,
+            "playback_dropped": self.playback_dropped,
+        }
@@ -0,0 +1,220 @@
+"""
+Audio I/O backends for the Halloween Roaster.
+
+`AudioIO` is the interface the roaster talks to — playback into the
+speaker, chunked reads from the mic.  Implementations:
+
+  - audio_engine.AudioEngine:  real mic + speaker through PyAudio
+  - ReplayAudio:               mic audio from a WAV file (or a synthetic
+                               reply), speaker output timed and discarded
+
+`ReplayAudio` plays the visitor's clip from the top on the first mic read
+after the model's turn has finished playing, and is silent otherwise.
+`mic_reset()` cuts off a clip left over from an earlier turn and
+`mic_idle()` forgets a turn nobody listened to, so a new session never
+opens with the visitor already talking.  Everything is paced at
+`speed` × real time (0 = as fast as possible), so a whole interaction
+can run faster than real time on a machine with no sound card.
+"""
+
+import threading
+import time
+import wave
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class AudioIO:
+    """
+    Interface shared by the audio backends.  Methods mirror AudioEngine;
+    `on_playback` (if set) is called with each buffer sent to the speaker.
+    """
+
+    on_playback: Optional[Callable[[bytes], None]] = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    # Playback
+    def play(self, pcm: bytes):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+    def flush(self):
+        raise NotImplementedError
+
+    @property
+    def is_playing(self) -> bool:
+        raise NotImplementedError
+
+    def wait_drained(self, timeout: float = 15.0) -> bool:
+        raise NotImplementedError
+
+    # Capture
+    def mic_reset(self):
+        pass
+
+    def mic_idle(self):
+        pass
+
+    def read_mic(self, nbytes: Optional[int] = None, timeout: float = 1.0) -> bytes:
+        raise NotImplementedError
+
+    def metrics(self) -> dict:
+        return {}
+
+
+# ----------------------------------------------------------------------------
+# File / synthetic backend
+# ----------------------------------------------------------------------------
+
+def read_wav(path: str, rate: int = 16000) -> bytes:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1 or wf.getframerate() != rate:
+            raise ValueError(f"{path}: expected {rate // 1000} kHz 16-bit mono PCM")
+        return wf.readframes(wf.getnframes())
+
+
+def synthetic_reply_pcm(seconds: float = 6.0, rate: int = 16000) -> bytes:
+    """Quiet porch, ~1.5 s of voice-like tone, then quiet again."""
+    rng = np.random.default_rng(1)
+    pcm = rng.normal(0, 80, int(seconds * rate))
+    t0, t1 = int(0.8 * rate), int(2.3 * rate)
+    t = np.arange(t1 - t0) / rate
+    pcm[t0:t1] += 3000 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    return np.clip(pcm, -32768, 32767).astype(np.int16).tobytes()
+
+
+class ReplayAudio(AudioIO):
+    """
+    Args:
+        mic_pcm:       16-bit mono PCM the "visitor" says each time.
+        mic_rate:      Sample rate of `mic_pcm`.
+        speaker_rate:  Sample rate of played audio (to time playback).
+        chunk:         Frames per mic read.
+        speed:         Pacing relative to real time; 0 = unpaced.
+    """
+
+    def __init__(
+        self,
+        mic_pcm: bytes,
+        mic_rate: int = 16000,
+        speaker_rate: int = 24000,
+        chunk: int = 1024,
+        speed: float = 1.0,
+        on_playback: Optional[Callable[[bytes], None]] = None,
+    ):
+        self.mic_pcm      = mic_pcm
+        self.mic_rate     = mic_rate
+        self.speaker_rate = speaker_rate
+        self.chunk        = chunk
+        self.speed        = speed
+        self.on_playback  = on_playback
+
+        self._lock       = threading.Lock()
+        self._pos        = len(mic_pcm)       # silent until the visitor is due to talk
+        self._due        = False              # model's turn drained: clip starts on the next read
+        self._play_until = 0.0
+        self._mic_next   = 0.0
+
+        self.played_bytes = 0
+        self.mic_bytes    = 0
+
+    # Playback --------------------------------------------------------------
+
+    def play(self, pcm: bytes):
+        dur = len(pcm) / 2 / self.speaker_rate / self.speed if self.speed else 0.0
+        with self._lock:
+            self._play_until = max(time.monotonic(), self._play_until) + dur
+        self.played_bytes += len(pcm)
+        if self.on_playback is not None:
+            self.on_playback(pcm)
+
+    def flush(self):
+        with self._lock:
+            self._play_until = 0.0
+
+    @property
+    def is_playing(self) -> bool:
+        return time.monotonic() < self._play_until
+
+    def wait_drained(self, timeout: float = 15.0) -> bool:
+        remaining = self._play_until - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return False
+        if remaining > 0:
+            time.sleep(remaining)
+        self._due = True          # the model is done talking — the visitor answers
+        return True
+
+    # Capture ---------------------------------------------------------------
+
+    def mic_reset(self):
+        # Skip to "now": whatever is left of an earlier reply is gone.  A
+        # turn that just drained still gets its answer on the next read.
+        self._pos = len(self.mic_pcm)
+
+    def mic_idle(self):
+        # Nobody listened to that turn (the session ended) — don't answer it
+        # over the next interaction's roast
+        self._pos = len(self.mic_pcm)
+        self._due = False
+
+    def read_mic(self, nbytes: Optional[int] = None, timeout: float = 1.0) -> bytes:
+        nbytes = nbytes or self.chunk * 2
+        if self.speed:
+            now = time.monotonic()
+            if self._mic_next > now:
+                time.sleep(self._mic_next - now)
+            self._mic_next = max(now, self._mic_next) + nbytes / 2 / self.mic_rate / self.speed
+        if self._due:
+            self._pos, self._due = 0, False
+        data = self.mic_pcm[self._pos:self._pos + nbytes]
+        self._pos += nbytes
+        self.mic_bytes += nbytes
+        return data + bytes(nbytes - len(data))
+
+    def metrics(self) -> dict:
+        return {"played_bytes": self.played_bytes, "mic_bytes": self.mic_bytes}
+
+
+# ----------------------------------------------------------------------------
+# Factory
+# ----------------------------------------------------------------------------
+
+def open_audio(
+    spec: str,
+    mic_rate: int = 16000,
+    speaker_rate: int = 24000,
+    chunk: int = 1024,
+    speed: float = 1.0,
+) -> AudioIO:
+    """
+    Build an (unstarted) backend from a CLI spec:
+        pyaudio[:I[,O]]  mic device I and speaker device O (default devices;
+                         O defaults to I — one USB speakerphone per door)
+        wav:PATH         visitor replies replayed from a 16 kHz mono WAV
+        synthetic        generated visitor reply
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "pyaudio":
+        from audio_engine import AudioEngine    # needs PyAudio + a sound card
+        devices = [int(d) for d in arg.split(",")] if arg else [None]
+        return AudioEngine(
+            None, mic_rate=mic_rate, speaker_rate=speaker_rate, chunk=chunk,
+            input_device=devices[0], output_device=devices[-1],
+        )
+    if kind == "wav" and arg:
+        pcm = read_wav(arg, rate=mic_rate)
+    elif kind == "synthetic":
+        pcm = synthetic_reply_pcm(rate=mic_rate)
+    else:
+        raise ValueError(f"Unknown audio backend {spec!r} (pyaudio[:I[,O]], wav:PATH, synthetic)")
+    return ReplayAudio(pcm, mic_rate=mic_rate, speaker_rate=speaker_rate, chunk=chunk, speed=speed)
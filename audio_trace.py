@@ -0,0 +1,180 @@
+"""
+Optional audio tracing for the Halloween Roaster.
+
+With `--trace-audio`, each interaction's model audio (24 kHz) and the
+visitor audio we sent to Gemini (16 kHz) are streamed to per-interaction
+files next to the other traces:
+
+    traces/audio/<trace id>_model.flac
+    traces/audio/<trace id>_visitor.flac
+
+The audio path only enqueues chunks (`AudioTrace.model()` / `.visitor()`
+never block); one writer thread owns the files and does the encoding, so
+nothing is held in memory beyond the queue.  Turns are concatenated — the
+gaps between them are not recorded.
+
+FLAC needs the optional `soundfile` package (libsndfile); without it the
+files are written as plain WAV.
+"""
+
+import queue
+import threading
+import wave
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import soundfile
+except ImportError:                  # optional: pip install soundfile
+    soundfile = None
+
+
+class AudioTrace:
+    """Producer handle for one interaction's audio files."""
+
+    def __init__(self, writer: "AudioTraceWriter", trace_id: str, files: dict):
+        self._writer  = writer
+        self.trace_id = trace_id
+        self.files    = files          # {"model": "audio/...", "visitor": "audio/..."}
+
+    def model(self, pcm: bytes):
+        self._writer._put_data((self.trace_id, "model"), pcm)
+
+    def visitor(self, pcm: bytes):
+        self._writer._put_data((self.trace_id, "visitor"), pcm)
+
+    def close(self) -> dict:
+        """Finish both files (asynchronously). Returns the paths for the trace."""
+        for stream in self.files:
+            self._writer._put_ctrl(("close", (self.trace_id, stream)))
+        return dict(self.files)
+
+
+class AudioTraceWriter:
+    """
+    Writer thread that encodes traced PCM to FLAC (or WAV).
+
+    Args:
+        root:        Trace directory; files go to `root/audio/`.
+        mic_rate:    Visitor audio sample rate.
+        model_rate:  Model audio sample rate.
+        max_queue:   Chunks that may wait for the writer before new ones
+                     are dropped (and counted).
+    """
+
+    def __init__(
+        self,
+        root,
+        mic_rate: int = 16000,
+        model_rate: int = 24000,
+        max_queue: int = 1024,
+    ):
+        self.root  = Path(root)
+        self.rates = {"model": model_rate, "visitor": mic_rate}
+        self.ext   = "flac" if soundfile is not None else "wav"
+        (self.root / "audio").mkdir(parents=True, exist_ok=True)
+
+        self._q: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._open: dict = {}          # (trace_id, stream) -> file object (writer thread only)
+
+        self.chunks_dropped = 0
+        self.bytes_written  = 0
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="audio-trace", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 10.0):
+        if self._thread is None:
+            return
+        self._put_ctrl(None, timeout)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "format":         self.ext,
+            "bytes_written":  self.bytes_written,
+            "chunks_dropped": self.chunks_dropped,
+        }
+
+    # --------------------------------------------------------------------
+    # Producer API
+    # --------------------------------------------------------------------
+
+    def open(self, trace_id: str) -> AudioTrace:
+        files = {s: f"audio/{trace_id}_{s}.{self.ext}" for s in self.rates}
+        for stream, rel in files.items():
+            self._put_ctrl(("open", (trace_id, stream), self.root / rel, self.rates[stream]))
+        return AudioTrace(self, trace_id, files)
+
+    def _put_data(self, key, pcm: bytes):
+        try:
+            self._q.put_nowait(("data", key, pcm))
+        except queue.Full:
+            self.chunks_dropped += 1
+
+    def _put_ctrl(self, msg, timeout: float = 2.0):
+        # Control messages come from the interaction path, not the audio
+        # hot path, so waiting briefly for room beats losing a file
+        try:
+            self._q.put(msg, timeout=timeout)
+        except queue.Full:
+            print("  ⚠️  Audio trace queue stuck; control message dropped")
+
+    # --------------------------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            while True:
+                msg = self._q.get()
+                if msg is None:
+                    break
+                try:
+                    self._handle(msg)
+                except Exception as exc:   # one bad file shouldn't end tracing
+                    print(f"  ⚠️  Audio trace write failed: {exc}")
+        finally:
+            for f in self._open.values():
+                f.close()
+            self._open.clear()
+
+    def _handle(self, msg):
+        kind, key = msg[0], msg[1]
+        if kind == "open":
+            path, rate = msg[2], msg[3]
+            if soundfile is not None:
+                f = soundfile.SoundFile(
+                    str(path), "w", samplerate=rate, channels=1,
+                    format="FLAC", subtype="PCM_16",
+                )
+            else:
+                f = wave.open(str(path), "wb")
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(rate)
+            self._open[key] = f
+        elif kind == "data":
+            f = self._open.get(key)
+            if f is None:
+                return
+            if soundfile is not None:
+                f.write(np.frombuffer(msg[2], np.int16))
+            else:
+                f.writeframes(msg[2])
+            self.bytes_written += len(msg[2])
+        elif kind == "close":
+            f = self._open.pop(key, None)
+            if f is not None:
+                f.close()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the Halloween Roaster — no camera, mic, speaker or
+network needed.
+
+  detect  Replays camera clips (or a synthetic porch) through the motion
+          stage, and optionally YOLO on the motion crops.
+  capture Decodes MJPG frames at full size and at 1/2, 1/4, 1/8 (DCT-domain
+          scaled decode) and runs motion on them: CPU per frame per mode.
+  burst   Scores bursts of replayed frames for the best costume still
+          (sharpness + framing, optionally one batched YOLO call each).
+  vad     Replays mic WAVs (or a synthetic clip) through `record_pcm`.
+  live    Runs whole `_live_session` interactions against a local fake
+          Gemini Live server streaming canned 24 kHz PCM.  With
+          `--speculate`, each starts as a speculation on (simulated) motion
+          and is claimed when the (simulated) YOLO confirmation arrives.
+
+Each section reports throughput, CPU (process time / wall time — the fake
+server runs in the same process), peak RSS and latency percentiles.
+`--json` writes the numbers to a file for comparing runs.
+
+Examples:
+  python3 benchmark.py                              # all sections, synthetic inputs
+  python3 benchmark.py detect --clip porch.mp4 --yolo
+  python3 benchmark.py capture --clip porch.mp4      # dual-stream decode cost
+  python3 benchmark.py burst --clip porch.mp4 --yolo --burst 6
+  python3 benchmark.py vad --wav reply1.wav --wav reply2.wav
+  python3 benchmark.py live --interactions 20 --first-byte-ms 600 --speed 4
+  python3 benchmark.py live --stations 3 --speed 4  # aggregate throughput, 3 doors
+  python3 benchmark.py live --speculate --confirm-ms 200 --capture-ms 250
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+import numpy as np
+
+from audio_io import ReplayAudio, read_wav, synthetic_reply_pcm
+from camera import SyntheticSource, VideoFileSource
+from timing import RollingStats, SpanTimer
+
+MIC_RATE = 16000
+CHUNK    = 1024
+
+
+# ----------------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------------
+
+class Usage:
+    """Wall time, CPU time and peak RSS over a block."""
+
+    def __init__(self):
+        self.wall_s  = 0.0
+        self.cpu_s   = 0.0
+        self.peak_mb = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "wall_s":  round(self.wall_s, 3),
+            "cpu_s":   round(self.cpu_s, 3),
+            "cpu_pct": round(100 * self.cpu_s / self.wall_s, 1) if self.wall_s else None,
+            "peak_mb": round(self.peak_mb, 1),
+        }
+
+
+@contextmanager
+def measure():
+    usage = Usage()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield usage
+    finally:
+        usage.wall_s  = time.perf_counter() - wall0
+        usage.cpu_s   = time.process_time() - cpu0
+        usage.peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # KB on Linux
+
+
+def _print_section(title: str, result: dict):
+    print(f"\n── {title} " + "─" * max(0, 44 - len(title)))
+    for key, value in result.items():
+        if isinstance(value, dict) and value and all(isinstance(v, dict) for v in value.values()):
+            print(f"  {key}:")
+            for name, stats in value.items():
+                print(f"    {name:<22} {stats}")
+        else:
+            print(f"  {key:<24} {value}")
+
+
+# ----------------------------------------------------------------------------
+# Inputs
+# ----------------------------------------------------------------------------
+
+def replay_frames(clips: List[str], synthetic_frames: int = 300):
+    """Frames of each clip in turn (unpaced), or a synthetic porch."""
+    sources = [VideoFileSource(c, speed=0, loop=False) for c in clips]
+    if not sources:
+        source = SyntheticSource(speed=0, period=5.0, visit=2.0)
+        for _ in range(synthetic_frames):
+            yield source.read()[1]
+        return
+    for source in sources:
+        try:
+            while True:
+                ok, frame = source.read()
+                if not ok:
+                    break
+                yield frame
+        finally:
+            source.release()
+
+
+def bench_roaster(audio, connect=None, stream_mic: bool = True, prewarm: bool = True):
+    """
+    A manual-mode HalloweenRoaster replaying `audio`, talking to a fake Live
+    server through `connect` (a `FakeLiveServer.connector()`), with a slow
+    synthetic camera and throwaway traces.  Call `cleanup()` when done.
+    """
+    import tempfile
+    from types import SimpleNamespace
+
+    from halloween_roaster import HalloweenRoaster
+
+    # Just the bit of genai.Client the Live pool calls
+    client = SimpleNamespace(aio=SimpleNamespace(live=SimpleNamespace(
+        connect=lambda **config: connect(),
+    )))
+    r = HalloweenRoaster(
+        auto_detect=False, stream_mic=stream_mic, prewarm_live=prewarm,
+        frame_source=SyntheticSource(width=320, height=240, fps=5),
+        audio_io=audio, client=client,
+        traces_dir=tempfile.mkdtemp(prefix="bench-traces-"),
+    )
+    r._finish_startup()
+    return r
+
+
+# ----------------------------------------------------------------------------
+# Sections
+# ----------------------------------------------------------------------------
+
+def bench_detect(clips: List[str], yolo: bool = False, motion_width: int = 320) -> dict:
+    from motion import MotionDetector, pad_box
+
+    motion = MotionDetector(work_width=motion_width)
+    model  = None
+    if yolo:
+        from model_cache import load_person_model
+        model, source = load_person_model("yolo11n.pt", imgsz=320)
+        model(np.zeros((320, 320, 3), np.uint8), verbose=False, imgsz=320)
+        print(f"  YOLO11n loaded ({source})")
+
+    stats  = RollingStats(window=100_000)
+    frames = hits = persons = 0
+    with measure() as usage:
+        for frame in replay_frames(clips):
+            frames += 1
+            result = motion.process(frame)
+            stats.add("motion", result.cost_ms)
+            if not result.moved:
+                continue
+            hits += 1
+            if model is None:
+                continue
+            x0, y0, x1, y1 = pad_box(result.box, frame.shape)
+            t0 = time.perf_counter()
+            res = model(frame[y0:y1, x0:x1], conf=0.4, classes=[0], verbose=False, imgsz=320)
+            stats.add("yolo", (time.perf_counter() - t0) * 1000)
+            persons += int(len(res[0].boxes) > 0)
+
+    return {
+        "frames":       frames,
+        "motion_hits":  hits,
+        "persons":      persons if model is not None else None,
+        "fps":          round(frames / usage.wall_s, 1) if usage.wall_s else None,
+        "usage":        usage.as_dict(),
+        "latency_ms":   stats.summary(),
+    }
+
+
+def replay_jpegs(clips: List[str], synthetic_frames: int = 300) -> List[np.ndarray]:
+    """The frames a raw-mode MJPG camera would deliver (encoded up front, not timed)."""
+    import cv2
+
+    if not clips:
+        source = SyntheticSource(speed=0, period=5.0, visit=2.0, mjpg=True)
+        return [source.read()[1] for _ in range(synthetic_frames)]
+    return [cv2.imencode(".jpg", f, [cv2.IMWRITE_JPEG_QUALITY, 85])[1] for f in replay_frames(clips)]
+
+
+def bench_capture(clips: List[str], scales=(1, 2, 4, 8), motion_width: int = 320) -> dict:
+    from camera import JpegDecoder
+    from motion import MotionDetector
+
+    jpegs   = replay_jpegs(clips)
+    decoder = JpegDecoder()
+    modes   = {}
+    for scale in scales:
+        motion = MotionDetector(work_width=motion_width)
+        stats  = RollingStats(window=100_000)
+        with measure() as usage:
+            for jpeg in jpegs:
+                t0  = time.perf_counter()
+                img = decoder.decode(jpeg, scale)
+                t1  = time.perf_counter()
+                motion.process(img, scale)
+                stats.add("decode", (t1 - t0) * 1000)
+                stats.add("motion", (time.perf_counter() - t1) * 1000)
+        cpu_ms = usage.cpu_s * 1000 / len(jpegs)
+        summary = stats.summary()
+        modes[f"1/{scale}"] = {
+            "stream":        "x".join(map(str, img.shape[1::-1])),
+            "cpu_ms":        round(cpu_ms, 2),
+            "cpu_pct_30fps": round(cpu_ms * 30 / 10, 1),     # of one core, at camera rate
+            "decode_p50":    summary["decode"]["p50"],
+            "motion_p50":    summary["motion"]["p50"],
+        }
+
+    t0 = time.perf_counter()
+    decoder.decode(jpegs[len(jpegs) // 2])
+    return {
+        "frames":          len(jpegs),
+        "decoder":         decoder.backend,
+        "jpeg_kb":         round(sum(len(j) for j in jpegs) / len(jpegs) / 1024, 1),
+        "still_decode_ms": round((time.perf_counter() - t0) * 1000, 1),   # one on-demand full decode
+        "modes":           modes,
+    }
+
+
+def bench_burst(clips: List[str], frames_per_burst: int = 4, yolo: bool = False) -> dict:
+    from best_shot import downscale, score_burst
+    from detection_engine import person_detections, run_person_model
+
+    model = batched = None
+    if yolo:
+        from model_cache import load_person_model
+        model, source = load_person_model("yolo11n.pt", imgsz=320)
+        batched = source == "pytorch"
+        model(np.zeros((320, 320, 3), np.uint8), verbose=False, imgsz=320)
+        print(f"  YOLO11n loaded ({source})")
+
+    stats  = RollingStats(window=100_000)
+    bursts = picked_later = 0
+    burst: list = []
+    with measure() as usage:
+        for frame in replay_frames(clips):
+            burst.append(frame)
+            if len(burst) < frames_per_burst:
+                continue
+            t0 = time.perf_counter()
+            small, _ = downscale(burst)
+            t1 = time.perf_counter()
+            dets = None
+            if model is not None:
+                dets = [person_detections(r) for r in run_person_model(
+                    model, small, batched, conf=0.4, classes=[0], verbose=False, imgsz=320,
+                )]
+            t2 = time.perf_counter()
+            best = max(score_burst(small, dets), key=lambda s: s.score)
+            t3 = time.perf_counter()
+            stats.add("downscale", (t1 - t0) * 1000)
+            if model is not None:
+                stats.add("yolo", (t2 - t1) * 1000)
+            stats.add("score", (t3 - t2) * 1000)
+            stats.add("total", (t3 - t0) * 1000)
+            bursts += 1
+            picked_later += best.index > 0
+            burst = []
+
+    return {
+        "bursts":        bursts,
+        "frames_each":   frames_per_burst,
+        "not_newest":    picked_later,      # bursts where the first frame wasn't the best
+        "usage":         usage.as_dict(),
+        "latency_ms":    stats.summary(),
+    }
+
+
+def bench_vad(wavs: List[str], repeat: int = 20) -> dict:
+    clips = [read_wav(w) for w in wavs] or [synthetic_reply_pcm()]
+    audio = ReplayAudio(b"", speed=0)
+    r     = bench_roaster(audio, stream_mic=False)
+    r.cleanup()                       # record_pcm needs no camera or traces
+    stats = RollingStats(window=100_000)
+    heard = chunks = 0
+
+    with measure() as usage:
+        for _ in range(repeat):
+            for clip in clips:
+                audio.mic_pcm = clip
+                audio.wait_drained()          # "model done talking": the visitor replies
+                t0  = time.perf_counter()
+                pcm = r.record_pcm(max_seconds=8, silence_timeout=2.0)
+                stats.add("record_pcm", (time.perf_counter() - t0) * 1000)
+                heard  += pcm is not None
+                chunks += r.vad.samples_seen // CHUNK
+
+    return {
+        "utterances":     repeat * len(clips),
+        "speech_found":   heard,
+        "chunks":         chunks,
+        "chunks_per_s":   round(chunks / usage.wall_s) if usage.wall_s else None,
+        "realtime_x":     round(chunks * CHUNK / MIC_RATE / usage.wall_s, 1) if usage.wall_s else None,
+        "usage":          usage.as_dict(),
+        "latency_ms":     stats.summary(),
+    }
+
+
+async def _bench_live(
+    interactions: int, mic_pcm: bytes, stream_mic: bool, speed: float,
+    setup_ms: float, first_byte_ms: float, prewarm: bool, stations: int = 1,
+    speculate: bool = False, confirm_ms: float = 0, capture_ms: float = 0,
+) -> dict:
+    from google.genai import types
+
+    from fake_live import FakeLiveServer
+    from speculation import Speculator
+
+    jpeg = b"\xff\xd8 fake costume jpeg"
+
+    async def _prepare(spec):
+        await asyncio.sleep(capture_ms / 1000)          # burst + encode
+        await spec.session.send_realtime_input(video=types.Blob(data=jpeg, mime_type="image/jpeg"))
+        return jpeg
+
+    server = FakeLiveServer(
+        setup_delay=setup_ms / 1000, first_byte_delay=first_byte_ms / 1000, speed=speed,
+    )
+    await server.start()
+    # One roaster per door, all on this loop, like stations.py runs them
+    roasters = [
+        bench_roaster(ReplayAudio(mic_pcm, speed=speed), server.connector(),
+                      stream_mic=stream_mic, prewarm=prewarm)
+        for _ in range(stations)
+    ]
+    for r in roasters:
+        await r.live_pool.start()
+        if speculate:
+            r.speculator = Speculator(r.live_pool, _prepare, log=lambda msg: None)
+            r.speculator.bind(asyncio.get_running_loop())
+
+    stats = RollingStats(window=100_000)
+    exchanges = failed = roast_barge_ins = 0
+
+    async def _door(r):
+        nonlocal exchanges, failed, roast_barge_ins
+        for _ in range(interactions):
+            await asyncio.sleep(0.2)          # idle porch: lets the pool re-warm
+            # Marks are measured from the motion; YOLO confirms confirm_ms later
+            r.spans = SpanTimer()
+            spec = None
+            if r.speculator is not None:
+                r.speculator.on_motion(r.spans.origin)
+            await asyncio.sleep(confirm_ms / 1000)
+            r.spans.mark("person")
+            if r.speculator is not None:
+                spec = r.speculator.claim()
+                if spec is None or await r.speculator.ready(spec) is None:
+                    # Nothing usable to claim: a failure, not a timing sample
+                    if spec is not None:
+                        await r.speculator.release(spec)
+                    failed += 1
+                    continue
+            else:
+                await asyncio.sleep(capture_ms / 1000)
+            r.spans.mark("start")
+            result = await r._live_session(jpeg, spec)
+            r.spans.mark("done")
+            marks = r.spans.marks
+            # The visitor's clip only plays on their turns, so this should stay 0
+            roast_barge_ins += marks.get("barge_in", float("inf")) < marks.get("roast.done", 0)
+            stats.add_spans(r.spans)
+            exchanges += result["exchanges_count"]
+
+    try:
+        with measure() as usage:
+            await asyncio.gather(*(_door(r) for r in roasters))
+    finally:
+        for r in roasters:
+            await r.live_pool.close()
+        await server.close()
+        for r in roasters:
+            r.cleanup()
+
+    pools = [r.live_pool.stats() for r in roasters]
+    total = interactions * stations
+    return {
+        "stations":      stations,
+        "interactions":  total,
+        "exchanges":     exchanges,
+        "failed":        failed,
+        "roast_barge_ins": roast_barge_ins,
+        "per_minute":    round(total * 60 / usage.wall_s, 1) if usage.wall_s else None,
+        "mode":          "streaming" if stream_mic else "local-vad",
+        "pool":          pools[0] if stations == 1 else pools,
+        "speculation":   roasters[0].speculator.stats() if speculate else None,
+        "server":        server.stats(),
+        "usage":         usage.as_dict(),
+        "latency_ms":    stats.summary(),
+    }
+
+
+def bench_live(interactions: int = 5, wav: Optional[str] = None, **kwargs) -> dict:
+    mic_pcm = read_wav(wav) if wav else synthetic_reply_pcm()
+    return asyncio.run(_bench_live(interactions, mic_pcm, **kwargs))
+
+
+# ----------------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Offline benchmarks for the Halloween Roaster",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Examples:" + __doc__.split("Examples:")[1],
+    )
+    parser.add_argument("sections", nargs="*", metavar="detect|capture|burst|vad|live",
+                        help="Which benchmarks to run (default: all)")
+    parser.add_argument("--clip", action="append", default=[], help="Camera clip to replay (repeatable)")
+    parser.add_argument("--yolo", action="store_true", help="Also run YOLO11n on motion crops")
+    parser.add_argument("--motion-width", type=int, default=320)
+    parser.add_argument("--burst", type=int, default=4, help="Frames per burst in the burst bench")
+    parser.add_argument("--wav", action="append", default=[],
+                        help="16 kHz mono mic WAV to replay (repeatable; live uses the first)")
+    parser.add_argument("--repeat", type=int, default=20, help="VAD passes over the WAVs")
+    parser.add_argument("--interactions", type=int, default=5)
+    parser.add_argument("--stations", type=int, default=1,
+                        help="Doors running interactions concurrently in the live bench")
+    parser.add_argument("--local-vad", action="store_true", help="Live bench records replies locally")
+    parser.add_argument("--no-prewarm", action="store_true")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Mic/reply pacing vs real time; 0 = unpaced (default: 1.0)")
+    parser.add_argument("--setup-ms", type=float, default=50, help="Fake server handshake delay")
+    parser.add_argument("--first-byte-ms", type=float, default=300, help="Fake server thinking time")
+    parser.add_argument("--speculate", action="store_true",
+                        help="Live bench opens the session and sends the still on motion")
+    parser.add_argument("--confirm-ms", type=float, default=0,
+                        help="Simulated motion → YOLO confirmation delay in the live bench")
+    parser.add_argument("--capture-ms", type=float, default=0,
+                        help="Simulated still capture + encode time in the live bench")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    sections = args.sections or ["detect", "capture", "burst", "vad", "live"]
+    unknown  = set(sections) - {"detect", "capture", "burst", "vad", "live"}
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(sorted(unknown))}")
+    results  = {}
+    if "detect" in sections:
+        results["detect"] = bench_detect(args.clip, yolo=args.yolo, motion_width=args.motion_width)
+        _print_section("detect", results["detect"])
+    if "capture" in sections:
+        results["capture"] = bench_capture(args.clip, motion_width=args.motion_width)
+        _print_section("capture", results["capture"])
+    if "burst" in sections:
+        results["burst"] = bench_burst(args.clip, frames_per_burst=args.burst, yolo=args.yolo)
+        _print_section("burst", results["burst"])
+    if "vad" in sections:
+        results["vad"] = bench_vad(args.wav, repeat=args.repeat)
+        _print_section("vad", results["vad"])
+    if "live" in sections:
+        results["live"] = bench_live(
+            args.interactions, wav=args.wav[0] if args.wav else None,
+            stream_mic=not args.local_vad, speed=args.speed,
+            setup_ms=args.setup_ms, first_byte_ms=args.first_byte_ms,
+            prewarm=not args.no_prewarm, stations=args.stations,
+            speculate=args.speculate, confirm_ms=args.confirm_ms, capture_ms=args.capture_ms,
+        )
+        _print_section("live", results["live"])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
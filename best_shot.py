@@ -0,0 +1,138 @@
+"""
+Best-shot selection for the costume still.
+
+The frame that confirmed a visitor is often not the one to roast: they are
+mid-step, half out of frame or motion-blurred.  Instead of sending the
+newest frame, the roaster takes a short burst (a few frames over a few
+hundred milliseconds), runs YOLO on the whole burst in one batched call
+and picks the frame where the visitor is large, centred, fully in frame,
+confidently detected and sharp.
+
+Sharpness is the variance of the Laplacian, computed in NumPy for the
+whole burst at once and measured inside each frame's person box, so a
+sharp porch behind a blurred visitor doesn't win.  Scoring runs on
+downscaled copies (`SCORE_EDGE`); only the winner is encoded at full
+resolution.
+"""
+
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from motion import Box
+
+SCORE_EDGE = 640        # long edge the burst is scored at
+
+
+class Shot(NamedTuple):
+    """Score of one burst frame (box and sharpness at scoring resolution)."""
+    index:      int
+    score:      float
+    box:        Optional[Box]
+    confidence: float
+    sharpness:  float
+
+
+def capture_burst(grabber, count: int, window: float) -> list:
+    """
+    Copy up to `count` consecutive frames out of the grabber, starting with
+    the newest, spending at most `window` seconds waiting for new ones.
+    Frames are copied: the ring reuses its slots faster than a burst lasts.
+    """
+    first = grabber.latest(copy=True)
+    if first is None:
+        return []
+    frames   = [first]
+    deadline = time.monotonic() + window
+    while len(frames) < count:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        frame = grabber.wait_newer(frames[-1].ts, timeout=remaining, copy=True)
+        if frame is None:
+            break
+        frames.append(frame)
+    return frames
+
+
+def downscale(images: Sequence[np.ndarray], long_edge: int = SCORE_EDGE):
+    """Scale same-sized frames to `long_edge`; returns (small images, scale factor)."""
+    import cv2
+
+    h, w  = images[0].shape[:2]
+    scale = min(1.0, long_edge / max(h, w))
+    if scale == 1.0:
+        return list(images), 1.0
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return [cv2.resize(img, size, interpolation=cv2.INTER_AREA) for img in images], scale
+
+
+def laplacian(images: Sequence[np.ndarray]) -> np.ndarray:
+    """4-neighbour Laplacian of the grey level of each same-sized BGR image, (K, H-2, W-2)."""
+    stack = np.stack(images)
+    # BT.601 luma, one pass over the whole burst
+    grey = stack @ np.array([0.114, 0.587, 0.299], np.float32)
+    return (grey[:, :-2, 1:-1] + grey[:, 2:, 1:-1] + grey[:, 1:-1, :-2] + grey[:, 1:-1, 2:]
+            - 4.0 * grey[:, 1:-1, 1:-1])
+
+
+def _framing(box: Box, w: int, h: int) -> float:
+    """How well `box` frames a visitor in a w×h image, 0..1."""
+    x0, y0, x1, y1 = box
+    area = max(0, x1 - x0) * max(0, y1 - y0) / float(w * h)
+    size = min(1.0, np.sqrt(area / 0.25))           # filling a quarter of the frame is plenty
+    off  = abs((x0 + x1) / 2.0 - w / 2.0) / (w / 2.0)
+    centred = 1.0 - 0.5 * off
+    # Cut off at the side or the top: a costume half out of the picture
+    clipped = 0.6 if (x0 <= 2 or x1 >= w - 2 or y0 <= 2) else 1.0
+    return size * centred * clipped
+
+
+def score_burst(
+    images: Sequence[np.ndarray],
+    detections: Optional[List[list]] = None,
+) -> List[Shot]:
+    """
+    Score same-sized frames of a burst.
+
+    Args:
+        images:     BGR frames (at scoring resolution).
+        detections: Per frame [(conf, x0, y0, x1, y1)] from YOLO, or None
+                    when no detector is available (sharpness only).
+
+    The framing score (size × centring × not clipped × confidence) of each
+    frame's best person is weighted by its sharpness relative to the
+    sharpest frame of the burst.  Frames without a person score zero
+    unless no frame has one, in which case the sharpest frame wins.
+    """
+    lap = laplacian(images)
+    h, w = images[0].shape[:2]
+
+    boxes: List[Optional[Box]] = []
+    people = np.zeros(len(images))
+    confs  = np.zeros(len(images))
+    for i, dets in enumerate(detections or [[] for _ in images]):
+        best, best_box = 0.0, None
+        for conf, x0, y0, x1, y1 in dets:
+            framing = conf * _framing((x0, y0, x1, y1), w, h)
+            if framing > best:
+                best, best_box, confs[i] = framing, (x0, y0, x1, y1), conf
+        people[i] = best
+        boxes.append(best_box)
+
+    sharp = np.empty(len(images))
+    for i, box in enumerate(boxes):
+        region = lap[i]
+        if box is not None:
+            # Laplacian index (y, x) is pixel (y + 1, x + 1)
+            region = lap[i, max(0, box[1] - 1):max(0, box[3] - 1),
+                            max(0, box[0] - 1):max(0, box[2] - 1)]
+        sharp[i] = region.var() if region.size > 1 else 0.0
+
+    rel = sharp / sharp.max() if sharp.max() > 0 else np.ones(len(images))
+    scores = people * (0.5 + 0.5 * rel) if people.any() else rel
+    return [
+        Shot(i, float(scores[i]), boxes[i], float(confs[i]), float(sharp[i]))
+        for i in range(len(images))
+    ]
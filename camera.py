@@ -0,0 +1,512 @@
+"""
+Camera capture for the Halloween Roaster.
+
+A single background thread owns the V4L2 device and decodes MJPG frames
+continuously into a small preallocated ring.  Consumers (motion detection,
+YOLO, still capture) never call `cap.read()` themselves — they ask for the
+freshest frame with `latest()` or block briefly with `wait_newer(ts)`, so
+everybody sees the same timestamped frame and nothing sits stale in the
+driver queue.
+
+The grabber reads from a `FrameSource`: the USB camera over V4L2, a
+recorded video file, or a synthetic porch.  File and synthetic sources
+pace themselves (`speed` × real time, 0 = as fast as possible), so the
+whole pipeline can run on a machine without a camera.
+
+Dual-stream capture: motion and YOLO work at a few hundred pixels, so
+decoding every 1080p MJPG frame in full is wasted CPU (and heat, over a
+long night).  With `detect_scale` > 1 the grabber takes the camera's JPEG
+bytes and decodes them at 1/2, 1/4 or 1/8 size in the DCT domain (libjpeg
+scaled IDCT — most of the decode work is skipped, not resized away).  The
+JPEG stays attached to the frame, and `Frame.full_image()` decodes it at
+full resolution only when a still is actually wanted.
+"""
+
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from timing import RollingStats
+
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:                  # optional: pip install PyTurboJPEG
+    TurboJPEG = None
+
+
+class Frame(NamedTuple):
+    """
+    One decoded camera frame. `ts` is time.monotonic() at decode time.
+
+    `image` is the detection stream: camera resolution divided by `scale`.
+    Boxes found in it are multiplied by `scale` for the full frame.
+    """
+    ts:    float
+    seq:   int
+    image: np.ndarray
+    scale: int = 1
+    jpeg:  Optional[bytes] = None    # the camera's JPEG, when `image` is a reduced decode
+
+    def full_image(self) -> np.ndarray:
+        """The frame at camera resolution (decodes the JPEG for reduced frames)."""
+        if self.scale == 1 or self.jpeg is None:
+            return self.image
+        return default_decoder().decode(self.jpeg)
+
+
+# ----------------------------------------------------------------------------
+# JPEG decoding
+# ----------------------------------------------------------------------------
+
+class JpegDecoder:
+    """
+    Decodes MJPG frames to BGR, optionally at 1/2, 1/4 or 1/8 size via the
+    JPEG library's scaled IDCT.
+
+    Args:
+        backend: "auto" (turbojpeg if available), "turbojpeg" or "opencv".
+    """
+
+    SCALES = (1, 2, 4, 8)
+
+    def __init__(self, backend: str = "auto"):
+        import cv2
+        self._cv2   = cv2
+        self._flags = {
+            1: cv2.IMREAD_COLOR,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_COLOR_8,
+        }
+        self._tj = None
+        if backend in ("auto", "turbojpeg") and TurboJPEG is not None:
+            try:
+                self._tj = TurboJPEG()
+            except (OSError, RuntimeError):   # Python wrapper present, libturbojpeg missing
+                if backend == "turbojpeg":
+                    raise
+        elif backend == "turbojpeg":
+            raise RuntimeError("backend='turbojpeg' needs the PyTurboJPEG package")
+        self.backend = "turbojpeg" if self._tj is not None else "opencv"
+
+    def decode(self, jpeg, scale: int = 1) -> np.ndarray:
+        """Decode `jpeg` (bytes or a 1-D uint8 array) at 1/`scale` size."""
+        if scale not in self.SCALES:
+            raise ValueError(f"JPEG scale must be one of {self.SCALES}, not {scale}")
+        if self._tj is not None:
+            return self._tj.decode(bytes(jpeg), scaling_factor=(1, scale))
+        buf = np.frombuffer(jpeg, np.uint8) if isinstance(jpeg, bytes) else jpeg
+        img = self._cv2.imdecode(buf, self._flags[scale])
+        if img is None:
+            raise ValueError("Corrupt JPEG frame")
+        return img
+
+
+_decoder: Optional[JpegDecoder] = None
+
+
+def default_decoder() -> JpegDecoder:
+    """Process-wide decoder (created on first use)."""
+    global _decoder
+    if _decoder is None:
+        _decoder = JpegDecoder()
+    return _decoder
+
+
+# ----------------------------------------------------------------------------
+# Frame sources
+# ----------------------------------------------------------------------------
+
+class FrameSource:
+    """
+    What the grabber reads from — the subset of cv2.VideoCapture it uses.
+    `read(image)` decodes into `image` when given (and the source can),
+    returning (ok, frame).
+
+    Sources with `encoded = True` return the camera's JPEG as a uint8
+    buffer instead (flat, 1×N or N×1) and leave decoding to the grabber.
+    """
+
+    encoded = False
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class V4L2Source(FrameSource):
+    """
+    The USB camera (Arducam IMX219), MJPG over V4L2.  With `raw` the
+    frames come back undecoded, for the grabber's scaled decode.
+    """
+
+    def __init__(
+        self,
+        device: int = 0,
+        width: int = 1920,
+        height: int = 1080,
+        fps: int = 30,
+        raw: bool = False,
+    ):
+        import cv2
+        self.cap = cv2.VideoCapture(device, cv2.CAP_V4L2)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH,  width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Keep the driver queue short — the grabber thread always wants the newest frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open /dev/video{device} — is the USB camera connected?")
+        # Older OpenCV builds ignore this and keep decoding; the grabber
+        # notices (3-D frames) and treats them as full-size
+        self.encoded = raw and bool(self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+
+    def read(self, image=None):
+        if self.encoded:
+            return self.cap.read()
+        return self.cap.read(image) if image is not None else self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class _Paced:
+    """Sleeps so consecutive frames are `1 / (fps * speed)` apart."""
+
+    def __init__(self, fps: float, speed: float):
+        self.period = 1.0 / (fps * speed) if fps and speed else 0.0
+        self._next  = 0.0
+
+    def wait(self):
+        if not self.period:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.period
+
+
+class VideoFileSource(FrameSource):
+    """A recorded clip, looped, at `speed` × its native frame rate."""
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = True):
+        import cv2
+        self._cv2 = cv2
+        self.cap  = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video file {path}")
+        self.loop  = loop
+        self._pace = _Paced(self.cap.get(cv2.CAP_PROP_FPS) or 30.0, speed)
+
+    def read(self, image=None):
+        self._pace.wait()
+        ok, frame = self.cap.read(image) if image is not None else self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read(image) if image is not None else self.cap.read()
+        return ok, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class SyntheticSource(FrameSource):
+    """
+    A static, slightly noisy porch; every `period` seconds (of source time)
+    a visitor-sized block walks across it for `visit` seconds.
+
+    With `mjpg` it behaves like the USB camera in raw mode and returns
+    JPEG bytes.  Each distinct frame is encoded once and cached, so reads
+    cost about what a real camera's do and decode cost can be measured.
+    """
+
+    def __init__(
+        self,
+        width: int = 1920,
+        height: int = 1080,
+        fps: float = 30.0,
+        speed: float = 1.0,
+        period: float = 20.0,
+        visit: float = 4.0,
+        mjpg: bool = False,
+    ):
+        rng = np.random.default_rng(0)
+        self.shape  = (height, width, 3)
+        self.fps    = fps
+        self.period = period
+        self.visit  = visit
+        self.encoded = mjpg
+        if mjpg:
+            # Pure noise compresses like no real porch does; use a lit
+            # gradient with mild sensor noise so JPEG sizes are realistic
+            ramp = np.linspace(40, 110, width, dtype=np.float32)[None, :, None]
+            self._base = (ramp + rng.normal(0, 2, self.shape)).clip(0, 255).astype(np.uint8)
+        else:
+            self._base = rng.integers(60, 90, self.shape, dtype=np.uint8)
+        self._pace  = _Paced(fps, speed)
+        self._n     = 0
+        self._jpegs: dict = {}        # visitor position (None = empty porch) -> JPEG
+
+    def _visitor_x(self) -> Optional[int]:
+        t = (self._n / self.fps) % self.period
+        self._n += 1
+        if t >= self.visit:
+            return None
+        w = self.shape[1]
+        return int((w - w // 6) * t / self.visit)
+
+    def _render(self, image: np.ndarray, x: Optional[int]) -> np.ndarray:
+        np.copyto(image, self._base)
+        if x is not None:
+            h, w = self.shape[:2]
+            bw, bh = w // 6, h * 2 // 3
+            image[h - bh - h // 10:h - h // 10, x:x + bw] = (30, 140, 220)
+        return image
+
+    def read(self, image=None):
+        self._pace.wait()
+        x = self._visitor_x()
+        if self.encoded:
+            if x not in self._jpegs:
+                import cv2
+                frame = self._render(np.empty(self.shape, np.uint8), x)
+                self._jpegs[x] = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])[1]
+            return True, self._jpegs[x]
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, np.uint8)
+        return True, self._render(image, x)
+
+
+def open_frame_source(spec: str, speed: float = 1.0, raw: bool = False) -> FrameSource:
+    """
+    Build a source from a CLI spec:
+        v4l2[:N]       USB camera /dev/videoN (default 0)
+        file:PATH      recorded clip, looped
+        synthetic      generated porch with periodic visitors
+        synthetic:mjpg the same, delivered as JPEG like the raw camera
+
+    `raw` asks the camera for undecoded MJPG (for dual-stream capture).
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "v4l2":
+        return V4L2Source(int(arg or 0), raw=raw)
+    if kind == "file" and arg:
+        return VideoFileSource(arg, speed=speed)
+    if kind == "synthetic" and arg in ("", "mjpg"):
+        return SyntheticSource(speed=speed, mjpg=arg == "mjpg")
+    raise ValueError(f"Unknown camera source {spec!r} (v4l2[:N], file:PATH, synthetic[:mjpg])")
+
+
+# ----------------------------------------------------------------------------
+# Grabber
+# ----------------------------------------------------------------------------
+
+class FrameGrabber:
+    """
+    Background grabber with a latest-frame ring buffer.
+
+    The ring holds `ring_size` preallocated BGR buffers that are decoded into
+    in rotation.  A frame returned by `latest()` without `copy=True` aliases
+    a ring slot and stays valid for roughly `ring_size - 1` frame periods
+    (~165 ms at 30 fps with the default of 6) — copy anything you keep longer,
+    or check `intact(frame)` after reading it in place.
+
+    With an encoded source, frames are decoded at 1/`detect_scale` size
+    into the ring and keep their JPEG for `Frame.full_image()`.  Sources
+    that decode themselves (files, the camera in cooked mode) always give
+    full-size frames.
+
+    `set_rate(fps)` lets an idle roaster skip decoding: encoded frames are
+    still read as they arrive (so the next one is fresh) but only `fps` of
+    them a second are decoded and published.
+    """
+
+    def __init__(self, cap, ring_size: int = 6, detect_scale: int = 1):
+        if detect_scale not in JpegDecoder.SCALES:
+            raise ValueError(f"detect_scale must be one of {JpegDecoder.SCALES}")
+        self.cap          = cap
+        self.ring_size    = ring_size
+        self.detect_scale = detect_scale
+        self._decoder  = default_decoder() if getattr(cap, "encoded", False) else None
+        self._ring     = None            # list[np.ndarray], allocated on first frame
+        self._slot_seq: list = []        # seq held by each slot; 0 while being written
+        self._latest: Optional[Frame] = None
+        self._seq      = 0
+        self._cond     = threading.Condition()
+        self._stop_evt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.frames_read    = 0
+        self.frames_skipped = 0
+        self.read_failures  = 0
+        self._min_interval  = 0.0
+        self._last_publish  = 0.0
+        # Grab-thread cost per frame: CPU (read + decode, not pacing sleeps)
+        # and the decode alone, for comparing capture modes
+        self.timing  = RollingStats(window=300)
+        self.cpu_s   = 0.0
+        self._t_start: Optional[float] = None
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_evt.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="frame-grabber", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_evt.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    # --------------------------------------------------------------------
+    # Grab loop
+    # --------------------------------------------------------------------
+
+    def _run(self):
+        slot = 0
+        self._t_start = time.monotonic()
+        while not self._stop_evt.is_set():
+            cpu0 = time.thread_time()
+            dst = self._ring[slot] if self._ring is not None else None
+            if dst is not None:
+                self._slot_seq[slot] = 0     # readers of the old frame see it's gone
+            if self._decoder is not None:
+                ret, img = self.cap.read()
+            else:
+                ret, img = self.cap.read(dst) if dst is not None else self.cap.read()
+            if not ret or img is None:
+                self.read_failures += 1
+                time.sleep(0.01)
+                continue
+
+            scale, jpeg = 1, None
+            # V4L2 hands back the JPEG as a 1×N Mat, imencode as N×1 or flat
+            encoded = self._decoder is not None and img.ndim < 3
+            if encoded and time.monotonic() - self._last_publish < self._min_interval:
+                # Throttled: the JPEG was read off the driver, skip its decode
+                self.frames_skipped += 1
+                self.cpu_s += time.thread_time() - cpu0
+                continue
+            if encoded:
+                # Encoded frame: reduced decode for detection, JPEG kept for stills
+                t0    = time.perf_counter()
+                img   = img.reshape(-1)
+                jpeg  = img.tobytes()
+                try:
+                    img = self._decoder.decode(img, self.detect_scale)
+                except (ValueError, OSError):
+                    # Truncated MJPG buffers happen on USB; drop this one, not the thread
+                    self.read_failures += 1
+                    self.cpu_s += time.thread_time() - cpu0
+                    continue
+                scale = self.detect_scale
+                self.timing.add("decode", (time.perf_counter() - t0) * 1000)
+            ts = time.monotonic()
+            self._last_publish = ts
+
+            if self._ring is None or img.shape != self._ring[0].shape:
+                # First frame (or the driver changed resolution): size the ring
+                self._ring = [np.empty_like(img) for _ in range(self.ring_size)]
+                self._slot_seq = [0] * self.ring_size
+                slot = 0
+                np.copyto(self._ring[slot], img)
+            elif img is not self._ring[slot]:
+                # Backend ignored the destination buffer — keep the ring authoritative
+                np.copyto(self._ring[slot], img)
+
+            with self._cond:
+                self._seq += 1
+                self._slot_seq[slot] = self._seq
+                self._latest = Frame(ts, self._seq, self._ring[slot], scale, jpeg)
+                self._cond.notify_all()
+            self.frames_read += 1
+            cpu = time.thread_time() - cpu0
+            self.cpu_s += cpu
+            self.timing.add("cpu", cpu * 1000)
+            slot = (slot + 1) % self.ring_size
+
+    def set_rate(self, fps: Optional[float]):
+        """Decode at most `fps` frames a second (None = every frame; encoded sources only)."""
+        self._min_interval = 1.0 / fps if fps else 0.0
+
+    def stats(self) -> dict:
+        """Frame rate, grab-thread CPU and per-frame cost since start()."""
+        wall = time.monotonic() - self._t_start if self._t_start else 0.0
+        latest = self._latest
+        return {
+            "frames":   self.frames_read,
+            "skipped":  self.frames_skipped,
+            "fps":      round(self.frames_read / wall, 1) if wall else None,
+            "stream":   "x".join(map(str, latest.image.shape[1::-1])) if latest else None,
+            "scale":    latest.scale if latest else None,
+            "decoder":  self._decoder.backend if self._decoder else "source",
+            "cpu_pct":  round(100 * self.cpu_s / wall, 1) if wall else None,
+            "frame_ms": self.timing.summary(),
+        }
+
+    # --------------------------------------------------------------------
+    # Consumer API
+    # --------------------------------------------------------------------
+
+    def latest(self, copy: bool = False) -> Optional[Frame]:
+        """Return the freshest frame without blocking (None before the first)."""
+        while True:
+            with self._cond:
+                frame = self._latest
+            if frame is None or not copy:
+                return frame
+            copied = self._copy(frame)
+            if copied is not None:
+                return copied
+
+    def _copy(self, frame: Frame) -> Optional[Frame]:
+        """`frame` with a private image, or None if its slot was reused mid-copy."""
+        image = frame.image.copy()
+        return frame._replace(image=image) if self.intact(frame) else None
+
+    def intact(self, frame: Frame) -> bool:
+        """
+        Whether `frame.image` still holds that frame.  Read a ring slot in
+        place, then check: False means the grabber started overwriting it
+        meanwhile and whatever was read may be torn.
+        """
+        ring, slot_seq = self._ring, self._slot_seq
+        for buf, seq in zip(ring or (), slot_seq):
+            if buf is frame.image:
+                return seq == frame.seq
+        return True     # a copy, a full-size decode, or a ring since replaced
+
+    def wait_newer(
+        self, ts: float, timeout: float = 1.0, copy: bool = False
+    ) -> Optional[Frame]:
+        """
+        Block until a frame newer than `ts` is available and return it.
+        Returns None if nothing newer arrives within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._latest is None or self._latest.ts <= ts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_evt.is_set():
+                    return None
+                self._cond.wait(remaining)
+            frame = self._latest
+        if copy:
+            # Torn copy: a newer frame has been published by now anyway
+            frame = self._copy(frame) or self.latest(copy=True)
+        return frame
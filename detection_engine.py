@@ -0,0 +1,503 @@
+"""
+Pipelined person detection for the Halloween Roaster.
+
+    grabber thread ──▶ motion thread ──(shared memory)──▶ YOLO worker process
+                                   ◀──── results queue ────┘
+
+Capture and motion run continuously on their own threads while YOLO
+inference happens in a separate worker process, so the Pi 5's cores work
+in parallel instead of one stage waiting on the next.  Only one crop is in
+flight at a time; motion hits that arrive while the worker is busy replace
+each other (latest wins) and are dropped once they are older than
+`max_age`, so the worker never chews through a backlog of stale frames.
+
+Several engines (one per door) can share one `YoloWorker`: each gets its
+own shared-memory slot and result queue, and crops that are waiting when
+the worker wakes up are run as one batch.
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from camera import FrameGrabber
+from motion import Box, MotionDetector, pad_box, union_box
+from scheduler import DetectionScheduler
+from tracker import PersonTracker, appearance
+
+# Largest crop we ever ship to the worker: one full 1920x1080 BGR frame
+MAX_CROP_BYTES = 1920 * 1080 * 3
+
+
+class PersonEvent(NamedTuple):
+    """A confirmed person detection."""
+    frame_ts:   float   # monotonic timestamp of the frame YOLO looked at
+    box:        Box     # person box in detection-stream pixels (× Frame.scale for full res)
+    confidence: float
+    latency:    float   # seconds from frame decode to YOLO result
+    track_ids:  tuple = ()   # new visitors' tracks (when tracking)
+
+
+class _Pending(NamedTuple):
+    frame_ts: float
+    origin:   tuple     # (x0, y0) of the crop within the frame
+    crop:     np.ndarray
+
+
+# ----------------------------------------------------------------------------
+# Worker process
+# ----------------------------------------------------------------------------
+
+def run_person_model(model, images: list, batched: bool, **kwargs) -> list:
+    """
+    YOLO results for `images`.  Exported NCNN graphs take one image per
+    forward pass, so unless `batched` (PyTorch weights) they run back to back.
+    """
+    if batched:
+        return list(model(images, **kwargs))
+    return [model(image, **kwargs)[0] for image in images]
+
+
+def person_detections(result) -> list:
+    """[(conf, x0, y0, x1, y1)] of one YOLO result."""
+    boxes = result.boxes
+    return [
+        (float(c), *(int(v) for v in xyxy))
+        for c, xyxy in zip(boxes.conf.tolist(), boxes.xyxy.tolist())
+    ]
+
+
+def _yolo_worker_main(shm_name, req_q, res_qs, weights, imgsz, conf):
+    """Entry point of the YOLO worker process (spawned, not forked)."""
+    from model_cache import load_person_model
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        model, source = load_person_model(weights, imgsz=imgsz)
+        model(np.zeros((imgsz, imgsz, 3), np.uint8), verbose=False, imgsz=imgsz)
+        batched = source == "pytorch"
+        for res_q in res_qs:
+            res_q.put(("ready", source))
+
+        stopping = False
+        while not stopping:
+            req = req_q.get()
+            if req is None:
+                break
+            # Whatever else is already waiting joins this batch
+            batch = [req]
+            while len(batch) < len(res_qs):
+                try:
+                    req = req_q.get_nowait()
+                except queue.Empty:
+                    break
+                if req is None:
+                    stopping = True
+                    break
+                batch.append(req)
+
+            # A request is one or more images packed back to back in its slot
+            crops = []
+            for slot, _, shapes in batch:
+                offset = slot * MAX_CROP_BYTES
+                for h, w in shapes:
+                    crops.append(np.ndarray((h, w, 3), np.uint8, buffer=shm.buf, offset=offset))
+                    offset += h * w * 3
+            results = run_person_model(
+                model, crops, batched, conf=conf, classes=[0], verbose=False, imgsz=imgsz,
+            )
+            del crops
+            dets = [person_detections(r) for r in results]
+            for slot, seq, shapes in batch:
+                res_qs[slot].put(("result", seq, dets[:len(shapes)], len(batch)))
+                dets = dets[len(shapes):]
+    finally:
+        shm.close()
+
+
+class YoloWorker:
+    """
+    The YOLO worker process and the shared memory crops are passed in.
+
+    Args:
+        slots: Number of engines that can attach (one crop slot each).
+
+    Engines normally create a private single-slot worker; for several
+    doors create one with `slots=N` and pass it to every engine.
+    """
+
+    def __init__(
+        self,
+        weights: str = "yolo11n.pt",
+        imgsz: int = 320,
+        confidence: float = 0.4,
+        slots: int = 1,
+    ):
+        ctx = mp.get_context("spawn")
+        self.slots  = slots
+        self.shm    = shared_memory.SharedMemory(create=True, size=MAX_CROP_BYTES * slots)
+        self.req_q  = ctx.Queue(maxsize=slots)       # one crop in flight per slot
+        self.res_qs = [ctx.Queue() for _ in range(slots)]
+        self._proc  = ctx.Process(
+            target=_yolo_worker_main,
+            args=(self.shm.name, self.req_q, self.res_qs, weights, imgsz, confidence),
+            name="yolo-worker", daemon=True,
+        )
+        self._lock     = threading.Lock()
+        self._attached = 0
+        self._launched = False
+
+    def attach(self) -> int:
+        """Reserve a slot for one engine."""
+        with self._lock:
+            if self._attached >= self.slots:
+                raise RuntimeError(f"YoloWorker has only {self.slots} slot(s)")
+            self._attached += 1
+            return self._attached - 1
+
+    def launch(self):
+        """Spawn the worker so it loads its model in the background."""
+        with self._lock:
+            if not self._launched:
+                self._proc.start()
+                self._launched = True
+
+    def wait_ready(self, slot: int, timeout: float = 120.0) -> str:
+        """Launch if needed and wait until the model is loaded; returns its source."""
+        self.launch()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.res_qs[slot].get(timeout=0.5)[1]
+            except queue.Empty:
+                if not self._proc.is_alive():
+                    raise RuntimeError(
+                        f"YOLO worker exited during startup (code {self._proc.exitcode})"
+                    )
+                if time.monotonic() > deadline:
+                    raise RuntimeError("YOLO worker did not become ready in time")
+
+    def buffer(self, slot: int, h: int, w: int, offset: int = 0) -> np.ndarray:
+        """View into a slot's crop buffer — drop it before the shm is closed."""
+        return np.ndarray((h, w, 3), np.uint8, buffer=self.shm.buf,
+                          offset=slot * MAX_CROP_BYTES + offset)
+
+    def submit(self, slot: int, seq: int, shapes):
+        """Queue the images packed in `slot`, given as [(h, w), ...]."""
+        self.req_q.put((slot, seq, tuple(shapes)))
+
+    def stop(self):
+        if self._launched:
+            try:
+                self.req_q.put(None, timeout=1)
+            except queue.Full:
+                pass
+            self._proc.join(timeout=5)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ----------------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------------
+
+class DetectionEngine:
+    """
+    Runs motion on a thread and YOLO in a worker process.
+
+    Call `start()` once, then `next_person(timeout)` from the main loop.
+    `pause()` / `resume()` bracket interactions so nothing is queued up
+    while the roaster is busy talking.
+
+    Loading the model dominates startup, so `launch()` can spawn the worker
+    before the camera is open; `grabber` may then be None until `start()`.
+
+    With a `tracker`, every YOLO result updates it and an event is only
+    raised when a visitor who hasn't been roasted is on the porch.
+
+    `worker` shares one YOLO process between engines; by default the
+    engine starts (and stops) a private one.
+
+    With a `scheduler`, the motion rate follows it (fast while the porch
+    is live, slow when idle) instead of the fixed `motion_fps`.
+
+    `on_motion(frame_ts, box)` is called from the motion thread for every
+    moving frame (box padded as for YOLO, in frame pixels),
+    `on_verdict(frame_ts, person)` from the results thread for every YOLO
+    answer on a motion crop — both before any tracking, so a caller can
+    act ahead of (or give up on) the person event.
+    """
+
+    def __init__(
+        self,
+        grabber: Optional[FrameGrabber],
+        motion: MotionDetector,
+        weights: str = "yolo11n.pt",
+        imgsz: int = 320,
+        confidence: float = 0.4,
+        motion_fps: float = 10.0,
+        max_age: float = 1.0,
+        tracker: Optional[PersonTracker] = None,
+        worker: Optional[YoloWorker] = None,
+        scheduler: Optional[DetectionScheduler] = None,
+    ):
+        self.grabber    = grabber
+        self.motion     = motion
+        self.weights    = weights
+        self.imgsz      = imgsz
+        self.confidence = confidence
+        self.motion_fps = motion_fps
+        self.max_age    = max_age
+        self.tracker    = tracker
+        self.scheduler  = scheduler
+        self.on_motion:  Optional[Callable[[float, Box], None]] = None
+        self.on_verdict: Optional[Callable[[float, bool], None]] = None
+
+        self._own_worker = worker is None
+        self.worker = worker or YoloWorker(weights, imgsz, confidence)
+        self._slot  = self.worker.attach()
+        self._events: "queue.Queue[PersonEvent]" = queue.Queue(maxsize=1)
+        self._stop_evt  = threading.Event()
+        self._run_evt   = threading.Event()
+        self._lock      = threading.Lock()   # guards _pending, _inflight and the shm slot
+        self._threads: list = []
+
+        self._seq       = 0
+        self._inflight: Optional[tuple] = None   # (seq, frame_ts, origin, crop shape)
+        self._pending:  Optional[_Pending] = None
+        self._burst:    Optional[tuple] = None   # (seq, results, done event)
+
+        self.dropped_stale = 0
+        self.submitted     = 0
+        self.batched       = 0   # results that shared a YOLO call with another door
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    def launch(self):
+        """Spawn the worker so it loads its model in the background."""
+        self.worker.launch()
+
+    def start(self, timeout: float = 120.0) -> str:
+        """Launch the worker if needed, wait until its model is loaded, start motion."""
+        if self.grabber is None:
+            raise RuntimeError("DetectionEngine needs a grabber before start()")
+        source = self.worker.wait_ready(self._slot, timeout)
+        self._run_evt.set()
+        self._threads = [
+            threading.Thread(target=self._run_motion,  name="motion-pipeline", daemon=True),
+            threading.Thread(target=self._run_results, name="yolo-results",    daemon=True),
+        ]
+        for thr in self._threads:
+            thr.start()
+        return source
+
+    def stop(self):
+        self._stop_evt.set()
+        self._run_evt.set()
+        for thr in self._threads:
+            thr.join(timeout=2)
+        if self._own_worker:
+            self.worker.stop()
+
+    def pause(self):
+        self._run_evt.clear()
+
+    def resume(self):
+        with self._lock:
+            self._pending = None
+        self._drain_events()
+        self._run_evt.set()
+
+    # --------------------------------------------------------------------
+    # Consumer API
+    # --------------------------------------------------------------------
+
+    def next_person(self, timeout: float = 0.5) -> Optional[PersonEvent]:
+        """Wait up to `timeout` for a fresh person detection."""
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if time.monotonic() - event.frame_ts > self.max_age:
+            return None
+        return event
+
+    def detect_frames(self, images: list, timeout: float = 1.0) -> Optional[list]:
+        """
+        Run YOLO on whole images (a burst of stills) in one worker request.
+
+        Returns each image's [(conf, x0, y0, x1, y1)], or None if the slot
+        or the result didn't come within `timeout`.  Safe while motion is
+        running (a speculative capture): the burst waits for an in-flight
+        motion crop, and motion crops wait behind the burst as the latest
+        pending one.  The images must fit in one crop slot together.
+        """
+        sizes = [img.shape[0] * img.shape[1] * 3 for img in images]
+        if sum(sizes) > MAX_CROP_BYTES:
+            raise ValueError("Burst images don't fit in one crop slot — downscale them")
+        deadline = time.monotonic() + timeout
+        done, results = threading.Event(), []
+        while True:
+            with self._lock:
+                # Wait out a motion crop that was in flight when we paused
+                if self._inflight is None:
+                    offset = 0
+                    for img, size in zip(images, sizes):
+                        dst = self.worker.buffer(self._slot, *img.shape[:2], offset=offset)
+                        np.copyto(dst, img)
+                        del dst
+                        offset += size
+                    self._seq += 1
+                    seq = self._seq
+                    self._inflight = (seq, None, (0, 0), None)   # no frame_ts: a burst
+                    self._burst    = (seq, results, done)
+                    self.worker.submit(self._slot, seq, [img.shape[:2] for img in images])
+                    break
+            if time.monotonic() > deadline:
+                return None
+            time.sleep(0.005)
+
+        if done.wait(max(0.0, deadline - time.monotonic())):
+            return results
+        with self._lock:
+            # Too late: let the results thread drop it when it arrives
+            if self._burst is not None and self._burst[0] == seq:
+                self._burst = None
+        return None
+
+    def _drain_events(self):
+        try:
+            while True:
+                self._events.get_nowait()
+        except queue.Empty:
+            pass
+
+    # --------------------------------------------------------------------
+    # Motion thread
+    # --------------------------------------------------------------------
+
+    def _period(self) -> float:
+        if self.scheduler is not None:
+            return self.scheduler.period()
+        return 1.0 / self.motion_fps if self.motion_fps else 0.0
+
+    def _run_motion(self):
+        last_ts = 0.0
+        if self.scheduler is not None:
+            self.scheduler.account_thread()
+        while not self._stop_evt.is_set():
+            if not self._run_evt.wait(0.2):
+                continue
+            frame = self.grabber.wait_newer(last_ts + self._period(), timeout=0.2)
+            if frame is None:
+                continue
+            last_ts = frame.ts
+            result = self.motion.process(frame.image, frame.scale)
+            if self.scheduler is not None:
+                self.scheduler.observe(result.moved, frame.ts)
+            if not result.moved:
+                continue
+
+            x0, y0, x1, y1 = pad_box(result.box, frame.image.shape)
+            if self.on_motion is not None:
+                self.on_motion(frame.ts, (x0, y0, x1, y1))
+            if (y1 - y0) * (x1 - x0) * 3 > MAX_CROP_BYTES:
+                continue
+            # Copy the crop now — the ring slot will be reused long before
+            # a busy worker gets to it.  A newer hit replaces an older one.
+            crop = frame.image[y0:y1, x0:x1].copy()
+            with self._lock:
+                if self._pending is not None:
+                    self.dropped_stale += 1
+                self._pending = _Pending(frame.ts, (x0, y0), crop)
+                self._submit_pending()
+
+    def _submit_pending(self):
+        """Ship the pending crop to the worker if it is idle. Caller holds _lock."""
+        if self._inflight is not None or self._pending is None:
+            return
+        pending, self._pending = self._pending, None
+        if time.monotonic() - pending.frame_ts > self.max_age:
+            self.dropped_stale += 1
+            return
+        h, w = pending.crop.shape[:2]
+        dst = self.worker.buffer(self._slot, h, w)
+        np.copyto(dst, pending.crop)
+        del dst
+        self._seq += 1
+        self._inflight = (self._seq, pending.frame_ts, pending.origin, (h, w))
+        self.worker.submit(self._slot, self._seq, [(h, w)])
+        self.submitted += 1
+
+    # --------------------------------------------------------------------
+    # Result thread
+    # --------------------------------------------------------------------
+
+    def _run_results(self):
+        res_q = self.worker.res_qs[self._slot]
+        while not self._stop_evt.is_set():
+            try:
+                msg = res_q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if msg[0] != "result":
+                continue
+            _, seq, per_image, batch = msg
+            self.batched += batch > 1
+            with self._lock:
+                if self._inflight is None or self._inflight[0] != seq:
+                    continue
+                if self._inflight[1] is None:
+                    # A burst from detect_frames (its caller may have given up)
+                    if self._burst is not None and self._burst[0] == seq:
+                        self._burst[1].extend(per_image)
+                        self._burst[2].set()
+                    self._burst = self._inflight = None
+                    self._submit_pending()
+                    continue
+                dets = per_image[0]
+                _, frame_ts, (ox, oy), (h, w) = self._inflight
+                embeds = None
+                if dets and self.tracker is not None:
+                    # The crop is still in the shm slot until the next submit
+                    crop   = self.worker.buffer(self._slot, h, w)
+                    embeds = [appearance(crop, d[1:]) for d in dets]
+                    del crop
+                self._inflight = None
+                self._submit_pending()
+
+            if self.on_verdict is not None:
+                self.on_verdict(frame_ts, bool(dets))
+            if not dets or not self._run_evt.is_set():
+                continue
+            if self.tracker is None:
+                conf, bx0, by0, bx1, by1 = max(dets)
+                event = PersonEvent(
+                    frame_ts, (ox + bx0, oy + by0, ox + bx1, oy + by1),
+                    conf, time.monotonic() - frame_ts,
+                )
+            else:
+                boxes = [(ox + x0, oy + y0, ox + x1, oy + y1) for _, x0, y0, x1, y1 in dets]
+                self.tracker.update(frame_ts, boxes, embeds, [d[0] for d in dets])
+                fresh = self.tracker.new_visitors()
+                if not fresh:
+                    continue
+                event = PersonEvent(
+                    frame_ts, union_box([t.box for t in fresh]),
+                    max(t.confidence for t in fresh), time.monotonic() - frame_ts,
+                    tuple(t.id for t in fresh),
+                )
+            self._drain_events()
+            try:
+                self._events.put_nowait(event)
+            except queue.Full:
+                pass
@@ -0,0 +1,197 @@
+"""
+Local stand-in for the Gemini Live WebSocket API.
+
+`FakeLiveServer` speaks enough of the BidiGenerateContent protocol for the
+real `google.genai` session object to talk to it: it answers the setup
+message, and for every user turn (a text prompt, an `audio_stream_end`, or
+end of speech detected by its own VAD on streamed mic audio) it streams
+back a canned 24 kHz PCM reply, a transcript and `turn_complete`.
+
+Delays and pacing are configurable, so benchmarks can model a slow
+handshake or a sluggish first byte — or run far faster than real time.
+
+    server = FakeLiveServer(first_byte_delay=0.4)
+    await server.start()
+    pool = LiveSessionPool(server.connector())
+    ...
+    await server.close()
+"""
+
+import asyncio
+import base64
+import contextlib
+import json
+from typing import Optional
+
+import numpy as np
+from google import genai
+from google.genai.live import AsyncSession
+from websockets.asyncio.client import connect as ws_connect
+from websockets.asyncio.server import serve
+
+from vad import VoiceActivityDetector
+
+MODEL_RATE = 24000
+MIC_RATE   = 16000
+
+
+def canned_reply(seconds: float = 2.0, rate: int = MODEL_RATE) -> bytes:
+    """A spooky-ish two-tone warble as 16-bit mono PCM."""
+    t    = np.arange(int(seconds * rate)) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 110 * t) + 0.2 * np.sin(2 * np.pi * 165 * t * (1 + 0.1 * t))
+    return (tone * 32767).astype(np.int16).tobytes()
+
+
+def _b64decode(data: str) -> bytes:
+    """The SDK may send URL-safe base64 without padding."""
+    data = data.replace("-", "+").replace("_", "/")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+class FakeLiveServer:
+    """
+    Args:
+        reply_pcm:        24 kHz PCM streamed back for every turn
+                          (default: 2 s of `canned_reply()`).
+        setup_delay:      Seconds before `setupComplete` (handshake cost).
+        first_byte_delay: Seconds from end of the user turn to the first
+                          audio chunk ("model thinking").
+        chunk_ms:         Audio per server message.
+        speed:            Stream the reply at this multiple of real time;
+                          0 sends it as fast as the socket allows.
+        end_silence_s:    Server-side VAD hangover for streamed mic audio.
+        transcript:       Output transcription sent with each reply.
+    """
+
+    def __init__(
+        self,
+        reply_pcm: Optional[bytes] = None,
+        setup_delay: float = 0.05,
+        first_byte_delay: float = 0.3,
+        chunk_ms: int = 40,
+        speed: float = 1.0,
+        end_silence_s: float = 0.6,
+        transcript: str = "Nice costume. Did your mom make it?",
+        host: str = "127.0.0.1",
+    ):
+        self.reply_pcm        = reply_pcm if reply_pcm is not None else canned_reply()
+        self.setup_delay      = setup_delay
+        self.first_byte_delay = first_byte_delay
+        self.chunk_bytes      = MODEL_RATE * 2 * chunk_ms // 1000
+        self.speed            = speed
+        self.end_silence_s    = end_silence_s
+        self.transcript       = transcript
+        self.host             = host
+        self.port: Optional[int] = None
+        self._server = None
+
+        self.connections = 0
+        self.turns       = 0
+        self.bytes_in    = 0
+        self.bytes_out   = 0
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    async def start(self) -> str:
+        self._server = await serve(self._handler, self.host, 0, max_size=None)
+        self.port    = self._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws/fake.BidiGenerateContent"
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "turns":       self.turns,
+            "bytes_in":    self.bytes_in,
+            "bytes_out":   self.bytes_out,
+        }
+
+    # --------------------------------------------------------------------
+    # Client side
+    # --------------------------------------------------------------------
+
+    def connector(self, client: Optional[genai.Client] = None):
+        """
+        Zero-argument connect callable for `LiveSessionPool`, yielding the
+        SDK's own `AsyncSession` over a plain ws:// socket to this server.
+        """
+        api_client = (client or genai.Client(api_key="fake-live"))._api_client
+
+        @contextlib.asynccontextmanager
+        async def _connect():
+            async with ws_connect(self.url, max_size=None) as ws:
+                await ws.send(json.dumps({"setup": {"model": "models/fake-live"}}))
+                await ws.recv()                                  # setupComplete
+                yield AsyncSession(api_client=api_client, websocket=ws)
+
+        return _connect
+
+    # --------------------------------------------------------------------
+    # Server side
+    # --------------------------------------------------------------------
+
+    async def _handler(self, ws):
+        self.connections += 1
+        await ws.recv()                                          # setup
+        await asyncio.sleep(self.setup_delay)
+        await ws.send(json.dumps({"setupComplete": {}}))
+
+        vad   = VoiceActivityDetector(rate=MIC_RATE, hangover_s=self.end_silence_s)
+        step  = vad.chunk * 2
+        reply: Optional[asyncio.Task] = None
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                # The SDK mixes snake_case and camelCase keys; accept either
+                rt  = msg.get("realtime_input") or msg.get("realtimeInput") or {}
+                user_turn_over = "text" in rt
+                if "audio" in rt:
+                    pcm = _b64decode(rt["audio"]["data"])
+                    self.bytes_in += len(pcm)
+                    for off in range(0, len(pcm) - step + 1, step):
+                        if vad.feed(pcm[off:off + step]) == "end":
+                            user_turn_over = True
+                stream_end = rt.get("audio_stream_end") or rt.get("audioStreamEnd")
+                if stream_end and vad.heard_speech:
+                    user_turn_over = True
+                if "video" in rt:
+                    self.bytes_in += len(_b64decode(rt["video"]["data"]))
+
+                if user_turn_over and (reply is None or reply.done()):
+                    vad.reset()
+                    reply = asyncio.create_task(self._reply(ws))
+        finally:
+            if reply is not None:
+                reply.cancel()
+
+    async def _reply(self, ws):
+        await asyncio.sleep(self.first_byte_delay)
+        pcm   = self.reply_pcm
+        delay = self.chunk_bytes / (MODEL_RATE * 2) / self.speed if self.speed else 0.0
+        for off in range(0, len(pcm), self.chunk_bytes):
+            chunk = pcm[off:off + self.chunk_bytes]
+            await ws.send(json.dumps({"serverContent": {"modelTurn": {"parts": [{
+                "inlineData": {
+                    "mimeType": f"audio/pcm;rate={MODEL_RATE}",
+                    "data":     base64.b64encode(chunk).decode("ascii"),
+                },
+            }]}}}))
+            self.bytes_out += len(chunk)
+            if delay:
+                await asyncio.sleep(delay)
+        await ws.send(json.dumps({"serverContent": {
+            "outputTranscription": {"text": self.transcript},
+        }}))
+        await ws.send(json.dumps({"serverContent": {"turnComplete": True}}))
+        self.turns += 1
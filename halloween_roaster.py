@@ -13,26 +13,39 @@ What changed from the original:
 """
 
 import os
-import io
 import time
 import asyncio
-import json
-import queue
+import collections
+import concurrent.futures
+import contextlib
+import functools
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-import numpy as np
-import pyaudio
-import cv2
-from PIL import Image
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+import numpy as np
 
 import sys
 
+from audio_io import AudioIO, open_audio
+from audio_trace import AudioTrace, AudioTraceWriter
+from best_shot import capture_burst, downscale, score_burst
+from camera import Frame, FrameGrabber, FrameSource, open_frame_source
+from detection_engine import DetectionEngine, YoloWorker, person_detections, run_person_model
+from live_pool import LiveSessionPool
+from motion import Box, MotionDetector, contains_box, pad_box, parse_roi, scale_box, union_box
+from model_cache import load_person_model, warm_up_async
+from scheduler import PAUSED, DetectionScheduler
+from speculation import Speculation, Speculator
+from still import Still, StillEncoder, prepare_upload
+from timing import PhaseTimer, RollingStats, SpanTimer
+from stations import build_stations, parse_station, run_stations
+from trace_store import TraceWriter, new_trace_id
+from tracker import PersonTracker, appearance
+from vad import EchoGate, VoiceActivityDetector
+
 load_dotenv()
 
 # ----------------------------------------------------------------------------
@@ -40,9 +53,11 @@ load_dotenv()
 # ----------------------------------------------------------------------------
 MIC_RATE      = 16000        # Gemini Live expects 16 kHz PCM input
 SPEAKER_RATE  = 24000        # Gemini Live outputs 24 kHz PCM
-AUDIO_FORMAT  = pyaudio.paInt16
-CHANNELS      = 1
 CHUNK         = 1024
+BARGE_IN_PREROLL = 5         # mic chunks (~320 ms) sent ahead of a barge-in
+
+# Latencies summarised in the log line after each interaction (ms)
+HEADLINE_LATENCIES = ("person", "capture", "connect", "roast.first_audio", "exchange1.reply")
 
 # ----------------------------------------------------------------------------
 # Gemini model + system prompt
@@ -63,54 +78,342 @@ SYSTEM_PROMPT = (
     "Keep responses punchy — aim for 2-4 sentences, but let the conversation breathe when it's flowing."
 )
 
+LIVE_CONFIG = {
+    "response_modalities": ["AUDIO"],
+    # Charon: deep, dramatic — perfect for the Halloween Wizard of Oz
+    "speech_config": {
+        "voice_config": {
+            "prebuilt_voice_config": {"voice_name": "Charon"}
+        }
+    },
+    "system_instruction": SYSTEM_PROMPT,
+    # minimal thinking = lowest latency (default for 3.1)
+    "thinking_config": {"thinking_level": "minimal"},
+    # capture transcriptions so trace files remain readable
+    "output_audio_transcription": {},
+}
+
+
+def gemini_api_key() -> str:
+    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "Set GOOGLE_API_KEY or GEMINI_API_KEY in your .env file.\n"
+            "Get a free key at https://aistudio.google.com/app/apikey"
+        )
+    return api_key
+
+
+class _DuplexState:
+    """
+    Shared between the session-long mic pump and the playback path of one
+    Live session, so a visitor talking over the roast can cut it off.
+    """
+
+    def __init__(self, audio: AudioIO):
+        self.audio        = audio
+        self.playing      = threading.Event()
+        self.listening    = False   # forward mic audio while the speaker is quiet
+        self.closed       = False
+        self.barged_in    = False
+        self.heard_speech = False
+
+    def barge_in(self):
+        """Visitor spoke over playback: drop queued audio and stop the speaker."""
+        self.barged_in    = True
+        self.heard_speech = True
+        self.listening    = True
+        self.playing.clear()
+        self.audio.flush()
+
+    def begin_listening(self, vad: VoiceActivityDetector):
+        # Speech that barged in is already this exchange's input
+        self.heard_speech = self.barged_in
+        self.barged_in    = False
+        self.listening    = True
+        vad.reset()
+
 
 class HalloweenRoaster:
-    def __init__(self, auto_detect: bool = True, cooldown_seconds: int = 60):
+    def __init__(
+        self,
+        auto_detect: bool = True,
+        cooldown_seconds: int = 60,
+        motion_width: Optional[int] = 320,
+        motion_roi: Optional[Tuple[float, float, float, float]] = None,
+        motion_report_every: int = 0,
+        pipelined: bool = True,
+        stream_mic: bool = True,
+        barge_in: bool = True,
+        prewarm_live: bool = True,
+        still_quality: int = 85,
+        upload_edge: Optional[int] = 768,
+        upload_kb: Optional[int] = 150,
+        crop_to_person: bool = True,
+        burst_frames: int = 4,
+        detect_scale: int = 2,
+        burst_window: float = 0.3,
+        trace_audio: bool = False,
+        track_visitors: bool = True,
+        idle_fps: float = 3.0,
+        idle_after: float = 10.0,
+        speculate: bool = True,
+        camera: str = "v4l2",
+        audio: str = "pyaudio",
+        source_speed: float = 1.0,
+        frame_source: Optional[FrameSource] = None,
+        audio_io: Optional[AudioIO] = None,
+        name: Optional[str] = None,
+        traces_dir: Optional[str] = None,
+        client=None,
+        yolo_worker: Optional[YoloWorker] = None,
+    ):
         """
         Args:
-            auto_detect:       Use YOLO11n + motion detection (default True).
-            cooldown_seconds:  Wait time between interactions (default 60s).
+            auto_detect:          Use YOLO11n + motion detection (default True).
+            cooldown_seconds:     Wait time between interactions (default 60s)
+                                  when visitors aren't tracked.
+            motion_width:         Width motion detection runs at (None = full res).
+            motion_roi:           Porch region (x, y, w, h) as frame fractions.
+            motion_report_every:  Print motion-stage cost every N frames (0 = off).
+            pipelined:            Run YOLO in a worker process alongside motion
+                                  (default True); False uses the serial loop.
+            stream_mic:           Stream mic audio to Gemini while the visitor
+                                  talks and let the server detect end of turn
+                                  (default True); False records locally first.
+            barge_in:             Keep listening during playback and stop the
+                                  roast when the visitor talks over it
+                                  (default True; needs stream_mic).
+            prewarm_live:         Keep a Gemini Live session connected while
+                                  idle so interactions skip the handshake.
+            still_quality:        Starting JPEG quality of the costume still.
+            upload_edge:          Long edge the still is scaled to before
+                                  upload (None = keep crop resolution).
+            upload_kb:            JPEG byte budget; quality steps down until
+                                  the still fits (None = no budget).
+            crop_to_person:       Crop the still to the detected visitor.
+            burst_frames:         Frames captured for the still; the best
+                                  framed and sharpest one is sent (1 = send
+                                  the newest frame).
+            burst_window:         Longest the burst may wait for new frames
+                                  (seconds).
+            detect_scale:         Motion and YOLO run on MJPG frames decoded
+                                  at 1/N size (1, 2, 4 or 8); the full frame
+                                  is only decoded for the still.
+            trace_audio:          Save model and visitor audio of every
+                                  interaction next to its trace.
+            track_visitors:       Track people across frames and roast each
+                                  new visitor once, instead of applying a
+                                  wall-clock cooldown (default True).
+            idle_fps:             Motion rate (and camera decode rate, for
+                                  MJPG) once the porch has been static for
+                                  `idle_after` seconds; 0 = never slow down.
+            idle_after:           Seconds without motion before idling.
+            speculate:            On motion, open a Live session and send
+                                  the still before YOLO has confirmed the
+                                  visitor; dropped if nobody shows up
+                                  (default True; pipelined detection only).
+            camera:               Camera spec, opened during startup (default:
+                                  USB camera over V4L2).  See
+                                  camera.open_frame_source.
+            audio:                Mic/speaker spec, opened during startup
+                                  (default: PyAudio).  See audio_io.open_audio.
+            source_speed:         Pacing of file/synthetic sources vs real time.
+            frame_source:         Already-open camera; overrides `camera`.
+            audio_io:             Unstarted audio backend; overrides `audio`.
+            name:                 Station (door) name; prefixes its log lines
+                                  and gives it its own traces/<name>/.
+            traces_dir:           Where traces go (default: traces/[<name>/]).
+            client:               Shared genai.Client (default: create one).
+            yolo_worker:          Shared YOLO process (default: a private
+                                  one).  See stations.py.
         """
-        # --- Gemini client ---
-        api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "Set GOOGLE_API_KEY or GEMINI_API_KEY in your .env file.\n"
-                "Get a free key at https://aistudio.google.com/app/apikey"
-            )
-        self.client = genai.Client(api_key=api_key)
+        self.startup_timer = PhaseTimer()
+        api_key = gemini_api_key() if client is None else None
+
+        self.name = name
+        self._tag = f"[{name}] " if name else ""
+        self.yolo_worker = yolo_worker
 
         self.auto_detect      = auto_detect
         self.cooldown_seconds = cooldown_seconds
+        self.motion_width        = motion_width
+        self.motion_roi          = motion_roi
+        self.motion_report_every = motion_report_every
+        self.pipelined           = pipelined
+        self.stream_mic          = stream_mic
+        self.barge_in            = barge_in and stream_mic
+        self.engine: Optional[DetectionEngine] = None
+        self.tracker = PersonTracker() if auto_detect and track_visitors else None
+        self.scheduler: Optional[DetectionScheduler] = None
+        if auto_detect:
+            self.scheduler = DetectionScheduler(
+                idle_fps=idle_fps, idle_after=idle_after,
+                on_rate=self._set_camera_rate, log=lambda msg: print(f"{self._tag}{msg}"),
+                grab_cpu=lambda: self.grabber.cpu_s if self.grabber is not None else 0.0,
+            )
+        self._visitor_ids: tuple = ()      # tracks that triggered the interaction
         self.last_interaction_time = 0
+        self.audio: Optional[AudioIO]          = None
+        self.grabber: Optional[FrameGrabber]   = None
+        # Noise floor is learned across interactions, so keep one detector
+        self.vad = VoiceActivityDetector(rate=MIC_RATE, chunk=CHUNK)
+        self.echo_gate = EchoGate(self.vad)
+
+        # --- Staged startup ---
+        # The slow, independent pieces (Gemini client import, audio devices,
+        # camera, YOLO worker) come up concurrently.  The porch is "armed"
+        # once camera + detector are ready; audio and the Gemini client may
+        # still be finishing and are awaited before the first interaction.
+        self._init_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="init"
+        )
+        self.source_speed = source_speed
+        self.detect_scale = detect_scale
+        self.cap: Optional[FrameSource] = None
+        self._startup = {
+            "camera": self._init_pool.submit(self._init_camera, camera, frame_source),
+            "audio":  self._init_pool.submit(self._init_audio, audio, audio_io),
+        }
+        if client is None:
+            self._startup["gemini client"] = self._init_pool.submit(self._init_client, api_key)
+        else:
+            self.client = client
+        self._init_pool.shutdown(wait=False)
+        self._ready: Optional[asyncio.Future] = None   # rest of startup, on the loop
+
+        # Started by run() on the roaster's event loop, once the client exists
+        self.live_pool = LiveSessionPool(
+            lambda: self.client.aio.live.connect(model=MODEL, config=LIVE_CONFIG),
+            prewarm=prewarm_live,
+        )
+
+        # Traces are written by a background thread, batched into JSONL + index
+        if traces_dir is not None:
+            self.traces_dir = Path(traces_dir)
+        else:
+            self.traces_dir = Path("traces") / name if name else Path("traces")
+        self.traces = TraceWriter(self.traces_dir)
+        self.traces.start()
+        self.audio_tracer: Optional[AudioTraceWriter] = None
+        self.audio_trace:  Optional[AudioTrace]       = None   # current interaction
+        if trace_audio:
+            self.audio_tracer = AudioTraceWriter(
+                self.traces_dir, mic_rate=MIC_RATE, model_rate=SPEAKER_RATE
+            )
+            self.audio_tracer.start()
+
+        # Stills are encoded once; the same bytes go to Gemini and the trace
+        self.still_encoder  = StillEncoder(quality=still_quality)
+        self.upload_edge    = upload_edge
+        self.upload_bytes   = upload_kb * 1024 if upload_kb else None
+        self.crop_to_person = crop_to_person
+        self.burst_frames   = max(1, burst_frames)
+        self.burst_window   = burst_window
+        self._last_motion_ts = 0.0
+        self.last_person_box: Optional[Box] = None
+
+        # --- Latency instrumentation ---
+        self.spans   = SpanTimer()       # replaced at the start of each interaction
+        self.latency = RollingStats()
+        self._trigger: Optional[Tuple[float, float]] = None   # (frame_ts, confirmed_at)
+        self._last_voice_at: Optional[float] = None           # visitor's last loud chunk
+
+        # --- Person detection (YOLO loads while the camera opens) ---
+        # A failure from here on would leave the YOLO worker (and its shared
+        # memory), the camera and the audio streams running behind the error
+        self.speculator: Optional[Speculator] = None
+        try:
+            if self.auto_detect:
+                self._init_detection()
+            else:
+                self._startup_result("camera")
+
+            # --- Speculative interactions (session + still ready before YOLO confirms) ---
+            if speculate and self.engine is not None:
+                self.speculator = Speculator(
+                    self.live_pool, self._prepare_speculation, can_start=self._can_speculate,
+                    log=lambda msg: print(f"{self._tag}{msg}"),
+                )
+                self.engine.on_motion  = self.speculator.on_motion
+                self.engine.on_verdict = self.speculator.on_verdict
+        except BaseException:
+            self._abort_startup()
+            raise
 
-        self.traces_dir = Path("traces")
-        self.traces_dir.mkdir(exist_ok=True)
+        mode = "AUTO-DETECT" if self.auto_detect else "MANUAL"
+        armed_s = time.monotonic() - self.startup_timer.t0
+        self.startup_timer.add("armed", armed_s)
+        pending = [name for name, fut in self._startup.items() if not fut.done()]
+        print(f"✓ {self._tag}Halloween Roaster armed after {armed_s:.2f}s! Mode: {mode}"
+              + (f" (still starting: {', '.join(pending)})" if pending else ""))
 
-        # --- PyAudio (replaces pygame + SpeechRecognition) ---
-        print("Initializing audio (PyAudio)...")
-        self.pa = pyaudio.PyAudio()
+    # --------------------------------------------------------------------
+    # Startup stages (run concurrently on the init pool)
+    # --------------------------------------------------------------------
 
-        # --- Camera (USB: Arducam 4K 8MP IMX219) ---
-        print("Initializing camera...")
-        self.cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
-        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH,  1920)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
-        if not self.cap.isOpened():
-            raise RuntimeError("Could not open /dev/video0 — is the USB camera connected?")
-        # Flush a few frames so the first capture isn't stale
-        for _ in range(5):
-            self.cap.read()
-        time.sleep(1)  # warm-up
-
-        # --- Person detection ---
-        if self.auto_detect:
-            self._init_detection()
+    def _init_client(self, api_key: str):
+        with self.startup_timer.phase("gemini client"):
+            from google import genai    # heavy import — kept off the main thread
+            self.client = genai.Client(api_key=api_key)
+
+    def _init_audio(self, spec: str, audio_io: Optional[AudioIO]):
+        # --- Audio (PyAudio by default; replaces pygame + SpeechRecognition) ---
+        print("Initializing audio...")
+        with self.startup_timer.phase("audio"):
+            # Mic and speaker streams stay open for the life of the process
+            audio = audio_io or open_audio(
+                spec, mic_rate=MIC_RATE, speaker_rate=SPEAKER_RATE,
+                chunk=CHUNK, speed=self.source_speed,
+            )
+            audio.on_playback = self.echo_gate.note_playback
+            audio.start()
+        self.audio = audio
 
-        mode = "AUTO-DETECT" if self.auto_detect else "MANUAL"
-        print(f"✓ Halloween Roaster ready! Mode: {mode}")
+    def _init_camera(self, spec: str, frame_source: Optional[FrameSource]):
+        # --- Camera (USB: Arducam 4K 8MP IMX219 by default) ---
+        print("Initializing camera...")
+        with self.startup_timer.phase("camera"):
+            self.cap = frame_source or open_frame_source(
+                spec, speed=self.source_speed, raw=self.detect_scale > 1,
+            )
+            # Background grabber decodes continuously (at 1/detect_scale for
+            # MJPG sources); consumers read the freshest frame
+            self.grabber = FrameGrabber(self.cap, detect_scale=self.detect_scale)
+            self.grabber.start()
+            if self.grabber.wait_newer(0.0, timeout=5.0) is None:
+                raise RuntimeError("Camera opened but delivered no frames")
+
+    def _startup_result(self, name: str):
+        """Block until one startup stage is done; re-raises its error."""
+        return self._startup[name].result()
+
+    def _finish_startup(self):
+        for name in self._startup:
+            self._startup_result(name)
+        self.startup_timer.report()
+
+    def _abort_startup(self):
+        """Startup failed: stop whatever already came up, then let the error through."""
+        print(f"{self._tag}Startup failed, shutting down...")
+        # Stages still in flight would otherwise open devices after the teardown
+        concurrent.futures.wait(self._startup.values())
+        if self.engine is not None:
+            self.engine.stop()
+        if self.grabber is not None:
+            self.grabber.stop()
+        if self.cap is not None:
+            self.cap.release()
+        if self.audio is not None:
+            self.audio.stop()
+        self.traces.close()
+        if self.audio_tracer is not None:
+            self.audio_tracer.close()
+
+    async def _start_rest(self):
+        """Wait (off the loop) for the remaining stages, then warm the Live pool."""
+        await asyncio.get_running_loop().run_in_executor(None, self._finish_startup)
+        await self.live_pool.start()
 
     # --------------------------------------------------------------------
     # Detection (unchanged from original)
@@ -118,92 +421,276 @@ class HalloweenRoaster:
 
     def _init_detection(self):
         print("Initializing two-stage person detection...")
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500, varThreshold=16, detectShadows=False
+        self.motion_threshold = 5000   # contour area in full-resolution pixels
+        self.motion = MotionDetector(
+            motion_threshold=self.motion_threshold,
+            work_width=self.motion_width,
+            roi=self.motion_roi,
+            report_every=self.motion_report_every,
         )
-        self.motion_threshold = 5000
         self.person_confidence_threshold = 0.4
 
+        if self.pipelined:
+            print("  - Starting YOLO11n worker process...")
+            self.engine = DetectionEngine(
+                None, self.motion,
+                weights="yolo11n.pt", imgsz=320,
+                confidence=self.person_confidence_threshold,
+                tracker=self.tracker, worker=self.yolo_worker,
+                scheduler=self.scheduler,
+            )
+            with self.startup_timer.phase("yolo worker"):
+                self.engine.launch()
+                self._startup_result("camera")
+                self.engine.grabber = self.grabber
+                source = self.engine.start()
+            print(f"  - YOLO worker ready ({source} model)")
+            print("✓ Pipelined detection initialized (Motion thread + YOLO11n process)")
+            return
+
         print("  - Loading YOLO11n model...")
-        from ultralytics import YOLO
-        self.person_model = YOLO("yolo11n.pt")
-        try:
-            self.person_model.export(format="ncnn", imgsz=320)
-            self.person_model = YOLO("yolo11n_ncnn_model", task="detect")
-            print("  - Using optimized NCNN model")
-        except Exception as exc:
-            print(f"  - NCNN export failed ({exc}), using standard model")
+        self.person_model, source = load_person_model(
+            "yolo11n.pt", imgsz=320, timer=self.startup_timer
+        )
+        self._model_batched = source == "pytorch"
+        if source == "cache":
+            print("  - Using cached NCNN model")
+        elif source == "export":
+            print("  - Using optimized NCNN model (exported and cached)")
+        # First inference is slow; pay for it off the critical path
+        self._warmup_thr = warm_up_async(self.person_model, imgsz=320)
+        self._startup_result("camera")
 
         print("✓ Two-stage detection initialized (Motion + YOLO11n)")
 
-    def detect_motion(self) -> bool:
-        ret, bgr = self.cap.read()
-        if not ret:
-            return False
-        mask = self.bg_subtractor.apply(bgr)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        return any(cv2.contourArea(c) > self.motion_threshold for c in contours)
+    def detect_motion(self) -> Optional[Tuple[Frame, Box]]:
+        """
+        Run the motion stage on the next unseen frame.
+        Returns (frame, union box of the moving regions) or None.
+        """
+        # Only ever look at a frame once, and no sooner than the scheduler's rate
+        frame = self.grabber.wait_newer(
+            self._last_motion_ts + self.scheduler.period(), timeout=1.0
+        )
+        if frame is None:
+            return None
+        self._last_motion_ts = frame.ts
+        result = self.motion.process(frame.image, frame.scale)
+        self.scheduler.observe(result.moved, frame.ts)
+        return (frame, result.box) if result.moved else None
 
     def detect_person(self) -> bool:
-        if not self.detect_motion():
-            return False
-        ret, img = self.cap.read()
-        if not ret:
+        hit = self.detect_motion()
+        if hit is None:
             return False
+        frame, motion_box = hit
+        self._warmup_thr.join()   # no-op once warm-up has finished
+
+        # YOLO sees the exact frame that triggered motion, cropped to the moving
+        # region so a small visitor fills more of the 320 px input.  The crop is
+        # copied out of the ring — inference can outlive the slot on a Pi.
+        x0, y0, x1, y1 = pad_box(motion_box, frame.image.shape)
+        crop = frame.image[y0:y1, x0:x1].copy()
         results = self.person_model(
-            img, conf=self.person_confidence_threshold,
+            crop, conf=self.person_confidence_threshold,
             classes=[0], verbose=False, imgsz=320
         )
-        if len(results[0].boxes) > 0:
-            conf = results[0].boxes[0].conf[0].item()
-            print(f"  ✓ Person detected (confidence: {conf:.2%})")
-            return True
-        return False
+        boxes = results[0].boxes
+        if len(boxes) == 0:
+            return False
+        if self.tracker is not None:
+            xyxy  = [tuple(int(v) for v in b) for b in boxes.xyxy.tolist()]
+            confs = boxes.conf.tolist()
+            self.tracker.update(
+                frame.ts, [(x0 + a, y0 + b, x0 + c, y0 + d) for a, b, c, d in xyxy],
+                [appearance(crop, b) for b in xyxy], confs,
+            )
+            fresh = self.tracker.new_visitors()
+            if not fresh:
+                return False   # everyone here has already been roasted
+            conf = max(t.confidence for t in fresh)
+            self.last_person_box = union_box([t.box for t in fresh])
+            self._visitor_ids    = tuple(t.id for t in fresh)
+        else:
+            best = int(boxes.conf.argmax())
+            conf = boxes.conf[best].item()
+            bx0, by0, bx1, by1 = (int(v) for v in boxes.xyxy[best].tolist())
+            self.last_person_box = (x0 + bx0, y0 + by0, x0 + bx1, y0 + by1)
+        self._trigger = (frame.ts, time.monotonic())
+        print(f"  ✓ {self._tag}Person detected (confidence: {conf:.2%})")
+        return True
+
+    def _wait_for_person(self) -> bool:
+        """One step of the auto-detect loop: True when a visitor is confirmed."""
+        if self.engine is None:
+            return self.detect_person()
+        event = self.engine.next_person(timeout=0.5)
+        if event is None:
+            return False
+        self.last_person_box = event.box
+        self._visitor_ids    = event.track_ids
+        self._trigger = (event.frame_ts, event.frame_ts + event.latency)
+        visitors = f", visitor #{', #'.join(map(str, event.track_ids))}" if event.track_ids else ""
+        print(f"  ✓ {self._tag}Person detected (confidence: {event.confidence:.2%}, "
+              f"{event.latency * 1000:.0f} ms after capture{visitors})")
+        return True
 
     def is_cooldown_active(self) -> bool:
-        if self.last_interaction_time == 0:
+        return self.cooldown_remaining() > 0
+
+    def cooldown_remaining(self) -> float:
+        """Seconds of cooldown left (always 0 with visitor tracking)."""
+        # With tracking, repeats are decided per visitor rather than by the clock
+        if self.tracker is not None or self.last_interaction_time == 0:
+            return 0.0
+        return max(0.0, self.cooldown_seconds - (time.time() - self.last_interaction_time))
+
+    def _can_speculate(self) -> bool:
+        """Speculate only on an empty, watched porch once startup is through."""
+        if self._ready is None or not self._ready.done() or self._ready.cancelled():
             return False
-        return (time.time() - self.last_interaction_time) < self.cooldown_seconds
+        if self._ready.exception() is not None or self.scheduler.state in PAUSED:
+            return False
+        # Someone already on the porch has been roasted (or is being confirmed)
+        return self.tracker is None or not self.tracker.present(time.monotonic())
+
+    async def _prepare_speculation(self, spec: Speculation) -> Still:
+        """Capture the still and send it into the speculative session — no prompt yet."""
+        from google.genai import types
+
+        # Measured from the motion; they become the interaction's on claim
+        spans = spec.spans = SpanTimer(origin=spec.motion_ts)
+        spans.add("connect", spec.connected_at - spec.started_at)
+        spans.mark("connected", spec.connected_at)
+        # No person box yet: crop to where it moved
+        still = await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.capture_image, spans, spec.motion_box)
+        )
+        await spec.session.send_realtime_input(
+            video=types.Blob(data=still.jpeg, mime_type="image/jpeg")
+        )
+        spans.mark("image.sent")
+        return still
+
+    def _still_shows(self, still: Still, box: Optional[Box]) -> bool:
+        """Whether `still` contains `box` (detection-stream pixels) whole."""
+        if still.region is None or box is None:
+            return True
+        frame = self.grabber.latest()
+        scale = frame.scale if frame is not None else 1
+        return contains_box(still.region, scale_box(box, scale))
+
+    def _set_camera_rate(self, fps: Optional[float]):
+        if self.grabber is not None:
+            self.grabber.set_rate(fps)
+
+    def _pause_detection(self, reason: str):
+        self.scheduler.pause(reason)
+        if self.engine:
+            self.engine.pause()
+
+    def _resume_detection(self):
+        self.scheduler.resume()
+        if self.engine:
+            self.engine.resume()
 
     # --------------------------------------------------------------------
     # Camera
     # --------------------------------------------------------------------
 
-    def capture_image(self) -> Tuple[Image.Image, bytes]:
-        """Capture a still and return (PIL Image, raw JPEG bytes)."""
+    def capture_image(
+        self, spans: Optional[SpanTimer] = None, box_hint: Optional[Box] = None
+    ) -> Still:
+        """
+        Capture a still and prepare it for upload: crop to the last person
+        box (or `box_hint`, in detection-stream pixels), scale to
+        `upload_edge` and encode once within the byte budget.  Timings go
+        to `spans` (default: the current interaction's).
+        """
+        spans = spans or self.spans
+        hint  = box_hint if box_hint is not None else self.last_person_box
         print("Capturing image...")
-        ret, frame = self.cap.read()
-        if not ret:
+        with spans.span("capture"):
+            frame = None                    # burst frames are private copies
+            if self.burst_frames > 1:
+                image, person_box = self._best_shot(spans, hint)
+            else:
+                frame = self.grabber.latest()
+                if frame is None:
+                    raise RuntimeError("Failed to capture image from USB camera")
+                image, person_box = frame.full_image(), hint
+                if person_box is not None:
+                    person_box = scale_box(person_box, frame.scale)
+            box   = person_box if self.crop_to_person else None
+            still = prepare_upload(
+                image, self.still_encoder, box=box,
+                long_edge=self.upload_edge, max_bytes=self.upload_bytes,
+            )
+            if frame is not None and not self.grabber.intact(frame):
+                # Read from the ring slot in place, which was reused meanwhile
+                # (seqlock check): encode again from a checked copy
+                frame = self.grabber.latest(copy=True)
+                image = frame.full_image()
+                still = prepare_upload(
+                    image, self.still_encoder, box=box,
+                    long_edge=self.upload_edge, max_bytes=self.upload_bytes,
+                )
+        spans.mark("captured")
+        fh, fw = image.shape[:2]
+        print(f"  Upload: {fw}x{fh} ({fw * fh * 3 / 1e6:.1f} MB raw) → "
+              f"{still.width}x{still.height} JPEG q{still.quality}, "
+              f"{len(still.jpeg) / 1024:.0f} KB "
+              f"({'person crop' if box else 'full frame'}, "
+              f"{self.still_encoder.backend}, {still.encode_ms:.0f} ms)")
+        return still
+
+    def _best_shot(
+        self, spans: SpanTimer, hint: Optional[Box]
+    ) -> Tuple[np.ndarray, Optional[Box]]:
+        """
+        Capture a short burst and return the best frame with its person box
+        (full resolution).  Falls back to `hint` (the box that triggered the
+        interaction) when YOLO isn't available, too slow or sees no one.
+        """
+        with spans.span("capture.burst"):
+            frames = capture_burst(self.grabber, self.burst_frames, self.burst_window)
+        if not frames:
             raise RuntimeError("Failed to capture image from USB camera")
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        pil = Image.fromarray(rgb)
-        buf = io.BytesIO()
-        pil.save(buf, format="JPEG", quality=85)
-        return pil, buf.getvalue()
+        with spans.span("capture.score"):
+            small, scale = downscale([f.image for f in frames])
+            dets = self._detect_burst(small) if self.auto_detect else None
+            shots = score_burst(small, dets)
+        best  = max(shots, key=lambda s: s.score)
+        frame = frames[best.index]
+        box   = hint
+        if best.box is not None:
+            box = scale_box(best.box, 1 / scale)     # back to detection-stream pixels
+        if box is not None:
+            box = scale_box(box, frame.scale)        # ... and to the full frame
+        print(f"  Best shot: frame {best.index + 1}/{len(frames)} "
+              f"(score {best.score:.2f}, sharpness {best.sharpness:.0f}"
+              + (", no detector" if dets is None else "") + ")")
+        with spans.span("capture.decode"):
+            image = frame.full_image()
+        return image, box
+
+    def _detect_burst(self, images: list) -> Optional[List[list]]:
+        """One batched YOLO pass over the burst: per image [(conf, x0, y0, x1, y1)]."""
+        if self.engine is not None:
+            # Shares the slot with motion crops (speculative captures run
+            # before the engine is paused)
+            return self.engine.detect_frames(images, timeout=0.5)
+        self._warmup_thr.join()
+        results = run_person_model(
+            self.person_model, images, self._model_batched,
+            conf=self.person_confidence_threshold, classes=[0], verbose=False, imgsz=320,
+        )
+        return [person_detections(r) for r in results]
 
     # --------------------------------------------------------------------
     # Audio I/O  (replaces gTTS + pygame + SpeechRecognition)
     # --------------------------------------------------------------------
 
-    def _play_worker(self, audio_q: queue.Queue, stop_evt: threading.Event):
-        """Background thread: writes raw 24 kHz PCM chunks to the speaker."""
-        stream = self.pa.open(
-            format=AUDIO_FORMAT, channels=CHANNELS,
-            rate=SPEAKER_RATE, output=True, frames_per_buffer=CHUNK
-        )
-        try:
-            while not stop_evt.is_set():
-                try:
-                    chunk = audio_q.get(timeout=0.1)
-                    if chunk is None:   # sentinel — done
-                        break
-                    stream.write(chunk)
-                except queue.Empty:
-                    continue
-        finally:
-            stream.stop_stream()
-            stream.close()
-
     def record_pcm(
         self, max_seconds: int = 8, silence_timeout: float = 2.0
     ) -> Optional[bytes]:
@@ -213,58 +700,141 @@ class HalloweenRoaster:
         Returns None if no speech was detected.
         """
         print(f"  🎤 Listening (up to {max_seconds}s)...")
-        stream = self.pa.open(
-            format=AUDIO_FORMAT, channels=CHANNELS,
-            rate=MIC_RATE, input=True, frames_per_buffer=CHUNK
-        )
-        frames       = []
-        silence_rms  = 300   # amplitude threshold — tune for your mic
-        silent_count = 0
-        max_silent   = int(MIC_RATE / CHUNK * silence_timeout)
-        heard_speech = False
+        frames = []
+        vad    = self.vad
+        vad.reset(hangover_s=silence_timeout)
+        self._last_voice_at = None
 
+        self.audio.mic_reset()
         try:
             for _ in range(int(MIC_RATE / CHUNK * max_seconds)):
-                data = stream.read(CHUNK, exception_on_overflow=False)
+                data = self.audio.read_mic()
                 frames.append(data)
-                rms = float(np.sqrt(
-                    np.mean(np.frombuffer(data, np.int16).astype(np.float32) ** 2)
-                ))
-                if rms > silence_rms:
-                    heard_speech = True
-                    silent_count = 0
-                elif heard_speech:
-                    silent_count += 1
-                    if silent_count >= max_silent:
-                        break   # end of utterance
+                event = vad.feed(data)
+                self._note_voice()
+                if event == "end":
+                    break   # end of utterance
         finally:
-            stream.stop_stream()
-            stream.close()
+            self.audio.mic_idle()
 
-        if not heard_speech:
+        if not vad.heard_speech:
             print("  (no speech detected)")
             return None
-        return b"".join(frames)
+        # Drop the leading silence (keep a short pre-roll so onsets aren't clipped)
+        start = max(0, vad.speech_start - MIC_RATE // 5) * 2
+        return b"".join(frames)[start:]
+
+    def _note_voice(self):
+        """After a VAD feed: remember when the visitor was last audibly talking."""
+        vad = self.vad
+        if vad.in_speech and vad.speech_end == vad.samples_seen:
+            self._last_voice_at = time.monotonic()
 
     # --------------------------------------------------------------------
     # Gemini 3.1 Flash Live session
     # --------------------------------------------------------------------
 
-    async def _receive_turn(self, session, timeout: float = 30.0) -> Tuple[bytes, str]:
+    async def _mic_pump(self, session, duplex: _DuplexState):
         """
-        Consume one complete model turn from the Live session.
-        Audio chunks are streamed to the speaker in real-time via a
-        background thread so playback starts immediately.
-        Returns (raw_audio_bytes, transcript_string).
+        Session-long capture.  Mic audio is forwarded to Gemini chunk by
+        chunk whenever the speaker is quiet.  While it is playing, audio is
+        held back (the mic mostly hears our own roast) until the echo gate
+        decides the visitor is talking over it — then playback is cut and
+        the held pre-roll plus everything after it goes straight out.
         """
-        audio_q  = queue.Queue()
-        stop_evt = threading.Event()
-        play_thr = threading.Thread(
-            target=self._play_worker, args=(audio_q, stop_evt), daemon=True
+        from google.genai import types
+
+        loop    = asyncio.get_running_loop()
+        preroll = collections.deque(maxlen=BARGE_IN_PREROLL)
+        self.audio.mic_reset()
+        try:
+            # Checked between reads rather than cancelled, so no executor
+            # thread is left blocked in read_mic after the session ends
+            while not duplex.closed:
+                data = await loop.run_in_executor(None, self.audio.read_mic)
+                if duplex.playing.is_set():
+                    if not self.barge_in:
+                        continue
+                    preroll.append(data)
+                    if not self.echo_gate.feed(data):
+                        continue
+                    print("\n  ✋ Barge-in — cutting the roast short")
+                    self.spans.mark("barge_in")
+                    duplex.barge_in()
+                    outgoing = list(preroll)
+                elif duplex.listening:
+                    self.vad.feed(data)
+                    self._note_voice()
+                    if self.vad.heard_speech:
+                        duplex.heard_speech = True
+                    outgoing = [data]
+                else:
+                    continue   # waiting on the model — don't stream porch noise at it
+                preroll.clear()
+                for chunk in outgoing:
+                    if self.audio_trace is not None:
+                        self.audio_trace.visitor(chunk)
+                    await session.send_realtime_input(
+                        audio=types.Blob(data=chunk, mime_type="audio/pcm;rate=16000")
+                    )
+        finally:
+            self.audio.mic_idle()
+
+    async def _stream_mic_exchange(
+        self, session, duplex: _DuplexState, max_seconds: int = 8, label: str = "exchange"
+    ) -> Optional[str]:
+        """
+        Wait for the visitor's reply while `_mic_pump` streams their audio,
+        and let Gemini's server-side activity detection decide when their
+        turn is over.  Returns the model's answer transcript, or None if the
+        visitor never said anything.
+        """
+        print(f"  🎤 Listening (streaming, up to {max_seconds}s)...")
+        replied = asyncio.Event()
+        self._last_voice_at = None
+        duplex.begin_listening(self.vad)
+        reply = asyncio.create_task(
+            self._receive_turn(session, first_response=replied, duplex=duplex, label=label)
         )
-        play_thr.start()
+        try:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(replied.wait(), timeout=max_seconds)
+
+            if not replied.is_set():
+                if not duplex.heard_speech:
+                    print("  (no speech detected)")
+                    return None
+                # Server never closed the turn (steady background noise?) — end it ourselves
+                await session.send_realtime_input(audio_stream_end=True)
+
+            return await reply
+        finally:
+            # Cancelled, failed send or nobody talked: don't leave the receiver behind
+            if not reply.done():
+                reply.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await reply
+
+    async def _receive_turn(
+        self, session, timeout: float = 30.0,
+        first_response: Optional[asyncio.Event] = None,
+        duplex: Optional[_DuplexState] = None,
+        label: str = "turn",
+    ) -> str:
+        """
+        Consume one complete model turn from the Live session.
+        Audio chunks go straight into the speaker ring as they arrive,
+        so playback starts immediately.
+        `first_response` (if given) is set as soon as the model starts replying.
+        With `duplex`, the turn ends early if the visitor barges in.
+        Marks `<label>.first_audio` / `<label>.done` on the interaction's
+        spans, plus `<label>.reply` (visitor's last word → first reply byte).
+        Audio is also handed to the audio trace (if enabled) rather than
+        collected here.  Returns the transcript.
+        """
+        if duplex is not None:
+            self.echo_gate.reset()
 
-        audio_buf  = []
         transcript = ""
 
         async def _collect():
@@ -272,16 +842,37 @@ class HalloweenRoaster:
             async for response in session.receive():
                 sc = response.server_content
                 if sc:
+                    if first_response is not None and (sc.model_turn or sc.turn_complete):
+                        first_response.set()
+                    if duplex is not None and sc.model_turn and not duplex.barged_in:
+                        duplex.listening = False
                     if sc.model_turn:
                         for part in sc.model_turn.parts:
                             # NOTE: Gemini 3.1 Flash Live may return audio + transcript
                             # in the *same* event — process all parts each iteration.
                             if part.inline_data:
                                 chunk = part.inline_data.data
-                                audio_buf.append(chunk)
-                                audio_q.put(chunk)
+                                if f"{label}.first_audio" not in self.spans.marks:
+                                    self.spans.mark(f"{label}.first_audio")
+                                    if self._last_voice_at is not None:
+                                        self.spans.add(
+                                            f"{label}.reply", time.monotonic() - self._last_voice_at
+                                        )
+                                if self.audio_trace is not None:
+                                    self.audio_trace.model(chunk)
+                                if duplex is None:
+                                    self.audio.play(chunk)
+                                elif not duplex.barged_in:
+                                    self.audio.play(chunk)
+                                    duplex.playing.set()
                     if sc.output_transcription:
                         transcript += sc.output_transcription.text
+                    if sc.interrupted:
+                        # Gemini heard the visitor over its own turn
+                        if duplex is not None and not duplex.barged_in:
+                            self.spans.mark("barge_in")
+                            duplex.barge_in()
+                        return
                     if sc.turn_complete:
                         return
 
@@ -290,88 +881,132 @@ class HalloweenRoaster:
         except asyncio.TimeoutError:
             print(f"  ⚠️  Gemini response timed out after {timeout}s — moving on.")
         finally:
-            audio_q.put(None)       # signal playback thread to finish
-            play_thr.join(timeout=15)
-            stop_evt.set()
+            self.audio.finish()
+            # Wait off the event loop so the mic pump keeps running during playback
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.audio.wait_drained, 15
+            )
+            if duplex is not None:
+                duplex.playing.clear()
+            self.spans.mark(f"{label}.done")
 
         if transcript:
             print(f"  🎃 Gemini: {transcript}")
-        return b"".join(audio_buf), transcript
+        return transcript
 
-    async def _live_session(self, image_bytes: bytes) -> dict:
+    async def _live_session(
+        self, image_bytes: bytes, spec: Optional[Speculation] = None
+    ) -> dict:
         """
-        Open one Gemini 3.1 Flash Live WebSocket session for a complete
+        Run one Gemini 3.1 Flash Live WebSocket session for a complete
         trick-or-treater interaction (roast + up to 3 voice exchanges).
+        The session comes pre-connected from the pool when one is warm, or
+        from a claimed speculation that already holds the image.
         """
-        config = {
-            "response_modalities": ["AUDIO"],
-            # Charon: deep, dramatic — perfect for the Halloween Wizard of Oz
-            "speech_config": {
-                "voice_config": {
-                    "prebuilt_voice_config": {"voice_name": "Charon"}
-                }
-            },
-            "system_instruction": SYSTEM_PROMPT,
-            # minimal thinking = lowest latency (default for 3.1)
-            "thinking_config": {"thinking_level": "minimal"},
-            # capture transcriptions so trace files remain readable
-            "output_audio_transcription": {},
-        }
+        if spec is not None:
+            try:
+                return await self._run_session(spec.session, image_bytes, image_sent=True)
+            finally:
+                await self.speculator.release(spec)
+        t0 = time.monotonic()
+        async with self.live_pool.session() as session:
+            self.spans.add("connect", time.monotonic() - t0)
+            self.spans.mark("connected")
+            return await self._run_session(session, image_bytes)
+
+    async def _run_session(self, session, image_bytes: bytes, image_sent: bool = False) -> dict:
+        # Streaming mode keeps the mic open for the whole session
+        duplex = _DuplexState(self.audio) if self.stream_mic else None
+        pump   = (
+            asyncio.create_task(self._mic_pump(session, duplex))
+            if duplex is not None else None
+        )
+        try:
+            return await self._converse(session, image_bytes, duplex, image_sent)
+        finally:
+            if pump is not None:
+                duplex.closed = True
+                await pump
+
+    async def _converse(
+        self, session, image_bytes: bytes, duplex: Optional[_DuplexState],
+        image_sent: bool = False,
+    ) -> dict:
+        """Initial roast plus up to 3 voice exchanges on an open session."""
+        from google.genai import types
 
         conversation_log  = []
         exchanges_count   = 0
 
-        async with self.client.aio.live.connect(model=MODEL, config=config) as session:
-
-            # ── Initial roast ────────────────────────────────────────────
+        # ── Initial roast ────────────────────────────────────────────
+        if image_sent:
+            print("Costume image already in the session (sent on motion)")
+        else:
             print("Sending costume image to Gemini Live...")
             await session.send_realtime_input(
                 video=types.Blob(data=image_bytes, mime_type="image/jpeg")
             )
-            await session.send_realtime_input(
-                text="Roast this trick-or-treater's Halloween costume!"
-            )
-            _, roast_text = await self._receive_turn(session)
-            conversation_log.append({
-                "role": "assistant",
-                "content": roast_text or "[audio roast]"
-            })
+        await session.send_realtime_input(
+            text="Roast this trick-or-treater's Halloween costume!"
+        )
+        self.spans.mark("roast.sent")
+        self._last_voice_at = None
+        roast_text = await self._receive_turn(session, duplex=duplex, label="roast")
+        conversation_log.append({
+            "role": "assistant",
+            "content": roast_text or "[audio roast]"
+        })
 
-            # ── Conversation loop (up to 3 exchanges) ────────────────────
-            for i in range(3):
-                print(f"\n--- Exchange {i + 1}/3 ---")
-                user_audio = self.record_pcm(max_seconds=8, silence_timeout=2.0)
-
-                if user_audio is None:
-                    # No response from the trick-or-treater
-                    if i == 0:
-                        await session.send_realtime_input(
-                            text=(
-                                "They didn't respond at all. Give a quick snarky farewell "
-                                "— mock them for being too stunned, scared, or embarrassed to reply."
-                            )
+        # ── Conversation loop (up to 3 exchanges) ────────────────────
+        for i in range(3):
+            print(f"\n--- Exchange {i + 1}/3 ---")
+            label = f"exchange{i + 1}"
+            if self.stream_mic:
+                # Mic audio goes out while they talk; the reply comes back here
+                comeback = await self._stream_mic_exchange(
+                    session, duplex, max_seconds=8, label=label
+                )
+                heard    = comeback is not None
+            else:
+                with self.spans.span(f"{label}.record"):
+                    user_audio = await asyncio.get_running_loop().run_in_executor(
+                        None, functools.partial(self.record_pcm, max_seconds=8, silence_timeout=2.0)
+                    )
+                heard      = user_audio is not None
+
+            if not heard:
+                # No response from the trick-or-treater
+                if i == 0:
+                    await session.send_realtime_input(
+                        text=(
+                            "They didn't respond at all. Give a quick snarky farewell "
+                            "— mock them for being too stunned, scared, or embarrassed to reply."
                         )
-                        _, farewell = await self._receive_turn(session)
-                        conversation_log.append({
-                            "role": "assistant",
-                            "content": farewell or "[farewell audio]"
-                        })
-                    break
-
+                    )
+                    farewell = await self._receive_turn(session, duplex=duplex, label="farewell")
+                    conversation_log.append({
+                        "role": "assistant",
+                        "content": farewell or "[farewell audio]"
+                    })
+                break
+
+            conversation_log.append({"role": "user", "content": "[voice]"})
+            if not self.stream_mic:
                 # Send raw mic audio directly to Gemini — no STT step needed
                 print("  Sending voice response to Gemini Live...")
-                conversation_log.append({"role": "user", "content": "[voice]"})
+                if self.audio_trace is not None:
+                    self.audio_trace.visitor(user_audio)
                 await session.send_realtime_input(
                     audio=types.Blob(data=user_audio, mime_type="audio/pcm;rate=16000")
                 )
                 # Signal end-of-stream so Gemini doesn't wait for more audio
                 await session.send_realtime_input(audio_stream_end=True)
-                _, comeback = await self._receive_turn(session)
-                conversation_log.append({
-                    "role": "assistant",
-                    "content": comeback or "[audio comeback]"
-                })
-                exchanges_count = i + 1
+                comeback = await self._receive_turn(session, label=label)
+            conversation_log.append({
+                "role": "assistant",
+                "content": comeback or "[audio comeback]"
+            })
+            exchanges_count = i + 1
 
         return {
             "conversation_history": conversation_log,
@@ -382,40 +1017,85 @@ class HalloweenRoaster:
     # Interaction orchestration
     # --------------------------------------------------------------------
 
-    def run_interaction(self):
+    async def run_interaction(self):
         print("\n" + "=" * 50)
-        print("Starting new interaction...")
+        print(f"{self._tag}Starting new interaction...")
         print("=" * 50)
 
+        loop      = asyncio.get_running_loop()
         timestamp = datetime.now().isoformat()
+        trace_id  = new_trace_id()
         self.last_interaction_time = time.time()
-
-        pil_image, image_bytes = self.capture_image()
-
-        # Bridge sync→async for the Live session
-        result = asyncio.run(self._live_session(image_bytes))
-
-        print("\nInteraction complete!")
-        self._save_trace(pil_image, {
+        visitors, self._visitor_ids = self._visitor_ids, ()
+        if self.tracker is not None:
+            # Everyone on the porch hears this roast, not just the newcomer
+            self.tracker.mark_roasted()
+
+        # Marks are measured from the frame that triggered the interaction
+        frame_ts, confirmed_at = self._trigger or (None, None)
+        self._trigger = None
+        spec = self.speculator.claim() if self.speculator is not None and frame_ts else None
+        started_at = time.monotonic()
+
+        still = None
+        if spec is not None:
+            still = await self.speculator.ready(spec)
+            if still is None:
+                await self.speculator.release(spec)
+                spec = None
+        # A claimed speculation's spans run from the motion that started it
+        self.spans = spec.spans if spec is not None else SpanTimer(origin=frame_ts)
+        if confirmed_at is not None:
+            self.spans.mark("person", confirmed_at)
+        self.spans.mark("start", started_at)
+        if still is None:
+            still = await loop.run_in_executor(None, self.capture_image)
+        elif not self._still_shows(still, self.last_person_box):
+            # Cropped to the first motion, before the whole visitor was in
+            # view: the roast gets a fresh still of who YOLO confirmed
+            from google.genai import types
+            print("  Speculative still misses part of the visitor — recapturing")
+            self.speculator.recaptured += 1
+            still = await loop.run_in_executor(None, self.capture_image)
+            await spec.session.send_realtime_input(
+                video=types.Blob(data=still.jpeg, mime_type="image/jpeg")
+            )
+        if self._ready is not None and not self._ready.done():
+            # A visitor beat the audio devices / Gemini client to the porch
+            with self.spans.span("startup"):
+                await self._ready
+
+        audio_files = None
+        if self.audio_tracer is not None:
+            self.audio_trace = self.audio_tracer.open(trace_id)
+        try:
+            result = await self._live_session(still.jpeg, spec)
+        finally:
+            if self.audio_trace is not None:
+                audio_files, self.audio_trace = self.audio_trace.close(), None
+
+        self.spans.mark("done")
+        self.latency.add_spans(self.spans)
+        print(f"\n{self._tag}Interaction complete!")
+        print(self._tag + self.latency.log_line(HEADLINE_LATENCIES))
+        # Queued for the trace writer thread — detection resumes straight away
+        self.traces.submit({
             "timestamp":            timestamp,
             "model":                MODEL,
             "conversation_history": result["conversation_history"],
             "exchanges_count":      result["exchanges_count"],
             "mode":                 "auto" if self.auto_detect else "manual",
-        })
-
-    def _save_trace(self, pil_image: Image.Image, data: dict):
-        ts   = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base = f"roast_{ts}"
-
-        img_path = self.traces_dir / f"{base}.jpg"
-        pil_image.save(img_path, format="JPEG", quality=85)
-        print(f"✓ Saved image: {img_path}")
-
-        json_path = self.traces_dir / f"{base}.json"
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=2)
-        print(f"✓ Saved trace: {json_path}")
+            "visitors":             list(visitors),
+            "speculative":          spec is not None,
+            "image": {
+                "width":   still.width,
+                "height":  still.height,
+                "quality": still.quality,
+                "bytes":   len(still.jpeg),
+            },
+            "audio":                audio_files,
+            "latency":              self.spans.as_dict(),
+        }, jpeg=still.jpeg, trace_id=trace_id)
 
     # --------------------------------------------------------------------
     # Main run loop
@@ -424,50 +1104,135 @@ class HalloweenRoaster:
     def run(self):
         print("\n🎃 Halloween Roaster is running! 🎃")
         print("Press Ctrl+C to exit")
-        if self.auto_detect:
-            print(f"\n🤖 AUTO-DETECT MODE — cooldown: {self.cooldown_seconds}s")
-            self._run_auto_detect()
-        else:
-            print("\n👤 MANUAL MODE")
-            self._run_manual()
-
-    def _run_auto_detect(self):
         try:
-            while True:
-                if self.is_cooldown_active():
-                    rem = int(self.cooldown_seconds - (time.time() - self.last_interaction_time))
-                    if rem % 10 == 0 or rem <= 5:
-                        print(f"Cooldown: {rem}s remaining...", end="\r")
-                    time.sleep(1)
-                    continue
-                if self.detect_person():
-                    print("\n👻 Person detected! Starting interaction...")
-                    self.run_interaction()
-                    print(f"\nMonitoring resumed (cooldown: {self.cooldown_seconds}s)...")
-                else:
-                    print("Monitoring for trick-or-treaters...", end="\r")
-                    time.sleep(0.5)
+            # One event loop for the life of the process: Live sessions, the
+            # mic pump and the detection loop all share it
+            asyncio.run(self._main())
         except KeyboardInterrupt:
             print("\n\nShutting down...")
+        finally:
             self.cleanup()
 
-    def _run_manual(self):
+    async def _main(self):
+        # Detection runs straight away; audio, the Gemini client and the
+        # Live pool finish coming up alongside it
+        self._ready = asyncio.ensure_future(self._start_rest())
+        if self.speculator is not None:
+            self.speculator.bind(asyncio.get_running_loop())
         try:
-            while True:
-                input("Press Enter when someone arrives (or Ctrl+C to exit)...")
-                self.run_interaction()
-                print("\nReady for next person...")
-        except KeyboardInterrupt:
-            print("\n\nShutting down...")
-            self.cleanup()
+            if self.auto_detect:
+                guard = ("per-visitor tracking" if self.tracker is not None
+                         else f"cooldown: {self.cooldown_seconds}s")
+                print(f"\n🤖 AUTO-DETECT MODE — {guard}")
+                await self._run_auto_detect()
+            else:
+                print("\n👤 MANUAL MODE")
+                await self._run_manual()
+        finally:
+            self._ready.cancel()
+            await asyncio.gather(self._ready, return_exceptions=True)
+            if self.speculator is not None:
+                await self.speculator.close()
+            await self.live_pool.close()
+
+    def _check_startup(self):
+        """Surface a failed background startup stage without waiting for a visitor."""
+        if self._ready is not None and self._ready.done():
+            self._ready.result()
+
+    async def _run_auto_detect(self):
+        loop = asyncio.get_running_loop()
+        print(f"{self._tag}Monitoring for trick-or-treaters...")
+        while True:
+            self._check_startup()
+            # Blocks for up to ~0.5 s waiting on motion/YOLO — keep it off the loop
+            if not await loop.run_in_executor(None, self._wait_for_person):
+                continue
+            print(f"\n👻 {self._tag}Person detected! Starting interaction...")
+            self._pause_detection("interaction")
+            try:
+                await self.run_interaction()
+                cooldown = self.cooldown_remaining()
+                if cooldown > 0:
+                    # One sleep for the whole cooldown, detector still paused
+                    self.scheduler.pause("cooldown")
+                    print(f"{self._tag}Cooldown: {cooldown:.0f}s, detector paused")
+                    await asyncio.sleep(cooldown)
+            finally:
+                self._resume_detection()
+            print(f"\n{self._tag}Monitoring resumed...")
+
+    async def _run_manual(self):
+        while True:
+            self._check_startup()
+            await _readline_async("Press Enter when someone arrives (or Ctrl+C to exit)...")
+            await self.run_interaction()
+            print("\nReady for next person...")
 
     def cleanup(self):
-        print("Cleaning up...")
-        self.cap.release()
-        self.pa.terminate()
+        print(f"{self._tag}Cleaning up...")
+        if self.engine:
+            self.engine.stop()
+            if self.yolo_worker is not None:
+                print(f"  Shared YOLO: {self.engine.batched}/{self.engine.submitted} "
+                      f"crops batched with another door")
+        if self.grabber is not None:
+            self.grabber.stop()
+            print(f"  Camera: {self.grabber.stats()}")
+        if self.cap is not None:
+            self.cap.release()
+        if self.audio is not None:
+            print(f"  Audio: {self.audio.metrics()}")
+        print(f"  Live sessions: {self.live_pool.stats()}")
+        if self.tracker is not None:
+            print(f"  Visitors: {self.tracker.stats()}")
+        if self.scheduler is not None:
+            print(f"  Detection states: {self.scheduler.stats()}")
+        if self.speculator is not None:
+            print(f"  Speculation: {self.speculator.stats()}")
+        if self.latency.samples:
+            print("  Latency (ms):")
+            for name, stats in self.latency.summary().items():
+                print(f"    {name:<22} {stats}")
+        self.traces.close()
+        print(f"  Traces: {self.traces.stats()}")
+        if self.audio_tracer is not None:
+            self.audio_tracer.close()
+            print(f"  Audio traces: {self.audio_tracer.stats()}")
+        if self.audio is not None:
+            self.audio.stop()
         print("Goodbye! 🎃")
 
 
+def _settle_future(fut: asyncio.Future, result, exc: Optional[BaseException]):
+    if fut.done():
+        return
+    if exc is not None:
+        fut.set_exception(exc)
+    else:
+        fut.set_result(result)
+
+
+async def _readline_async(prompt: str) -> str:
+    """
+    input() without blocking the event loop.  Uses a daemon thread rather
+    than the default executor so Ctrl+C doesn't hang waiting on stdin.
+    """
+    loop = asyncio.get_running_loop()
+    fut  = loop.create_future()
+
+    def _read():
+        try:
+            line = input(prompt)
+        except BaseException as exc:   # EOFError / KeyboardInterrupt in the reader
+            loop.call_soon_threadsafe(_settle_future, fut, None, exc)
+        else:
+            loop.call_soon_threadsafe(_settle_future, fut, line, None)
+
+    threading.Thread(target=_read, name="stdin", daemon=True).start()
+    return await fut
+
+
 # ----------------------------------------------------------------------------
 # Entry point
 # ----------------------------------------------------------------------------
@@ -486,19 +1251,96 @@ def main():
 Examples:
   python3 halloween_roaster.py              # Auto-detect mode (default)
   python3 halloween_roaster.py --manual     # Press Enter to trigger each roast
-  python3 halloween_roaster.py --cooldown 90
+  python3 halloween_roaster.py --no-track --cooldown 90
+  python3 halloween_roaster.py --motion-roi 0.2,0.1,0.6,0.9 --motion-stats 120
+  python3 halloween_roaster.py --camera file:porch.mp4 --audio wav:reply.wav --speed 2
+  python3 halloween_roaster.py --station front=v4l2:0@pyaudio:1 --station side=v4l2:2@pyaudio:3
         """,
     )
     parser.add_argument("--manual",   action="store_true", help="Disable auto-detection")
     parser.add_argument("--cooldown", type=int, default=60,
-                        help="Seconds between detections (default: 60)")
+                        help="Seconds between detections with --no-track (default: 60)")
+    parser.add_argument("--no-track", action="store_true",
+                        help="Use the wall-clock cooldown instead of roasting each new visitor once")
+    parser.add_argument("--idle-fps", type=float, default=3.0,
+                        help="Motion rate once the porch is quiet; 0 = never slow down (default: 3)")
+    parser.add_argument("--idle-after", type=float, default=10.0,
+                        help="Seconds without motion before slowing down (default: 10)")
+    parser.add_argument("--no-speculate", action="store_true",
+                        help="Wait for YOLO to confirm a visitor before opening the Live "
+                             "session and sending the still")
+    parser.add_argument("--serial-detect", action="store_true",
+                        help="Run motion and YOLO one after another on the main thread")
+    parser.add_argument("--local-vad", action="store_true",
+                        help="Record each reply locally (RMS silence gate) before sending it")
+    parser.add_argument("--no-barge-in", action="store_true",
+                        help="Mute the mic while the roast is playing")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="Connect to Gemini Live only when a visitor arrives")
+    parser.add_argument("--motion-width", type=int, default=320,
+                        help="Width motion detection runs at; 0 = full resolution (default: 320)")
+    parser.add_argument("--motion-roi", type=parse_roi, default=None, metavar="X,Y,W,H",
+                        help="Porch region as frame fractions, e.g. 0.2,0.1,0.6,0.9")
+    parser.add_argument("--motion-stats", type=int, default=0, metavar="N",
+                        help="Print motion-stage cost every N frames (default: off)")
+    parser.add_argument("--still-quality", type=int, default=85,
+                        help="Starting JPEG quality of the costume still (default: 85)")
+    parser.add_argument("--upload-edge", type=int, default=768,
+                        help="Long edge of the uploaded still; 0 = no scaling (default: 768)")
+    parser.add_argument("--upload-kb", type=int, default=150,
+                        help="JPEG size budget for the uploaded still; 0 = none (default: 150)")
+    parser.add_argument("--no-crop", action="store_true",
+                        help="Upload the whole frame instead of cropping to the visitor")
+    parser.add_argument("--detect-scale", type=int, default=2, choices=(1, 2, 4, 8),
+                        help="Decode MJPG at 1/N size for motion + YOLO; full frames only "
+                             "for stills (default: 2)")
+    parser.add_argument("--burst", type=int, default=4, metavar="N",
+                        help="Frames captured for the still, best one sent; 1 = newest frame (default: 4)")
+    parser.add_argument("--burst-ms", type=int, default=300,
+                        help="Longest the burst waits for new frames (default: 300)")
+    parser.add_argument("--camera", default="v4l2", metavar="SOURCE",
+                        help="v4l2[:N], file:PATH or synthetic (default: v4l2)")
+    parser.add_argument("--audio", default="pyaudio", metavar="BACKEND",
+                        help="pyaudio, wav:PATH (replayed visitor replies) or synthetic")
+    parser.add_argument("--station", action="append", type=parse_station, default=[],
+                        metavar="NAME=CAMERA[@AUDIO]",
+                        help="A door (camera + audio) run by this process; repeat per door "
+                             "(replaces --camera/--audio)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Pacing of file/synthetic sources vs real time; 0 = unpaced")
+    parser.add_argument("--trace-audio", action="store_true",
+                        help="Save model and visitor audio of each interaction (FLAC if soundfile is installed)")
     args = parser.parse_args()
 
     try:
-        roaster = HalloweenRoaster(
+        options = dict(
+            source_speed=args.speed,
             auto_detect=not args.manual,
             cooldown_seconds=args.cooldown,
+            track_visitors=not args.no_track,
+            idle_fps=args.idle_fps,
+            idle_after=args.idle_after,
+            speculate=not args.no_speculate,
+            motion_width=args.motion_width or None,
+            motion_roi=args.motion_roi,
+            motion_report_every=args.motion_stats,
+            pipelined=not args.serial_detect,
+            stream_mic=not args.local_vad,
+            barge_in=not args.no_barge_in,
+            prewarm_live=not args.no_prewarm,
+            still_quality=args.still_quality,
+            upload_edge=args.upload_edge or None,
+            upload_kb=args.upload_kb or None,
+            crop_to_person=not args.no_crop,
+            burst_frames=args.burst,
+            detect_scale=args.detect_scale,
+            burst_window=args.burst_ms / 1000,
+            trace_audio=args.trace_audio,
         )
+        if args.station:
+            run_stations(build_stations(args.station, **options))
+            return
+        roaster = HalloweenRoaster(camera=args.camera, audio=args.audio, **options)
         roaster.run()
     except KeyboardInterrupt:
         print("\n\nExiting...")
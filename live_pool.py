@@ -0,0 +1,217 @@
+"""
+Pre-warmed Gemini Live sessions.
+
+Opening `client.aio.live.connect` costs a WebSocket + TLS handshake and the
+session setup round trip — all of it on the critical path if we only
+connect once a visitor has been detected.  `LiveSessionPool` keeps one
+session open while the porch is idle, hands it to the next interaction and
+immediately starts warming its replacement.
+
+An idle session can die underneath us: the server sends `go_away` before
+ending a connection, closes idle sockets, and caps session lifetime.  Each
+warm session therefore has a watcher task that listens on it while idle;
+if the server says goodbye, the socket drops, or the session simply gets
+old (`max_idle`), it is thrown away and a new one is opened in the
+background, so `session()` always hands out a usable connection.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Callable, Optional
+
+
+class _Slot:
+    def __init__(self, cm, session, opened_at: float):
+        self.cm        = cm
+        self.session   = session
+        self.opened_at = opened_at
+        self.dead      = False
+        self.watcher: Optional[asyncio.Task] = None
+
+
+class LiveSessionPool:
+    """
+    Keeps one Live session open ahead of time.
+
+    Args:
+        connect:     Zero-argument callable returning the async context
+                     manager for a new session, e.g.
+                     `lambda: client.aio.live.connect(model=MODEL, config=CFG)`.
+        max_idle:    Recycle a warm session after this many idle seconds.
+        retry_delay: Back-off between failed connection attempts.
+        prewarm:     False connects on demand (no pool), for debugging.
+
+    Usage (inside the event loop):
+        await pool.start()
+        async with pool.session() as session:
+            ...
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        max_idle: float = 300.0,
+        retry_delay: float = 5.0,
+        prewarm: bool = True,
+    ):
+        self._connect    = connect
+        self.max_idle    = max_idle
+        self.retry_delay = retry_delay
+        self.prewarm     = prewarm
+
+        self._ready: Optional[_Slot]          = None
+        self._warming: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.hits        = 0   # interaction got an already-open session
+        self.misses      = 0   # interaction had to wait for a connect
+        self.recycled    = 0   # warm sessions replaced (go_away / closed / too old)
+        self.connect_ms: list = []
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    async def start(self):
+        if self.prewarm:
+            self._refill()
+
+    async def close(self, grace: float = 2.0):
+        """
+        Close the warm session.  A connect still in flight gets `grace`
+        seconds to finish (and is then closed cleanly) rather than being
+        cut off mid-handshake.
+        """
+        self._closed = True
+        if self._warming is not None:
+            # ConnectionClosed and friends: the socket is going anyway
+            with contextlib.suppress(asyncio.TimeoutError, asyncio.CancelledError, Exception):
+                await asyncio.wait_for(asyncio.shield(self._warming), timeout=grace)
+            self._warming.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._warming
+        slot, self._ready = self._ready, None
+        if slot is not None:
+            await self._retire(slot)
+
+    def stats(self) -> dict:
+        ms = sorted(self.connect_ms)
+        return {
+            "hits":           self.hits,
+            "misses":         self.misses,
+            "recycled":       self.recycled,
+            "connect_ms_p50": round(ms[len(ms) // 2], 1) if ms else None,
+        }
+
+    # --------------------------------------------------------------------
+    # Consumer API
+    # --------------------------------------------------------------------
+
+    @contextlib.asynccontextmanager
+    async def session(self):
+        """Yield an open Live session; it is closed (and replaced) afterwards."""
+        slot = await self._take()
+        try:
+            yield slot.session
+        finally:
+            await self._close_slot(slot)
+            if self.prewarm and not self._closed:
+                self._refill()
+
+    async def _take(self) -> _Slot:
+        if not self.prewarm:
+            self.misses += 1
+            return await self._open_once()
+        waited = False
+        while True:
+            if self._closed:
+                raise RuntimeError("Live session pool is closed")
+            if self._ready is None:
+                waited = True
+                self._refill()
+                await asyncio.shield(self._warming)
+                continue
+            slot, self._ready = self._ready, None
+            await self._stop_watcher(slot)
+            if slot.dead:
+                await self._close_slot(slot)
+                continue
+            if waited:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return slot
+
+    # --------------------------------------------------------------------
+    # Warming
+    # --------------------------------------------------------------------
+
+    def _refill(self):
+        if self._closed or self._ready is not None:
+            return
+        if self._warming is None or self._warming.done():
+            self._warming = asyncio.create_task(self._warm())
+
+    async def _warm(self):
+        while not self._closed:
+            try:
+                slot = await self._open_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"  ⚠️  Live pre-connect failed ({exc}); retrying in {self.retry_delay:.0f}s")
+                await asyncio.sleep(self.retry_delay)
+                continue
+            slot.watcher = asyncio.create_task(self._watch(slot))
+            self._ready  = slot
+            return
+
+    async def _open_once(self) -> _Slot:
+        t0 = time.monotonic()
+        cm = self._connect()
+        session = await cm.__aenter__()
+        self.connect_ms.append((time.monotonic() - t0) * 1000)
+        del self.connect_ms[:-100]
+        return _Slot(cm, session, time.monotonic())
+
+    # --------------------------------------------------------------------
+    # Idle watcher
+    # --------------------------------------------------------------------
+
+    async def _watch(self, slot: _Slot):
+        """Listen on an idle session until the server ends it or it ages out."""
+        async def _listen():
+            async for msg in slot.session.receive():
+                if getattr(msg, "go_away", None):
+                    return
+
+        try:
+            await asyncio.wait_for(_listen(), timeout=self.max_idle)
+        except asyncio.CancelledError:
+            raise                   # handed to an interaction
+        except Exception:
+            pass                    # timed out, or the socket went away
+        # Anything else means this session is no longer worth keeping
+        slot.dead = True
+        if self._ready is slot:
+            self._ready = None
+            self.recycled += 1
+            await self._close_slot(slot)
+            self._refill()
+
+    async def _stop_watcher(self, slot: _Slot):
+        if slot.watcher is not None and not slot.watcher.done():
+            slot.watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await slot.watcher
+        slot.watcher = None
+
+    async def _retire(self, slot: _Slot):
+        await self._stop_watcher(slot)
+        await self._close_slot(slot)
+
+    async def _close_slot(self, slot: _Slot):
+        with contextlib.suppress(Exception):
+            await slot.cm.__aexit__(None, None, None)
@@ -0,0 +1,125 @@
+"""
+On-disk cache for the NCNN export of the YOLO person detector.
+
+Exporting yolo11n to NCNN costs many seconds of CPU on a Pi 5.  The export
+only changes when the source weights, the input size or the ultralytics
+version change, so the artifact is stored under a key derived from exactly
+those three things and reused on every later start.
+"""
+
+import hashlib
+import json
+import shutil
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Tuple
+
+DEFAULT_CACHE_DIR = Path("model_cache")
+META_FILE         = "cache_meta.json"
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(weights_sha256: str, imgsz: int, ultralytics_version: str) -> str:
+    """Stable key for one (weights, imgsz, ultralytics) export."""
+    raw = f"{weights_sha256}:{imgsz}:{ultralytics_version}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def cached_export_dir(
+    weights: str, imgsz: int, ultralytics_version: str,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+) -> Tuple[Path, str]:
+    """Return (directory the NCNN export lives in, cache key)."""
+    key  = cache_key(_file_sha256(Path(weights)), imgsz, ultralytics_version)
+    stem = Path(weights).stem
+    return Path(cache_dir) / key / f"{stem}_ncnn_model", key
+
+
+def is_cached(export_dir: Path, key: str) -> bool:
+    meta = export_dir.parent / META_FILE
+    if not export_dir.is_dir() or not meta.is_file():
+        return False
+    try:
+        return json.loads(meta.read_text()).get("key") == key
+    except (OSError, ValueError):
+        return False
+
+
+def load_person_model(
+    weights: str = "yolo11n.pt", imgsz: int = 320,
+    cache_dir: Path = DEFAULT_CACHE_DIR, timer=None,
+):
+    """
+    Load the NCNN person detector, exporting it only on a cache miss.
+
+    Returns (model, source) where source is "cache", "export" or "pytorch"
+    (the last when NCNN export failed and the .pt model is used as-is).
+    `timer` is an optional timing.PhaseTimer that receives one phase per step.
+    """
+    import ultralytics
+    from ultralytics import YOLO
+
+    def _phase(name):
+        return timer.phase(name) if timer else nullcontext()
+
+    if not Path(weights).is_file():
+        # First ever run — let ultralytics download the weights
+        with _phase("yolo download"):
+            YOLO(weights)
+
+    with _phase("weights hash"):
+        export_dir, key = cached_export_dir(
+            weights, imgsz, ultralytics.__version__, cache_dir
+        )
+
+    if is_cached(export_dir, key):
+        with _phase("ncnn load (cached)"):
+            return YOLO(str(export_dir), task="detect"), "cache"
+
+    with _phase("yolo load"):
+        model = YOLO(weights)
+    try:
+        with _phase("ncnn export"):
+            exported = Path(model.export(format="ncnn", imgsz=imgsz))
+            export_dir.parent.mkdir(parents=True, exist_ok=True)
+            if export_dir.exists():
+                shutil.rmtree(export_dir)
+            shutil.move(str(exported), str(export_dir))
+            (export_dir.parent / META_FILE).write_text(json.dumps({
+                "key":                 key,
+                "weights":             str(weights),
+                "imgsz":               imgsz,
+                "ultralytics_version": ultralytics.__version__,
+            }, indent=2))
+        with _phase("ncnn load"):
+            return YOLO(str(export_dir), task="detect"), "export"
+    except Exception as exc:
+        print(f"  - NCNN export failed ({exc}), using standard model")
+        return model, "pytorch"
+
+
+def warm_up_async(model, imgsz: int = 320) -> threading.Thread:
+    """
+    Run one throwaway inference in the background so the first real
+    detection doesn't pay for lazy graph/allocator setup.
+    """
+    import numpy as np
+
+    def _run():
+        try:
+            model(np.zeros((imgsz, imgsz, 3), np.uint8), verbose=False, imgsz=imgsz)
+        except Exception as exc:
+            print(f"  - YOLO warm-up failed ({exc})")
+
+    thr = threading.Thread(target=_run, name="yolo-warmup", daemon=True)
+    thr.start()
+    return thr
+
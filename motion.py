@@ -0,0 +1,189 @@
+"""
+Motion stage for the Halloween Roaster's two-stage person detection.
+
+Background subtraction runs on a small grayscale copy of the frame instead
+of the full 1920x1080 BGR image, optionally restricted to a porch region of
+interest.  `motion_threshold` stays expressed in full-resolution pixels and
+is scaled to the working resolution, so changing `work_width` doesn't change
+how big something has to be to trigger.
+"""
+
+import time
+from collections import deque
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# (x, y, w, h) as fractions of the full frame, e.g. (0.25, 0.2, 0.5, 0.8)
+ROI = Tuple[float, float, float, float]
+# (x0, y0, x1, y1) in pixels of the frame it was found in
+Box = Tuple[int, int, int, int]
+
+
+def parse_roi(text: str) -> ROI:
+    """Parse 'x,y,w,h' (fractions of the frame) from the command line."""
+    parts = [float(p) for p in text.split(",")]
+    if len(parts) != 4:
+        raise ValueError("ROI must be x,y,w,h")
+    x, y, w, h = parts
+    if not (0 <= x < 1 and 0 <= y < 1 and 0 < w <= 1 - x + 1e-9 and 0 < h <= 1 - y + 1e-9):
+        raise ValueError(f"ROI {text!r} must lie inside the frame (fractions 0-1)")
+    return x, y, w, h
+
+
+def pad_box(box: Box, frame_shape, pad_frac: float = 0.2, min_side: int = 320) -> Box:
+    """
+    Grow `box` by `pad_frac` of its size on every side (and to at least
+    `min_side` pixels per axis), clamped to the frame.  Motion often only
+    covers part of a person — an arm, a swinging bag — so the detector
+    needs some context around it.
+    """
+    fh, fw = frame_shape[:2]
+    x0, y0, x1, y1 = box
+    w, h = x1 - x0, y1 - y0
+    px = max(int(w * pad_frac), (min_side - w) // 2, 0)
+    py = max(int(h * pad_frac), (min_side - h) // 2, 0)
+    return max(0, x0 - px), max(0, y0 - py), min(fw, x1 + px), min(fh, y1 + py)
+
+
+def contains_box(outer: Box, inner: Box) -> bool:
+    """Whether `inner` lies entirely within `outer`."""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[2] <= outer[2] and inner[3] <= outer[3])
+
+
+def union_box(boxes) -> Box:
+    """Smallest box containing all of `boxes`."""
+    return (
+        min(b[0] for b in boxes), min(b[1] for b in boxes),
+        max(b[2] for b in boxes), max(b[3] for b in boxes),
+    )
+
+
+def scale_box(box: Box, factor: float) -> Box:
+    """`box` in pixels of an image `factor` times larger (e.g. stream → full frame)."""
+    return tuple(int(round(v * factor)) for v in box)
+
+
+class MotionResult(NamedTuple):
+    moved:   bool
+    cost_ms: float
+    box:     Optional[Box] = None   # union of qualifying contours, input-frame pixels
+
+
+class MotionStats:
+    """Rolling per-frame cost of the motion stage."""
+
+    def __init__(self, window: int = 240):
+        self.costs  = deque(maxlen=window)
+        self.frames = 0
+        self.hits   = 0
+
+    def add(self, cost_ms: float, moved: bool):
+        self.costs.append(cost_ms)
+        self.frames += 1
+        self.hits   += int(moved)
+
+    def summary(self) -> dict:
+        if not self.costs:
+            return {"frames": 0}
+        arr = np.fromiter(self.costs, np.float64)
+        return {
+            "frames":  self.frames,
+            "hits":    self.hits,
+            "mean_ms": round(float(arr.mean()), 2),
+            "p50_ms":  round(float(np.percentile(arr, 50)), 2),
+            "p95_ms":  round(float(np.percentile(arr, 95)), 2),
+            "max_ms":  round(float(arr.max()), 2),
+        }
+
+
+class MotionDetector:
+    """
+    Downscaled, ROI-restricted MOG2 motion detector.
+
+    Args:
+        motion_threshold: Minimum contour area in *full-resolution* pixels.
+        work_width:       Width the (ROI-cropped) frame is resized to before
+                          subtraction.  None keeps native resolution.
+        roi:              Optional (x, y, w, h) fractions of the frame.
+        report_every:     Print a cost summary every N frames (0 = never).
+    """
+
+    def __init__(
+        self,
+        motion_threshold: float = 5000,
+        work_width: Optional[int] = 320,
+        roi: Optional[ROI] = None,
+        report_every: int = 0,
+    ):
+        self.motion_threshold = motion_threshold
+        self.work_width       = work_width
+        self.roi              = roi
+        self.report_every     = report_every
+        self.stats            = MotionStats()
+
+        import cv2      # deferred so importing this module (Box, parse_roi) stays cheap
+        self._cv2 = cv2
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=500, varThreshold=16, detectShadows=False
+        )
+        self._geometry = None   # cached per input shape: (shape, roi_px, size, area_thr)
+
+    def _geometry_for(self, shape, frame_scale: int = 1):
+        if self._geometry is not None and self._geometry[0] == (shape, frame_scale):
+            return self._geometry
+        fh, fw = shape[:2]
+        if self.roi:
+            rx, ry, rw, rh = self.roi
+            x0, y0 = int(rx * fw), int(ry * fh)
+            x1, y1 = min(fw, x0 + max(1, int(rw * fw))), min(fh, y0 + max(1, int(rh * fh)))
+        else:
+            x0, y0, x1, y1 = 0, 0, fw, fh
+        cw, ch = x1 - x0, y1 - y0
+
+        if self.work_width and self.work_width < cw:
+            scale = self.work_width / cw
+            size  = (self.work_width, max(1, round(ch * scale)))
+        else:
+            scale = 1.0
+            size  = None
+        area_thr = self.motion_threshold * (scale / frame_scale) ** 2
+        self._geometry = ((shape, frame_scale), (x0, y0, x1, y1), size, area_thr)
+        return self._geometry
+
+    def process(self, bgr: np.ndarray, frame_scale: int = 1) -> MotionResult:
+        """
+        Subtract `bgr` from the background model.  `frame_scale` is how many
+        times smaller `bgr` is than the full frame (a reduced-decode
+        detection stream), so the threshold keeps its full-resolution meaning.
+        """
+        t0  = time.perf_counter()
+        cv2 = self._cv2
+        _, (x0, y0, x1, y1), size, area_thr = self._geometry_for(bgr.shape, frame_scale)
+        sx = (x1 - x0) / size[0] if size is not None else 1.0
+        sy = (y1 - y0) / size[1] if size is not None else 1.0
+
+        view = bgr[y0:y1, x0:x1]          # ROI crop is a view — no copy
+        if size is not None:
+            view = cv2.resize(view, size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(view, cv2.COLOR_BGR2GRAY) if view.ndim == 3 else view
+
+        mask = self.bg_subtractor.apply(gray)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        hits = [c for c in contours if cv2.contourArea(c) > area_thr]
+
+        box = None
+        if hits:
+            # Union bounding box of the qualifying contours, mapped back to full-res
+            bx, by, bw, bh = cv2.boundingRect(np.concatenate(hits))
+            box = (
+                x0 + int(bx * sx),        y0 + int(by * sy),
+                x0 + int((bx + bw) * sx), y0 + int((by + bh) * sy),
+            )
+
+        cost_ms = (time.perf_counter() - t0) * 1000
+        self.stats.add(cost_ms, bool(hits))
+        if self.report_every and self.stats.frames % self.report_every == 0:
+            print(f"\n  [motion] {self.stats.summary()}")
+        return MotionResult(bool(hits), cost_ms, box)
@@ -0,0 +1,190 @@
+"""
+Idle scheduling for the detection loop.
+
+Most of a Halloween night the porch is empty, yet the roaster used to
+sample motion at a fixed rate, decode every camera frame and print a
+status line every half second.  The scheduler gives the loop states:
+
+    active       something moved recently: full camera rate, motion at
+                 `active_fps`
+    idle         nothing moved for `idle_after` seconds: the grabber only
+                 decodes `idle_fps` frames a second and motion sees each
+    interaction  a roast is running: detector paused, full camera rate
+                 (the still burst needs it)
+    cooldown     waiting out the cooldown: detector paused, camera at
+                 `paused_fps`
+
+The first motion seen while idle switches back to active right away, so
+slowing down costs at most one idle frame period of detection latency.
+Wall time, the motion thread's CPU and the camera grab thread's CPU are
+accounted per state, so the effect shows up in the numbers printed at
+exit.  Thread CPU rather than process CPU: stations run several doors,
+each with its own scheduler, in one process.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+STATES = ("active", "idle", "interaction", "cooldown")
+PAUSED = ("interaction", "cooldown")
+
+
+class DetectionScheduler:
+    """
+    Args:
+        active_fps:  Motion sampling rate while the scene is live.
+        idle_fps:    Camera decode and motion rate once the porch has been
+                     static for `idle_after` seconds (0 = never slow down).
+        idle_after:  Seconds without motion before going idle.
+        paused_fps:  Camera decode rate while the detector is paused for a
+                     cooldown.
+        on_rate:     Called with the camera decode rate (None = every frame)
+                     whenever it changes, e.g. `FrameGrabber.set_rate`.
+        grab_cpu:    Seconds of CPU the grab thread has used so far, e.g.
+                     `FrameGrabber.cpu_s`; charged to the state it was in.
+
+    Thread-safe: the motion thread reports frames, the event loop moves
+    the scheduler in and out of the paused states.  Motion CPU is only
+    accounted for the thread that called `account_thread()` (the engine's
+    motion thread), charged at each of its samples to the state it finds;
+    samples from anywhere else (serial detection on executor threads)
+    count, but their CPU isn't theirs alone to measure.
+    """
+
+    def __init__(
+        self,
+        active_fps: float = 10.0,
+        idle_fps: float = 3.0,
+        idle_after: float = 10.0,
+        paused_fps: float = 1.0,
+        on_rate: Optional[Callable[[Optional[float]], None]] = None,
+        log: Callable[[str], None] = print,
+        grab_cpu: Optional[Callable[[], float]] = None,
+    ):
+        self.active_fps = active_fps
+        self.idle_fps   = idle_fps
+        self.idle_after = idle_after
+        self.paused_fps = paused_fps
+        self.on_rate    = on_rate
+        self.log        = log
+        self.grab_cpu   = grab_cpu
+
+        self._lock       = threading.Lock()
+        self.state       = "active"
+        self.transitions = 0
+        self._last_motion = time.monotonic()
+        self._since_wall  = time.monotonic()
+        self._cpu_thread: Optional[int] = None     # ident of the accounted motion thread
+        self._thread_cpu  = 0.0                    # its CPU clock at its last sample
+        self._since_grab  = self._grab_now()
+        self._wall: Dict[str, float] = {s: 0.0 for s in STATES}
+        self._cpu:  Dict[str, float] = {s: 0.0 for s in STATES}
+        self._grab: Dict[str, float] = {s: 0.0 for s in STATES}
+        self._frames: Dict[str, int] = {s: 0 for s in STATES}
+
+    # --------------------------------------------------------------------
+    # Queries (motion thread)
+    # --------------------------------------------------------------------
+
+    def period(self) -> float:
+        """Seconds between motion samples in the current state."""
+        fps = self.idle_fps if self.state == "idle" else self.active_fps
+        return 1.0 / fps if fps else 0.0
+
+    def account_thread(self):
+        """Charge the calling thread's CPU to the states from now on."""
+        with self._lock:
+            self._cpu_thread = threading.get_ident()
+            self._thread_cpu = time.thread_time()
+
+    def observe(self, moved: bool, now: Optional[float] = None):
+        """Report one motion sample; ramps up on motion, idles down after a quiet spell."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if threading.get_ident() == self._cpu_thread:
+                cpu = time.thread_time()
+                self._cpu[self.state] += cpu - self._thread_cpu
+                self._thread_cpu = cpu
+            self._frames[self.state] += 1
+            if self.state in PAUSED:
+                return
+            if moved:
+                self._last_motion = now
+                if self.state == "idle":
+                    self._enter("active", now)
+                    self.log("👀 Motion — detection back to full rate")
+            elif (self.state == "active" and self.idle_fps
+                    and now - self._last_motion >= self.idle_after):
+                self._enter("idle", now)
+                self.log(f"💤 Porch quiet for {self.idle_after:.0f}s — "
+                         f"sampling at {self.idle_fps:g} fps")
+
+    # --------------------------------------------------------------------
+    # State changes (event loop)
+    # --------------------------------------------------------------------
+
+    def pause(self, reason: str):
+        """Detector paused for an `interaction` or a `cooldown`."""
+        if reason not in PAUSED:
+            raise ValueError(f"Pause reason must be one of {PAUSED}")
+        with self._lock:
+            self._enter(reason, time.monotonic())
+
+    def resume(self):
+        """Back to watching; counts as fresh motion so the ramp-down restarts."""
+        with self._lock:
+            now = time.monotonic()
+            self._last_motion = now
+            self._enter("active", now)
+
+    def _enter(self, state: str, now: float):
+        """Switch state, charging the time so far to the old one. Caller holds _lock."""
+        if state == self.state:
+            return
+        grab = self._grab_now()
+        self._wall[self.state] += now - self._since_wall
+        self._grab[self.state] += grab - self._since_grab
+        self._since_wall, self._since_grab = now, grab
+        old, self.state = self.state, state
+        self.transitions += 1
+        if self.on_rate is not None and self._rate(old) != self._rate(state):
+            self.on_rate(self._rate(state))
+
+    def _grab_now(self) -> float:
+        return self.grab_cpu() if self.grab_cpu is not None else 0.0
+
+    def _rate(self, state: str) -> Optional[float]:
+        if state == "idle":
+            return self.idle_fps or None
+        if state == "cooldown":
+            return self.paused_fps or None
+        return None
+
+    # --------------------------------------------------------------------
+    # Reporting
+    # --------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Per state: wall time, the motion and grab threads' CPU % while in
+        it (None when not accounted), motion samples.
+        """
+        with self._lock:
+            wall, cpu, grab = dict(self._wall), dict(self._cpu), dict(self._grab)
+            wall[self.state] += time.monotonic() - self._since_wall
+            grab[self.state] += self._grab_now() - self._since_grab
+            motion_cpu = self._cpu_thread is not None
+            frames, state, transitions = dict(self._frames), self.state, self.transitions
+        out = {"state": state, "transitions": transitions}
+        for name in STATES:
+            if wall[name] <= 0:
+                continue
+            pct = lambda s: round(100 * s / wall[name], 1)
+            out[name] = {
+                "wall_s":       round(wall[name], 1),
+                "cpu_pct":      pct(cpu[name]) if motion_cpu else None,
+                "grab_cpu_pct": pct(grab[name]) if self.grab_cpu is not None else None,
+                "samples":      frames[name],
+            }
+        return out
@@ -0,0 +1,230 @@
+"""
+Speculative interactions for the Halloween Roaster.
+
+Without speculation an interaction starts once YOLO has confirmed a
+visitor: capture the still, take a Live session, send the image, send the
+roast prompt, wait for audio.  Capture and image upload (and the connect,
+when no session is warm) sit on the critical path.
+
+With a `Speculator`, the first motion on an empty porch already checks a
+session out of the pool, captures the still and sends the image into the
+session while YOLO is still looking.  Nothing is said yet: the model only
+answers once the roast prompt is sent, which happens when the person event
+arrives and the interaction claims the speculation.  If YOLO keeps seeing
+no one (or nothing is confirmed within `window`), the session is closed
+and the pool warms a fresh one — a wasted image upload and a reconnect in
+the background, nothing the visitor (or the porch) notices.
+
+Outcomes are counted so the trade can be checked on a real night: a hit
+had the image in the session before YOLO confirmed, a late claim still had
+it in flight (the interaction waited the rest), a miss was dropped.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from motion import Box
+
+
+class Speculation:
+    """One interaction opened on motion, before YOLO's verdict."""
+
+    def __init__(self, motion_ts: float, motion_box: Optional[Box] = None):
+        self.motion_ts  = motion_ts
+        self.motion_box = motion_box   # where it moved, in detection-stream pixels
+        self.spans      = None         # the caller's timings, kept apart until claimed
+        self.started_at = time.monotonic()
+        self.claimed_at: Optional[float] = None
+        self.session    = None
+        self.connected_at:  Optional[float] = None
+        self.image_sent_at: Optional[float] = None
+        self.error:   Optional[BaseException] = None
+        self.empty    = 0          # YOLO results without a person since the motion
+        self.claimed  = False
+        self.prepared: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.released = asyncio.Event()
+        self.task:   Optional[asyncio.Task] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class Speculator:
+    """
+    Args:
+        pool:         LiveSessionPool the sessions are checked out of.
+        prepare:      `async prepare(spec)` — capture the still and send it
+                      on `spec.session`; returns the Still.
+        can_start:    Whether speculating makes sense right now (e.g. startup
+                      finished, nobody known is already on the porch).
+        window:       Seconds after the motion to wait for a confirmed person.
+        reject_after: YOLO results without a person that cancel right away.
+        backoff:      Seconds without new speculation after a miss, so a
+                      swaying decoration doesn't churn sessions.
+
+    `on_motion` / `on_verdict` may be called from any thread (the
+    detection engine's); everything else runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        pool,
+        prepare: Callable[[Speculation], Awaitable[object]],
+        can_start: Callable[[], bool] = lambda: True,
+        window: float = 2.0,
+        reject_after: int = 3,
+        backoff: float = 3.0,
+        log: Callable[[str], None] = print,
+    ):
+        self.pool         = pool
+        self.prepare      = prepare
+        self.can_start    = can_start
+        self.window       = window
+        self.reject_after = reject_after
+        self.backoff      = backoff
+        self.log          = log
+
+        self.current: Optional[Speculation] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._quiet_until = 0.0
+
+        self.started  = 0
+        self.hits     = 0     # image in the session before the confirmation
+        self.late     = 0     # claimed while the image was still on its way
+        self.rejected = 0     # YOLO saw no one
+        self.expired  = 0     # nothing confirmed within the window
+        self.failed   = 0     # session or capture failed; claimed anyway
+        self.recaptured = 0   # claimed, but the still missed part of the confirmed visitor
+        self.lead_ms: list = []   # hits: image sent this long before the confirmation
+        self.wait_ms: list = []   # late claims: confirmation to image sent
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Start reacting to detection callbacks on `loop`."""
+        self._loop = loop
+
+    # --------------------------------------------------------------------
+    # Detection callbacks (any thread)
+    # --------------------------------------------------------------------
+
+    def on_motion(self, frame_ts: float, box: Optional[Box] = None):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._maybe_start, frame_ts, box)
+
+    def on_verdict(self, frame_ts: float, person: bool):
+        if self._loop is not None and not person:
+            self._loop.call_soon_threadsafe(self._no_person, frame_ts)
+
+    # --------------------------------------------------------------------
+    # Event loop side
+    # --------------------------------------------------------------------
+
+    def _maybe_start(self, frame_ts: float, box: Optional[Box] = None):
+        if (self.current is not None or time.monotonic() < self._quiet_until
+                or not self.can_start()):
+            return
+        spec = Speculation(frame_ts, box)
+        spec.task   = asyncio.create_task(self._run(spec))
+        spec.expiry = self._loop.call_later(self.window, self._cancel, spec, "expired")
+        self.current = spec
+        self.started += 1
+
+    def _no_person(self, frame_ts: float):
+        spec = self.current
+        if spec is None or frame_ts < spec.motion_ts:
+            return
+        spec.empty += 1
+        if spec.empty >= self.reject_after:
+            self._cancel(spec, "rejected")
+
+    def _cancel(self, spec: Speculation, reason: str):
+        if spec.claimed or self.current is not spec:
+            return
+        self.current = None
+        spec.expiry.cancel()
+        spec.task.cancel()
+        if reason == "rejected":
+            self.rejected += 1
+        elif reason == "expired":
+            self.expired += 1
+        self._quiet_until = time.monotonic() + self.backoff
+        self.log(f"  (speculative session dropped: {reason})")
+
+    async def _run(self, spec: Speculation):
+        """Hold a session with the image in it until claimed and released, or cancelled."""
+        try:
+            async with self.pool.session() as session:
+                spec.session, spec.connected_at = session, time.monotonic()
+                still = await self.prepare(spec)
+                spec.image_sent_at = time.monotonic()
+                spec.prepared.set_result(still)
+                await spec.released.wait()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            spec.error = exc
+        finally:
+            if not spec.prepared.done():
+                spec.prepared.set_result(None)
+
+    def claim(self) -> Optional[Speculation]:
+        """Hand the current speculation to the interaction YOLO just confirmed."""
+        spec, self.current = self.current, None
+        if spec is None:
+            return None
+        spec.expiry.cancel()
+        spec.claimed    = True
+        spec.claimed_at = time.monotonic()
+        return spec
+
+    async def ready(self, spec: Speculation, timeout: float = 5.0):
+        """
+        Wait for a claimed speculation's still to be in its session.  Returns
+        the Still, or None if it failed (the caller falls back to a normal
+        interaction and must still `release` it).
+        """
+        try:
+            still = await asyncio.wait_for(asyncio.shield(spec.prepared), timeout)
+        except asyncio.TimeoutError:
+            still = None
+        if still is None:
+            self.failed += 1
+            if spec.error is not None:
+                self.log(f"  (speculative session failed: {spec.error})")
+            return None
+        lead_ms = (spec.claimed_at - spec.image_sent_at) * 1000
+        if lead_ms >= 0:
+            self.hits += 1
+            self.lead_ms.append(lead_ms)
+        else:
+            self.late += 1
+            self.wait_ms.append(-lead_ms)
+        return still
+
+    async def release(self, spec: Speculation):
+        """Interaction over: close the speculation's session."""
+        spec.released.set()
+        if spec.task is not None:
+            if spec.image_sent_at is None:
+                spec.task.cancel()      # failed or timed out: don't wait for it
+            await asyncio.gather(spec.task, return_exceptions=True)
+
+    async def close(self):
+        if self.current is not None:
+            self._cancel(self.current, "shutdown")     # not counted as a miss
+        # Let cancelled tasks close their sessions before the pool goes
+        await asyncio.sleep(0)
+
+    def stats(self) -> dict:
+        decided = self.hits + self.late + self.rejected + self.expired
+        lead, wait = sorted(self.lead_ms), sorted(self.wait_ms)
+        return {
+            "started":     self.started,
+            "hits":        self.hits,
+            "late":        self.late,
+            "rejected":    self.rejected,
+            "expired":     self.expired,
+            "failed":      self.failed,
+            "recaptured":  self.recaptured,
+            "hit_ratio":   round(self.hits / decided, 2) if decided else None,
+            "lead_ms_p50": round(lead[len(lead) // 2], 1) if lead else None,
+            "wait_ms_p50": round(wait[len(wait) // 2], 1) if wait else None,
+        }
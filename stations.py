@@ -0,0 +1,114 @@
+"""
+Several doors from one roaster process.
+
+A station is one door: a camera, a mic/speaker pair and its own
+`HalloweenRoaster` — its own motion thread, visitor tracker (or cooldown),
+Live session pool and traces under traces/<name>/.  What the stations
+share is everything that is expensive to have twice on a Pi 5:
+
+  - one YOLO worker process, which runs the crops of all doors that are
+    waiting at the same time as one batch;
+  - one Gemini client, with every station's Live sessions multiplexed on
+    one asyncio event loop;
+  - the process itself (Python, numpy, OpenCV loaded once).
+
+Interactions at different doors run concurrently, so throughput on a busy
+night grows with the number of stations instead of queueing behind one.
+
+    python3 halloween_roaster.py --station front=v4l2:0@pyaudio:1 \
+                                 --station side=v4l2:2@pyaudio:3
+"""
+
+import asyncio
+import concurrent.futures
+from typing import List, NamedTuple
+
+from detection_engine import YoloWorker
+
+EXECUTOR_THREADS_PER_STATION = 4   # detect wait, mic pump, playback drain, capture
+
+
+class StationSpec(NamedTuple):
+    name:   str
+    camera: str
+    audio:  str
+
+
+def parse_station(text: str) -> StationSpec:
+    """Parse NAME=CAMERA[@AUDIO] from the command line, e.g. front=v4l2:0@pyaudio:1."""
+    name, sep, rest = text.partition("=")
+    if not sep or not name or not rest:
+        raise ValueError(f"Station {text!r} must look like NAME=CAMERA[@AUDIO]")
+    camera, _, audio = rest.partition("@")
+    return StationSpec(name, camera, audio or "pyaudio")
+
+
+def build_stations(specs: List[StationSpec], **roaster_kwargs) -> list:
+    """
+    Bring up one HalloweenRoaster per station, concurrently, sharing one
+    Gemini client and one YOLO worker.  `roaster_kwargs` go to every
+    station (detection and audio options, not camera/audio specs).
+    """
+    from google import genai
+    from halloween_roaster import HalloweenRoaster, gemini_api_key
+
+    names = [s.name for s in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Station names must be unique: {', '.join(names)}")
+    if not roaster_kwargs.get("auto_detect", True):
+        raise ValueError("Several stations need auto-detect (manual mode reads one keyboard)")
+
+    client = genai.Client(api_key=gemini_api_key())
+    worker = None
+    if roaster_kwargs.get("pipelined", True):
+        worker = YoloWorker("yolo11n.pt", imgsz=320, confidence=0.4, slots=len(specs))
+        worker.launch()     # loads the model while the cameras open
+
+    def _build(spec: StationSpec):
+        return HalloweenRoaster(
+            camera=spec.camera, audio=spec.audio, name=spec.name,
+            client=client, yolo_worker=worker, **roaster_kwargs,
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(len(specs), thread_name_prefix="station") as pool:
+        futures = [pool.submit(_build, spec) for spec in specs]
+    roasters, errors = [], []
+    for fut in futures:
+        try:
+            roasters.append(fut.result())
+        except Exception as exc:
+            errors.append(exc)
+    if errors:
+        for roaster in roasters:
+            roaster.cleanup()
+        if worker is not None:
+            worker.stop()
+        raise errors[0]
+    return roasters
+
+
+def run_stations(roasters: list):
+    """Run every station on one event loop until Ctrl+C, then clean up."""
+    print(f"\n🎃 Halloween Roaster is running at {len(roasters)} doors! 🎃")
+    print("Press Ctrl+C to exit")
+    try:
+        asyncio.run(_run_all(roasters))
+    except KeyboardInterrupt:
+        print("\n\nShutting down...")
+    finally:
+        for roaster in roasters:
+            roaster.cleanup()
+        worker = roasters[0].yolo_worker if roasters else None
+        if worker is not None:
+            worker.stop()
+
+
+async def _run_all(roasters: list):
+    # Every station parks a few blocking calls (mic reads, detection waits,
+    # playback drain) in the default executor — size it so one busy door
+    # can't starve the others
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+        max_workers=EXECUTOR_THREADS_PER_STATION * len(roasters) + 4,
+    ))
+    await asyncio.gather(*(roaster._main() for roaster in roasters))
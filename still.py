@@ -0,0 +1,148 @@
+"""
+Still-image JPEG encoding for the Halloween Roaster.
+
+The grabber already holds every frame as a decoded BGR array, so a still
+is encoded exactly once, straight from that array — libjpeg-turbo via
+PyTurboJPEG when it is installed, `cv2.imencode` otherwise.  The resulting
+bytes are what Gemini receives *and* what the trace stores; nothing is
+converted to RGB, wrapped in PIL, or encoded a second time.
+
+Before upload the still is cut down to what the roast is about: the frame
+is cropped to the visitor's YOLO box (with some margin for hats, wings
+and props), scaled to a target long edge, and the JPEG quality is stepped
+down until it fits a byte budget.  Fewer bytes over the uplink and fewer
+image tokens for the model to prefill.
+"""
+
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from motion import Box, pad_box
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:                  # optional: pip install PyTurboJPEG
+    TurboJPEG = None
+
+
+class Still(NamedTuple):
+    """One encoded still."""
+    jpeg:      bytes
+    width:     int
+    height:    int
+    quality:   int
+    encode_ms: float
+    region:    Optional[Box] = None   # part of the frame shown, full-res pixels (None = all)
+
+
+class StillEncoder:
+    """
+    Encodes BGR frames to JPEG in one pass.
+
+    Args:
+        quality:   JPEG quality (1-100).
+        max_width: Downscale wider frames to this width before encoding
+                   (None keeps the camera resolution).
+        backend:   "auto" (turbojpeg if available), "turbojpeg" or "opencv".
+    """
+
+    def __init__(
+        self,
+        quality: int = 85,
+        max_width: Optional[int] = None,
+        backend: str = "auto",
+    ):
+        self.quality   = quality
+        self.max_width = max_width
+
+        import cv2      # deferred until a roaster actually sets up stills
+        self._cv2 = cv2
+
+        self._tj = None
+        if backend in ("auto", "turbojpeg") and TurboJPEG is not None:
+            try:
+                self._tj = TurboJPEG()
+            except (OSError, RuntimeError):   # Python wrapper present, libturbojpeg missing
+                if backend == "turbojpeg":
+                    raise
+        elif backend == "turbojpeg":
+            raise RuntimeError("backend='turbojpeg' needs the PyTurboJPEG package")
+        self.backend = "turbojpeg" if self._tj is not None else "opencv"
+
+    def resize(self, bgr: np.ndarray) -> np.ndarray:
+        """Apply `max_width` (returns the input unchanged when it already fits)."""
+        h, w = bgr.shape[:2]
+        if not self.max_width or w <= self.max_width:
+            return bgr
+        size = (self.max_width, max(1, round(h * self.max_width / w)))
+        return self._cv2.resize(bgr, size, interpolation=self._cv2.INTER_AREA)
+
+    def encode(self, bgr: np.ndarray, quality: Optional[int] = None) -> Still:
+        t0  = time.perf_counter()
+        img = self.resize(bgr)
+        q   = quality or self.quality
+        if self._tj is not None:
+            jpeg = self._tj.encode(img, quality=q, jpeg_subsample=TJSAMP_420)
+        else:
+            cv2 = self._cv2
+            ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, q])
+            if not ok:
+                raise RuntimeError("JPEG encoding failed")
+            jpeg = buf.tobytes()
+        h, w = img.shape[:2]
+        return Still(jpeg, w, h, q, (time.perf_counter() - t0) * 1000)
+
+
+# ----------------------------------------------------------------------------
+# Upload preparation
+# ----------------------------------------------------------------------------
+
+def prepare_upload(
+    bgr: np.ndarray,
+    encoder: StillEncoder,
+    box: Optional[Box] = None,
+    margin: float = 0.25,
+    long_edge: Optional[int] = 768,
+    max_bytes: Optional[int] = 150_000,
+    min_quality: int = 50,
+) -> Still:
+    """
+    Crop to the visitor, scale, and encode within a byte budget.
+
+    Args:
+        bgr:         Full camera frame.  May alias a grabber ring slot — it is
+                     only read once, into a private crop/resize.
+        encoder:     Supplies the backend and the starting quality.
+        box:         Person box in full-resolution pixels (None = whole frame).
+        margin:      Padding around the box as a fraction of its size.
+        long_edge:   Scale so the longer side is at most this (None = keep).
+        max_bytes:   Step quality down until the JPEG fits (None = no budget).
+        min_quality: Never go below this quality, even if over budget.
+    """
+    t0     = time.perf_counter()
+    img    = bgr
+    region = None
+    if box is not None:
+        x0, y0, x1, y1 = pad_box(box, bgr.shape, pad_frac=margin, min_side=0)
+        if x1 > x0 and y1 > y0:
+            img    = bgr[y0:y1, x0:x1]
+            region = (x0, y0, x1, y1)
+
+    h, w = img.shape[:2]
+    if long_edge and max(h, w) > long_edge:
+        scale = long_edge / max(h, w)
+        cv2   = encoder._cv2
+        img   = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        img = img.copy()    # detach from the ring slot before the (repeated) encode
+
+    quality = encoder.quality
+    while True:
+        still = encoder.encode(img, quality=quality)
+        if max_bytes is None or len(still.jpeg) <= max_bytes or quality <= min_quality:
+            break
+        quality = max(min_quality, quality - 10)
+    return still._replace(encode_ms=(time.perf_counter() - t0) * 1000, region=region)
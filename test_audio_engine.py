@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent audio engine
+Drives the PortAudio callbacks directly — no sound card required
+"""
+
+import sys
+
+import pytest
+
+pyaudio = pytest.importorskip("pyaudio")
+
+from audio_engine import AudioEngine, ByteRing
+
+
+def test_byte_ring_wraps():
+    """Writes and reads wrap around the end of the buffer intact"""
+    print("Testing ByteRing wrap-around...")
+    ring = ByteRing(10)
+    out = bytearray(10)
+    assert ring.write(b"abcdefgh") == 8
+    assert ring.read_into(memoryview(out)[:6]) == 6 and bytes(out[:6]) == b"abcdef"
+    assert ring.write(b"123456789") == 8, "Only 8 bytes of space are free"
+    assert ring.read_into(memoryview(out)) == 10
+    assert bytes(out) == b"gh12345678"
+    print("✓ Ring preserves byte order across the wrap\n")
+
+
+def test_byte_ring_clear():
+    """request_clear() drops queued bytes on the consumer's next read"""
+    ring = ByteRing(16)
+    ring.write(b"old audio")
+    ring.request_clear()
+    assert ring.available() == 0
+    ring.write(b"new")
+    out = bytearray(16)
+    n = ring.read_into(memoryview(out))
+    assert bytes(out[:n]) == b"new", f"Expected only new bytes, got {bytes(out[:n])!r}"
+    print("✓ Clear (barge-in flush) skips stale audio\n")
+
+
+def test_callbacks_and_metrics():
+    """Output pads with silence and counts underruns; input feeds read_mic"""
+    print("Testing engine callbacks...")
+    played = []
+    engine = AudioEngine(None, chunk=4, on_playback=played.append)
+
+    engine.play(b"\x01\x02" * 6)                    # 6 frames queued
+    data, _ = engine._out_callback(None, 4, None, 0)
+    assert data == b"\x01\x02" * 4 and engine.underruns == 0
+    data, _ = engine._out_callback(None, 4, None, 0)
+    assert data == b"\x01\x02" * 2 + b"\x00" * 4, "Short read must be padded with silence"
+    assert engine.underruns == 1, "Starving mid-turn is an underrun"
+    engine.finish()
+    engine._out_callback(None, 4, None, 0)
+    assert engine.underruns == 1, "Silence after finish() is not an underrun"
+    assert len(played) == 2
+
+    engine.mic_reset()
+    engine._in_callback(b"\x05\x00" * 4, 4, None, 0)
+    assert engine.read_mic(8, timeout=0.1) == b"\x05\x00" * 4
+    print(f"✓ Metrics: {engine.metrics()}\n")
+
+
+def main():
+    print("=" * 50)
+    print("Audio Engine Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_byte_ring_wraps()
+        test_byte_ring_clear()
+        test_callbacks_and_metrics()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the file/synthetic audio backend
+Replays generated WAV fixtures — no sound card required
+"""
+
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_io import ReplayAudio, open_audio, read_wav, synthetic_reply_pcm
+
+RATE = 16000
+
+
+def test_replay_mic_turns():
+    """The visitor's clip replays after the model's turn, and never into the next session"""
+    print("Testing mic replay...")
+    pcm   = bytes(range(256)) * 8
+    audio = ReplayAudio(pcm, chunk=256, speed=0)
+
+    assert audio.read_mic() == bytes(512), "Mic is silent until the visitor is due"
+    audio.mic_reset()
+    assert audio.read_mic() == bytes(512), "A new session doesn't make the visitor talk"
+
+    audio.play(bytes(4800))
+    assert audio.wait_drained()
+    audio.mic_reset()                       # local VAD: record_pcm resets, then listens
+    assert audio.read_mic() == pcm[:512], "Visitor answers once playback has drained"
+    assert audio.read_mic() == pcm[512:1024]
+    audio.mic_reset()
+    assert audio.read_mic() == bytes(512), "mic_reset() cuts off the rest of an old reply"
+
+    assert audio.wait_drained()
+    audio.mic_idle()                        # session over before anyone listened
+    audio.mic_reset()
+    assert audio.read_mic() == bytes(512), "The next session doesn't open mid-reply"
+    assert audio.metrics() == {"played_bytes": 4800, "mic_bytes": 3072}
+    print("✓ Mic replays on the visitor's turn\n")
+
+
+def test_replay_playback_timing():
+    """Playback is timed at `speed` × real time and flush() cuts it off"""
+    print("Testing playback pacing...")
+    heard = []
+    audio = ReplayAudio(b"", speaker_rate=24000, speed=10.0, on_playback=heard.append)
+
+    audio.play(bytes(24000 * 2))            # 1 s of audio → 0.1 s at 10×
+    assert audio.is_playing
+    t0 = time.monotonic()
+    assert audio.wait_drained(timeout=1.0)
+    assert 0.05 < time.monotonic() - t0 < 0.5
+    assert not audio.is_playing
+    assert len(heard) == 1 and len(heard[0]) == 48000
+
+    audio.play(bytes(24000 * 2))
+    audio.flush()
+    assert not audio.is_playing, "flush() must stop playback"
+    print("✓ Playback paced and flushable\n")
+
+
+def test_open_audio_wav():
+    """wav:PATH replays the file; bad specs and formats are rejected"""
+    print("Testing open_audio()...")
+    pcm = synthetic_reply_pcm(rate=RATE)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "reply.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(RATE)
+            wf.writeframes(pcm)
+        assert read_wav(path) == pcm
+        audio = open_audio(f"wav:{path}", speed=0)
+        assert isinstance(audio, ReplayAudio) and audio.mic_pcm == pcm
+
+        with pytest.raises(ValueError):
+            read_wav(path, rate=24000)
+    with pytest.raises(ValueError):
+        open_audio("alsa")
+    assert isinstance(open_audio("synthetic"), ReplayAudio)
+    print("✓ Backends built from CLI specs\n")
+
+
+def main():
+    print("=" * 50)
+    print("Audio I/O Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_replay_mic_turns()
+        test_replay_playback_timing()
+        test_open_audio_wav()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for per-interaction audio traces
+Writes to a temporary directory — no audio hardware required
+"""
+
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import audio_trace
+from audio_trace import AudioTraceWriter
+
+
+def _read(path: Path):
+    """(rate, int16 samples) of a traced file, FLAC or WAV."""
+    if audio_trace.soundfile is not None:
+        data, rate = audio_trace.soundfile.read(str(path), dtype="int16")
+        return rate, data
+    with wave.open(str(path), "rb") as wf:
+        return wf.getframerate(), np.frombuffer(wf.readframes(wf.getnframes()), np.int16)
+
+
+def test_streams_land_in_separate_files():
+    """Model and visitor chunks are written in order to their own files"""
+    print("Testing audio trace files...")
+    tone = (np.sin(np.arange(2400) / 8) * 8000).astype(np.int16)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = AudioTraceWriter(tmp, mic_rate=16000, model_rate=24000)
+        writer.start()
+        trace = writer.open("roast_test")
+        for _ in range(5):
+            trace.model(tone.tobytes())
+        trace.visitor(tone[:1600].tobytes())
+        files = trace.close()
+        writer.close()
+
+        assert set(files) == {"model", "visitor"}
+        rate, model = _read(Path(tmp) / files["model"])
+        assert rate == 24000 and len(model) == 5 * 2400
+        assert np.array_equal(model[:2400], tone), "Model audio must be stored losslessly"
+        rate, visitor = _read(Path(tmp) / files["visitor"])
+        assert rate == 16000 and len(visitor) == 1600
+        print(f"✓ {writer.stats()}\n")
+
+
+def test_full_queue_drops_chunks():
+    """The audio path never blocks on a slow writer"""
+    print("Testing bounded queue...")
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = AudioTraceWriter(tmp, max_queue=4)      # writer thread not started
+        trace  = writer.open("roast_test")               # two "open" messages
+        for _ in range(5):
+            trace.model(b"\0\0" * 100)
+        assert writer.chunks_dropped == 3
+    print("✓ Overflow chunks are dropped and counted\n")
+
+
+def main():
+    print("=" * 50)
+    print("Audio Trace Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_streams_land_in_separate_files()
+        test_full_queue_drops_chunks()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
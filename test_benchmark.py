@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the offline benchmark harness
+Runs a real Live session against the local fake server — no network required
+"""
+
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("websockets")
+pytest.importorskip("google.genai")
+
+from benchmark import bench_live, bench_vad
+
+
+def test_vad_replay():
+    """Synthetic reply clip is found by record_pcm's VAD"""
+    print("Testing VAD replay...")
+    result = bench_vad([], repeat=3)
+    assert result["speech_found"] == 3
+    assert result["latency_ms"]["record_pcm"]["n"] == 3
+    print(f"✓ {result['realtime_x']}x real time\n")
+
+
+@pytest.mark.parametrize("stream_mic", [True, False])
+def test_live_against_fake_server(stream_mic):
+    """Full interactions run against the fake Live server and report latencies"""
+    print(f"Testing live bench (stream_mic={stream_mic})...")
+    result = bench_live(
+        2, stream_mic=stream_mic, speed=8.0,
+        setup_ms=0, first_byte_ms=20, prewarm=True,
+    )
+    assert result["exchanges"] == 6, "Every replayed reply should get an answer"
+    assert result["server"]["turns"] == 8, "Roast + 3 comebacks per interaction"
+    assert result["pool"]["hits"] == 2, "Pre-warmed sessions should be ready"
+    lat = result["latency_ms"]
+    for name in ("roast.first_audio", "exchange1.reply", "exchange3.done"):
+        assert name in lat, f"Missing latency {name}"
+    print(f"✓ roast.first_audio p50 {lat['roast.first_audio']['p50']} ms\n")
+
+
+def test_speculation_hides_capture():
+    """A speculated still is already in the session when YOLO confirms"""
+    print("Testing speculative live bench...")
+    kwargs = dict(stream_mic=True, speed=8.0, setup_ms=0, first_byte_ms=20,
+                  prewarm=True, confirm_ms=200, capture_ms=100)
+    plain = bench_live(2, **kwargs)
+    spec  = bench_live(2, speculate=True, **kwargs)
+    assert spec["speculation"]["hits"] == 2 and spec["exchanges"] == 6 and spec["failed"] == 0
+    first = lambda r: r["latency_ms"]["roast.first_audio"]["p50"]
+    assert first(spec) < first(plain) - 50, (first(spec), first(plain))
+    print(f"✓ roast.first_audio p50 {first(plain)} → {first(spec)} ms\n")
+
+
+def test_no_barge_in_over_later_roasts():
+    """The visitor's reply from one interaction doesn't talk over the next roast"""
+    print("Testing replayed visitor across interactions...")
+    result = bench_live(
+        3, stream_mic=True, speed=8.0,
+        setup_ms=0, first_byte_ms=20, prewarm=True,
+    )
+    assert result["interactions"] == 3 and result["exchanges"] == 9
+    assert result["roast_barge_ins"] == 0, f"{result['roast_barge_ins']} roasts cut off"
+    print("✓ Every roast played out\n")
+
+
+def test_stations_run_concurrently():
+    """Several doors' interactions overlap on one event loop"""
+    print("Testing concurrent stations...")
+    result = bench_live(
+        1, stream_mic=True, speed=8.0,
+        setup_ms=0, first_byte_ms=20, prewarm=True, stations=3,
+    )
+    assert result["interactions"] == 3 and result["exchanges"] == 9
+    assert result["server"]["turns"] == 12
+    print(f"✓ {result['per_minute']} interactions/min across 3 stations\n")
+
+
+def main():
+    print("=" * 50)
+    print("Benchmark Harness Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_vad_replay()
+        test_live_against_fake_server(True)
+        test_live_against_fake_server(False)
+        test_no_barge_in_over_later_roasts()
+        test_stations_run_concurrently()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
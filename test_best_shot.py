@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for best-shot selection
+Synthetic bursts and a fake YOLO model — no camera or ultralytics required
+"""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import detection_engine
+from best_shot import capture_burst, laplacian, score_burst
+from camera import FrameGrabber, SyntheticSource
+from detection_engine import DetectionEngine, YoloWorker
+
+
+def _porch(box, blur=False, shape=(360, 640, 3)):
+    """Textured porch with a striped 'costume' in `box`, optionally motion-blurred."""
+    rng = np.random.default_rng(1)
+    img = rng.integers(70, 90, shape, dtype=np.uint8)
+    x0, y0, x1, y1 = box
+    stripes = np.where((np.arange(x1 - x0) // 4) % 2, 220, 30).astype(np.uint8)
+    img[y0:y1, x0:x1] = stripes[None, :, None]
+    if blur:
+        # Horizontal smear across the visitor, like a fast step
+        region = img[y0:y1, x0:x1].astype(np.float32)
+        smeared = sum(np.roll(region, k, axis=1) for k in range(-6, 7)) / 13
+        img[y0:y1, x0:x1] = smeared.astype(np.uint8)
+    return img
+
+
+def test_laplacian_sees_blur():
+    """Laplacian variance drops when the visitor is smeared"""
+    print("Testing sharpness...")
+    box = (200, 60, 440, 340)
+    lap = laplacian([_porch(box), _porch(box, blur=True)])
+    assert lap.shape == (2, 358, 638)
+    sharp, blurred = lap.var(axis=(1, 2))
+    assert sharp > 2 * blurred, f"{sharp:.0f} vs {blurred:.0f}"
+    print(f"✓ Sharp {sharp:.0f} vs blurred {blurred:.0f}\n")
+
+
+def test_best_framed_sharp_frame_wins():
+    """Centred, whole and sharp beats clipped, tiny or blurred"""
+    print("Testing burst scoring...")
+    shots = {
+        "clipped": (0, 60, 180, 340),
+        "tiny":    (300, 250, 340, 330),
+        "blurred": (200, 60, 440, 340),
+        "best":    (200, 60, 440, 340),
+    }
+    images = [_porch(box, blur=name == "blurred") for name, box in shots.items()]
+    dets   = [[(0.8, *box)] for box in shots.values()]
+    scores = score_burst(images, dets)
+    best   = max(scores, key=lambda s: s.score)
+    assert list(shots)[best.index] == "best", [round(s.score, 2) for s in scores]
+    assert best.box == shots["best"] and best.confidence == 0.8
+
+    # Nobody detected anywhere: fall back to the sharpest frame
+    scores = score_burst(images[2:], None)
+    assert max(scores, key=lambda s: s.score).index == 1
+    print("✓ Best frame picked\n")
+
+
+def test_capture_burst_is_bounded():
+    """A burst copies consecutive frames and stops at its time window"""
+    print("Testing burst capture...")
+    grabber = FrameGrabber(SyntheticSource(width=320, height=180, fps=30))
+    grabber.start()
+    try:
+        grabber.wait_newer(0.0, timeout=2.0)
+        frames = capture_burst(grabber, 4, window=1.0)
+        assert len(frames) == 4
+        assert all(b.ts > a.ts for a, b in zip(frames, frames[1:]))
+        assert len({id(f.image) for f in frames}) == 4, "Frames must be copies"
+
+        t0 = time.monotonic()
+        frames = capture_burst(grabber, 100, window=0.2)
+        elapsed = time.monotonic() - t0
+        assert elapsed < 0.35 and len(frames) < 100, "The window bounds the burst"
+    finally:
+        grabber.stop()
+    print(f"✓ Burst bounded ({len(frames)} frames in {elapsed * 1000:.0f} ms)\n")
+
+
+class _FakeModel:
+    """One 'person' per image, sized by the image, and a log of call sizes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, source, **kwargs):
+        images = source if isinstance(source, list) else [source]
+        self.calls.append(len(images))
+        out = []
+        for img in images:
+            h, w = img.shape[:2]
+            boxes = SimpleNamespace(
+                conf=SimpleNamespace(tolist=lambda: [0.7]),
+                xyxy=SimpleNamespace(tolist=lambda w=w, h=h: [[1, 1, w - 1, h - 1]]),
+            )
+            out.append(SimpleNamespace(boxes=boxes))
+        return out
+
+
+def test_engine_scores_burst_in_one_request(monkeypatch):
+    """detect_frames packs the burst into the engine's slot as one batched call"""
+    print("Testing batched burst detection...")
+    import model_cache
+    model = _FakeModel()
+    monkeypatch.setattr(model_cache, "load_person_model", lambda *a, **k: (model, "pytorch"))
+
+    worker = YoloWorker(slots=1)
+    engine = DetectionEngine(None, motion=None, worker=worker)
+    thr = threading.Thread(
+        target=detection_engine._yolo_worker_main,
+        args=(worker.shm.name, worker.req_q, worker.res_qs, "yolo11n.pt", 320, 0.4),
+        daemon=True,
+    )
+    thr.start()
+    try:
+        assert worker.res_qs[0].get(timeout=5) == ("ready", "pytorch")
+        results = threading.Thread(target=engine._run_results, daemon=True)
+        results.start()
+
+        images = [np.zeros((90, 160, 3), np.uint8), np.zeros((180, 320, 3), np.uint8)]
+        dets = engine.detect_frames(images, timeout=5)
+        assert dets == [[(0.7, 1, 1, 159, 89)], [(0.7, 1, 1, 319, 179)]]
+        assert model.calls == [1, 2], "Warm-up, then the whole burst in one call"
+        assert engine._inflight is None, "Slot must be free for motion again"
+
+        with pytest.raises(ValueError):
+            engine.detect_frames([np.zeros((1080, 1920, 3), np.uint8)] * 2)
+    finally:
+        engine._stop_evt.set()
+        worker.req_q.put(None)
+        thr.join(timeout=5)
+        worker.shm.close()
+        worker.shm.unlink()
+    print("✓ One YOLO call per burst\n")
+
+
+def main():
+    print("=" * 50)
+    print("Best-Shot Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_laplacian_sees_blur()
+        test_best_framed_sharp_frame_wins()
+        test_capture_burst_is_bounded()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
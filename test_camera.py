@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test script for the background frame grabber
+Uses a fake capture device — no camera required
+"""
+
+import sys
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from camera import FrameGrabber, SyntheticSource, open_frame_source
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture; returns numbered frames at ~200 fps."""
+
+    def __init__(self, shape=(48, 64, 3)):
+        self.shape = shape
+        self.count = 0
+
+    def read(self, image=None):
+        time.sleep(0.005)
+        self.count += 1
+        if image is None:
+            image = np.empty(self.shape, np.uint8)
+        image.fill(self.count % 256)
+        return True, image
+
+
+def test_latest_and_wait_newer():
+    """Frames arrive in the background and wait_newer only returns newer ones"""
+    print("Testing latest()/wait_newer()...")
+    grabber = FrameGrabber(FakeCapture(), ring_size=4)
+    assert grabber.latest() is None, "No frame before start"
+
+    grabber.start()
+    try:
+        first = grabber.wait_newer(0.0, timeout=2.0)
+        assert first is not None, "Grabber should deliver a frame"
+        nxt = grabber.wait_newer(first.ts, timeout=2.0)
+        assert nxt is not None and nxt.ts > first.ts, "wait_newer must return a newer frame"
+        assert nxt.seq > first.seq
+        print("✓ wait_newer returns strictly newer frames")
+
+        latest = grabber.latest(copy=True)
+        assert latest.image.shape == (48, 64, 3)
+        assert not any(latest.image is buf for buf in grabber._ring), "copy=True must detach"
+        print("✓ latest(copy=True) detaches from the ring")
+    finally:
+        grabber.stop()
+
+    assert grabber.wait_newer(time.monotonic() + 10, timeout=0.05) is None
+    print("\n✓ All frame grabber tests passed!\n")
+
+
+def test_ring_is_reused():
+    """The grabber decodes into the same preallocated buffers"""
+    print("Testing ring buffer reuse...")
+    grabber = FrameGrabber(FakeCapture(), ring_size=3)
+    grabber.start()
+    try:
+        seen = set()
+        ts = 0.0
+        for _ in range(12):
+            frame = grabber.wait_newer(ts, timeout=2.0)
+            ts = frame.ts
+            seen.add(id(frame.image))
+    finally:
+        grabber.stop()
+    assert len(seen) <= 3, f"Expected at most 3 ring buffers, saw {len(seen)}"
+    print(f"✓ {len(seen)} buffers reused across 12 frames\n")
+
+
+def test_recycled_slot_is_detected():
+    """intact() tells an in-place reader when its ring slot was overwritten"""
+    print("Testing ring slot reuse check...")
+    grabber = FrameGrabber(FakeCapture(), ring_size=3)
+    grabber.start()
+    try:
+        frame = grabber.wait_newer(0.0, timeout=2.0)
+        assert grabber.intact(frame), "Fresh frame still in its slot"
+        value = frame.seq % 256
+        later = frame
+        for _ in range(3):
+            later = grabber.wait_newer(later.ts, timeout=2.0)
+        assert not grabber.intact(frame), "Slot reused three frames later"
+        assert (frame.image != value).any(), "... and the pixels changed under the reader"
+        copied = grabber.latest(copy=True)
+        assert grabber.intact(copied) and (copied.image == copied.seq % 256).all()
+    finally:
+        grabber.stop()
+    print("✓ Reuse detected, copies are checked\n")
+
+
+def test_synthetic_source_visits():
+    """The synthetic porch shows a visitor only during the visit window"""
+    print("Testing synthetic frame source...")
+    source = SyntheticSource(width=64, height=48, fps=10, speed=0, period=2.0, visit=1.0)
+    frames = [source.read()[1].copy() for _ in range(20)]
+    base = source._base
+    assert all(f.shape == (48, 64, 3) for f in frames)
+    assert all((f != base).any() for f in frames[:10]), "Visitor expected in the first second"
+    assert all((f == base).all() for f in frames[10:]), "Porch should be empty afterwards"
+
+    buf = np.empty((48, 64, 3), np.uint8)
+    ok, out = source.read(buf)
+    assert ok and out is buf, "read(image) must decode in place"
+    print("✓ Visitor appears on schedule, reads reuse the buffer\n")
+
+
+def test_synthetic_source_drives_grabber():
+    """A paced synthetic source feeds the grabber like a camera would"""
+    grabber = FrameGrabber(open_frame_source("synthetic", speed=4.0))
+    grabber.start()
+    try:
+        frame = grabber.wait_newer(0.0, timeout=2.0)
+        assert frame is not None and frame.image.shape == (1080, 1920, 3)
+    finally:
+        grabber.stop()
+    with pytest.raises(ValueError):
+        open_frame_source("webcam")
+    print("✓ Grabber runs on the synthetic source\n")
+
+
+def test_dual_stream_decodes_reduced():
+    """MJPG frames are decoded at 1/N for detection, full size only on request"""
+    print("Testing dual-stream capture...")
+    pytest.importorskip("cv2")
+    grabber = FrameGrabber(open_frame_source("synthetic:mjpg", speed=0), detect_scale=4)
+    grabber.start()
+    try:
+        frame = grabber.wait_newer(0.0, timeout=5.0)
+        assert frame is not None and frame.image.shape == (270, 480, 3)
+        assert frame.scale == 4 and frame.jpeg is not None
+        assert frame.full_image().shape == (1080, 1920, 3)
+        copied = grabber.latest(copy=True)
+        assert copied.jpeg is not None, "Copies keep the JPEG for the still"
+        grabber.wait_newer(copied.ts, timeout=5.0)
+    finally:
+        grabber.stop()
+    stats = grabber.stats()
+    assert stats["stream"] == "480x270" and stats["decoder"] in ("opencv", "turbojpeg")
+    assert "decode" in stats["frame_ms"] and "cpu" in stats["frame_ms"]
+
+    # Sources that decode themselves stay full size
+    plain = FrameGrabber(SyntheticSource(width=64, height=48, speed=0), detect_scale=4)
+    plain.start()
+    try:
+        frame = plain.wait_newer(0.0, timeout=2.0)
+        assert frame.scale == 1 and frame.full_image() is frame.image
+    finally:
+        plain.stop()
+    with pytest.raises(ValueError):
+        FrameGrabber(SyntheticSource(), detect_scale=3)
+    print(f"✓ Detection stream {stats['stream']}, decode p50 "
+          f"{stats['frame_ms']['decode']['p50']} ms\n")
+
+
+@pytest.mark.parametrize("shape", [(1, -1), (-1, 1)])
+def test_dual_stream_accepts_2d_buffers(shape):
+    """JPEG buffers shaped 1×N (V4L2 raw) or N×1 (imencode) are still decoded"""
+    print(f"Testing {shape} JPEG buffers...")
+    pytest.importorskip("cv2")
+
+    class _Shaped(SyntheticSource):
+        def read(self, image=None):
+            ok, buf = super().read()
+            return ok, buf.reshape(shape)
+
+    grabber = FrameGrabber(_Shaped(width=320, height=240, speed=0, mjpg=True), detect_scale=2)
+    grabber.start()
+    try:
+        frame = grabber.wait_newer(0.0, timeout=5.0)
+        assert frame is not None and frame.image.shape == (120, 160, 3)
+        assert frame.scale == 2 and frame.full_image().shape == (240, 320, 3)
+    finally:
+        grabber.stop()
+    print("✓ Decoded at 1/2\n")
+
+
+def test_corrupt_jpeg_is_skipped():
+    """A truncated MJPG buffer is counted as a failed read; frames keep coming"""
+    print("Testing corrupt JPEG buffers...")
+    pytest.importorskip("cv2")
+
+    class _Glitchy(SyntheticSource):
+        reads = 0
+
+        def read(self, image=None):
+            ok, buf = super().read()
+            self.reads += 1
+            return ok, (buf[:len(buf) // 8] if self.reads == 3 else buf)
+
+    grabber = FrameGrabber(_Glitchy(width=320, height=240, speed=0, mjpg=True), detect_scale=2)
+    grabber.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while grabber.frames_read < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert grabber.frames_read >= 10, f"Grabber stalled at {grabber.frames_read} frames"
+        assert grabber.read_failures == 1
+    finally:
+        grabber.stop()
+    print("✓ Corrupt frame dropped, grabber still running\n")
+
+
+def main():
+    print("=" * 50)
+    print("Frame Grabber Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_latest_and_wait_newer()
+        test_ring_is_reused()
+        test_recycled_slot_is_detected()
+        test_synthetic_source_visits()
+        test_synthetic_source_drives_grabber()
+        test_dual_stream_decodes_reduced()
+        test_corrupt_jpeg_is_skipped()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the roaster's Live exchange handling
+Uses the synthetic camera/audio backends and a stub session — no devices or network required
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("google.genai")
+
+
+class _SilentSession:
+    """Never answers; sending can be made to fail."""
+
+    def __init__(self, fail_send=False):
+        self.fail_send = fail_send
+
+    async def receive(self):
+        await asyncio.Event().wait()
+        yield None
+
+    async def send_realtime_input(self, **kwargs):
+        if self.fail_send:
+            raise ConnectionError("socket gone")
+
+
+def _roaster(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    from halloween_roaster import HalloweenRoaster
+
+    roaster = HalloweenRoaster(
+        auto_detect=False, camera="synthetic", audio="synthetic", prewarm_live=False,
+    )
+    roaster._finish_startup()
+    return roaster
+
+
+def test_exchange_leaves_no_receiver_behind(tmp_path, monkeypatch):
+    """A failed send or a cancelled exchange also stops its reply task"""
+    print("Testing exchange cleanup...")
+    from halloween_roaster import _DuplexState
+
+    roaster = _roaster(tmp_path, monkeypatch)
+
+    async def scenario():
+        duplex = _DuplexState(roaster.audio)
+        duplex.barged_in = True            # counts as speech: the turn is ended by us
+        with pytest.raises(ConnectionError):
+            await roaster._stream_mic_exchange(
+                _SilentSession(fail_send=True), duplex, max_seconds=0.1, label="x",
+            )
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert not others, f"Orphaned: {others}"
+
+        task = asyncio.create_task(roaster._stream_mic_exchange(
+            _SilentSession(), _DuplexState(roaster.audio), max_seconds=5, label="y",
+        ))
+        await asyncio.sleep(0.05)
+        task.cancel()                      # e.g. the interaction timed out
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert not others, f"Orphaned: {others}"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        roaster.cleanup()
+    print("✓ Reply tasks cleaned up\n")
+
+
+def main():
+    print("=" * 50)
+    print("Interaction Tests")
+    print("=" * 50 + "\n")
+    print("(run under pytest: the tests need its tmp_path/monkeypatch fixtures)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-warmed Gemini Live session pool
+Runs against an in-process fake Live server — no network or API key required
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from live_pool import LiveSessionPool
+
+
+class FakeSession:
+    """Minimal stand-in for a google-genai AsyncSession."""
+
+    def __init__(self, server, sid):
+        self.server = server
+        self.sid    = sid
+        self.closed = False
+        self._inbox: asyncio.Queue = asyncio.Queue()
+
+    async def receive(self):
+        while True:
+            msg = await self._inbox.get()
+            if msg is None:            # socket closed by the server
+                return
+            yield msg
+
+
+class FakeLiveServer:
+    """Hands out FakeSessions and can drop or go_away them on demand."""
+
+    def __init__(self, connect_delay=0.05):
+        self.connect_delay = connect_delay
+        self.sessions      = []
+
+    def connect(self):
+        server = self
+
+        class _CM:
+            async def __aenter__(self):
+                await asyncio.sleep(server.connect_delay)
+                self.session = FakeSession(server, len(server.sessions))
+                server.sessions.append(self.session)
+                return self.session
+
+            async def __aexit__(self, *exc):
+                self.session.closed = True
+
+        return _CM()
+
+    def go_away(self, session):
+        session._inbox.put_nowait(SimpleNamespace(go_away={"time_left": "1s"}))
+
+    def drop(self, session):
+        session._inbox.put_nowait(None)
+
+
+async def _wait_until(pred, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not pred():
+        assert asyncio.get_running_loop().time() < deadline, "Condition not reached in time"
+        await asyncio.sleep(0.01)
+
+
+def test_prewarmed_handoff():
+    """A warm session is handed out instantly and replaced in the background"""
+    print("Testing pre-warmed handoff...")
+
+    async def scenario():
+        server = FakeLiveServer()
+        pool = LiveSessionPool(server.connect)
+        await pool.start()
+        await _wait_until(lambda: pool._ready is not None)
+
+        t0 = asyncio.get_running_loop().time()
+        async with pool.session() as session:
+            assert asyncio.get_running_loop().time() - t0 < server.connect_delay, "Handoff must not wait for a connect"
+            assert session.sid == 0
+        assert session.closed, "Used sessions are closed afterwards"
+        await _wait_until(lambda: pool._ready is not None)
+        assert pool._ready.session.sid == 1, "A replacement is warmed after use"
+        assert pool.hits == 1 and pool.misses == 0
+        await pool.close()
+
+    asyncio.run(scenario())
+    print("✓ Handoff is immediate and the pool refills\n")
+
+
+def test_reconnects_after_server_close():
+    """go_away, dropped sockets and idle expiry all trigger a transparent reconnect"""
+    print("Testing idle reconnects...")
+
+    async def scenario():
+        server = FakeLiveServer(connect_delay=0.01)
+        pool = LiveSessionPool(server.connect, max_idle=0.3)
+        await pool.start()
+        await _wait_until(lambda: pool._ready is not None)
+
+        server.go_away(server.sessions[0])
+        await _wait_until(lambda: pool._ready is not None and pool._ready.session.sid == 1)
+        assert server.sessions[0].closed
+
+        server.drop(server.sessions[1])
+        await _wait_until(lambda: pool._ready is not None and pool._ready.session.sid == 2)
+
+        await _wait_until(lambda: len(server.sessions) >= 4, timeout=2.0)   # aged out
+        assert pool.recycled >= 3
+
+        async with pool.session() as session:
+            assert not session.closed, "Handed-out session must be live"
+        await pool.close()
+
+    asyncio.run(scenario())
+    print("✓ Server-side closes are replaced without the caller noticing\n")
+
+
+def test_no_prewarm_connects_on_demand():
+    async def scenario():
+        server = FakeLiveServer(connect_delay=0.01)
+        pool = LiveSessionPool(server.connect, prewarm=False)
+        await pool.start()
+        assert not server.sessions, "Nothing is opened ahead of time"
+        async with pool.session():
+            pass
+        assert pool.misses == 1 and len(server.sessions) == 1
+        await pool.close()
+
+    asyncio.run(scenario())
+    print("✓ prewarm=False connects on demand\n")
+
+
+def main():
+    print("=" * 50)
+    print("Live Session Pool Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_prewarmed_handoff()
+        test_reconnects_after_server_close()
+        test_no_prewarm_connects_on_demand()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
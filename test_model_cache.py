@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the NCNN model artifact cache
+Tests cache keying and hit detection without ultralytics installed
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from model_cache import META_FILE, cache_key, cached_export_dir, is_cached
+
+
+def test_cache_key():
+    """Key changes with weights, imgsz and ultralytics version"""
+    print("Testing cache key...")
+    base = cache_key("abc", 320, "8.3.0")
+    assert base == cache_key("abc", 320, "8.3.0"), "Key must be stable"
+    assert base != cache_key("abd", 320, "8.3.0"), "Weights hash must change the key"
+    assert base != cache_key("abc", 640, "8.3.0"), "imgsz must change the key"
+    assert base != cache_key("abc", 320, "8.3.1"), "ultralytics version must change the key"
+    print("✓ Cache key covers weights, imgsz and version\n")
+
+
+def test_cache_hit_detection():
+    """A directory only counts as cached when its metadata matches"""
+    print("Testing cache hit detection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        weights = Path(tmp) / "yolo11n.pt"
+        weights.write_bytes(b"fake weights")
+        export_dir, key = cached_export_dir(str(weights), 320, "8.3.0", Path(tmp) / "cache")
+        assert export_dir.name == "yolo11n_ncnn_model"
+        assert not is_cached(export_dir, key), "Empty cache must miss"
+
+        export_dir.mkdir(parents=True)
+        assert not is_cached(export_dir, key), "Missing metadata must miss"
+
+        (export_dir.parent / META_FILE).write_text(json.dumps({"key": key}))
+        assert is_cached(export_dir, key), "Matching metadata must hit"
+
+        weights.write_bytes(b"retrained weights")
+        new_dir, new_key = cached_export_dir(str(weights), 320, "8.3.0", Path(tmp) / "cache")
+        assert new_key != key and not is_cached(new_dir, new_key), "New weights must miss"
+    print("✓ Cache hits only on matching metadata\n")
+
+
+def main():
+    print("=" * 50)
+    print("Model Cache Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_cache_key()
+        test_cache_hit_detection()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
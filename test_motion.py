@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the downscaled / ROI-restricted motion stage
+Uses synthetic frames — no camera required
+"""
+
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from motion import MotionDetector, pad_box, parse_roi
+
+
+def _frames_with_block(x, y, size, n_static=30, shape=(1080, 1920, 3)):
+    """n_static empty frames, then one frame with a bright block at (x, y)."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 20, shape, dtype=np.uint8)
+    for _ in range(n_static):
+        yield base
+    moved = base.copy()
+    moved[y:y + size, x:x + size] = 255
+    yield moved
+
+
+def _last_result(detector, frames):
+    result = None
+    for frame in frames:
+        result = detector.process(frame)
+    return result
+
+
+def _last_result_scaled(detector, frames, frame_scale):
+    result = None
+    for frame in frames:
+        result = detector.process(frame, frame_scale)
+    return result
+
+
+def test_downscaled_motion_triggers():
+    """A person-sized block triggers at 320 px working width"""
+    print("Testing downscaled motion...")
+    det = MotionDetector(motion_threshold=5000, work_width=320)
+    assert _last_result(det, _frames_with_block(800, 400, 300)).moved, "300x300 block should trigger"
+    print("✓ Large block triggers motion at reduced resolution")
+
+    det = MotionDetector(motion_threshold=5000, work_width=320)
+    assert not _last_result(det, _frames_with_block(800, 400, 40)).moved, "40x40 block is below threshold"
+    print("✓ Threshold is scaled to the working resolution\n")
+
+
+def test_threshold_holds_on_reduced_stream():
+    """On a 1/4-size detection stream the threshold still means full-res pixels"""
+    print("Testing reduced-stream threshold...")
+    small = (270, 480, 3)
+    # 75x75 at 1/4 is a 300x300 person in the full frame; 10x10 is 40x40
+    det = MotionDetector(motion_threshold=5000, work_width=320)
+    frames = _frames_with_block(200, 100, 75, shape=small)
+    assert _last_result_scaled(det, frames, 4).moved, "Person-sized block should trigger"
+    det = MotionDetector(motion_threshold=5000, work_width=320)
+    frames = _frames_with_block(200, 100, 10, shape=small)
+    assert not _last_result_scaled(det, frames, 4).moved, "Small block is below threshold"
+    print("✓ Threshold scaled by the stream factor\n")
+
+
+def test_roi_excludes_outside_motion():
+    """Motion outside the porch ROI is ignored"""
+    print("Testing ROI restriction...")
+    roi = parse_roi("0.5,0,0.5,1")   # right half only
+    det = MotionDetector(motion_threshold=5000, work_width=320, roi=roi)
+    assert not _last_result(det, _frames_with_block(100, 400, 300)).moved, "Left-half motion must be ignored"
+    det = MotionDetector(motion_threshold=5000, work_width=320, roi=roi)
+    assert _last_result(det, _frames_with_block(1300, 400, 300)).moved, "Right-half motion must trigger"
+    print("✓ ROI restricts detection\n")
+
+
+def test_cost_stats():
+    """Per-frame cost is recorded"""
+    det = MotionDetector(work_width=160)
+    _last_result(det, _frames_with_block(0, 0, 10, n_static=5))
+    summary = det.stats.summary()
+    assert summary["frames"] == 6 and summary["p95_ms"] >= 0
+    print(f"✓ Cost stats: {summary}\n")
+
+
+def test_motion_box_in_full_res():
+    """The union box is reported in full-resolution coordinates"""
+    print("Testing motion bounding box...")
+    det = MotionDetector(motion_threshold=5000, work_width=320, roi=parse_roi("0.5,0,0.5,1"))
+    result = _last_result(det, _frames_with_block(1300, 400, 300))
+    x0, y0, x1, y1 = result.box
+    assert abs(x0 - 1300) <= 12 and abs(y0 - 400) <= 12, f"Box origin off: {result.box}"
+    assert abs(x1 - 1600) <= 12 and abs(y1 - 700) <= 12, f"Box extent off: {result.box}"
+    print(f"✓ Motion box {result.box} matches the 300x300 block at (1300, 400)\n")
+
+
+def test_pad_box():
+    """Padding grows small boxes and stays inside the frame"""
+    shape = (1080, 1920, 3)
+    assert pad_box((900, 500, 940, 540), shape, min_side=320) == (760, 360, 1080, 680)
+    assert pad_box((0, 0, 1000, 1080), shape, pad_frac=0.2) == (0, 0, 1200, 1080)
+    print("✓ pad_box enforces minimum size and clamps to the frame\n")
+
+
+def test_parse_roi_rejects_bad_input():
+    for bad in ("0.1,0.2,0.3", "0.8,0,0.5,1", "-0.1,0,0.5,0.5"):
+        try:
+            parse_roi(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"parse_roi accepted {bad!r}")
+    print("✓ parse_roi rejects malformed regions\n")
+
+
+def main():
+    print("=" * 50)
+    print("Motion Stage Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_downscaled_motion_triggers()
+        test_threshold_holds_on_reduced_stream()
+        test_roi_excludes_outside_motion()
+        test_cost_stats()
+        test_motion_box_in_full_res()
+        test_pad_box()
+        test_parse_roi_rejects_bad_input()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the idle detection scheduler
+Drives the scheduler with explicit timestamps — no camera required
+"""
+
+import sys
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scheduler import DetectionScheduler
+
+
+def _scheduler(rates):
+    return DetectionScheduler(
+        active_fps=10, idle_fps=2, idle_after=5.0, paused_fps=1,
+        on_rate=rates.append, log=lambda msg: None,
+    )
+
+
+def test_idles_down_and_ramps_up():
+    """Quiet porch → idle rate; the first motion is back to full rate at once"""
+    print("Testing idle ramp...")
+    rates = []
+    sched = _scheduler(rates)
+    t0 = time.monotonic()
+    assert sched.state == "active" and sched.period() == pytest.approx(0.1)
+
+    sched.observe(False, t0 + 4.9)
+    assert sched.state == "active", "Not quiet for long enough yet"
+    sched.observe(False, t0 + 5.1)
+    assert sched.state == "idle" and sched.period() == pytest.approx(0.5)
+    assert rates == [2], "Camera drops to the idle rate"
+
+    sched.observe(True, t0 + 30.0)
+    assert sched.state == "active" and sched.period() == pytest.approx(0.1)
+    assert rates == [2, None], "One moving frame restores the full rate"
+    print("✓ Idle after a quiet spell, active on the next motion\n")
+
+
+def test_paused_states_ignore_motion():
+    """Interactions and cooldowns pause detection until resumed"""
+    print("Testing pause/resume...")
+    rates = []
+    sched = _scheduler(rates)
+    sched.pause("interaction")
+    assert rates == [], "Interaction keeps the full camera rate (still burst)"
+    sched.observe(True)
+    assert sched.state == "interaction"
+
+    sched.pause("cooldown")
+    assert rates == [1]
+    sched.resume()
+    assert sched.state == "active" and rates == [1, None]
+    with pytest.raises(ValueError):
+        sched.pause("idle")
+
+    stats = sched.stats()
+    assert stats["transitions"] == 3
+    for state in ("active", "interaction", "cooldown"):
+        assert set(stats[state]) == {"wall_s", "cpu_pct", "grab_cpu_pct", "samples"}
+        assert stats[state]["cpu_pct"] is None, "No motion thread accounted"
+    assert stats["interaction"]["samples"] == 1
+    print(f"✓ Per-state counters: {stats}\n")
+
+
+def test_cpu_is_per_detection_thread():
+    """A busy door's CPU isn't charged to a quiet door in the same process"""
+    print("Testing per-thread CPU accounting...")
+    import threading
+    busy, quiet = _scheduler([]), _scheduler([])
+
+    def run(sched, spin):
+        sched.account_thread()
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            until = time.monotonic() + 0.02
+            if spin:
+                while time.monotonic() < until:
+                    pass
+            else:
+                time.sleep(0.02)
+            sched.observe(True)
+
+    threads = [threading.Thread(target=run, args=(busy, True)),
+               threading.Thread(target=run, args=(quiet, False))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    busy_cpu = busy.stats()["active"]["cpu_pct"]
+    quiet_cpu = quiet.stats()["active"]["cpu_pct"]
+    assert busy_cpu > 30, f"Spinning motion thread should show up: {busy_cpu}%"
+    assert quiet_cpu < 20, f"Sleeping motion thread charged {quiet_cpu}%"
+
+    # Serial detection samples from executor threads, which run other work
+    # in between: counted, but their CPU isn't charged
+    other = threading.Thread(target=busy.observe, args=(True,))
+    other.start()
+    other.join()
+    assert busy.stats()["active"]["samples"] > 0
+    print(f"✓ Busy door {busy_cpu}%, quiet door {quiet_cpu}%\n")
+
+
+def test_grab_cpu_charged_per_state():
+    """The grab thread's CPU is split by the state it was spent in"""
+    print("Testing grab-thread CPU per state...")
+    grab = {"cpu_s": 0.0}
+    sched = DetectionScheduler(idle_fps=2, idle_after=0.05, log=lambda msg: None,
+                               grab_cpu=lambda: grab["cpu_s"])
+    time.sleep(0.1)
+    grab["cpu_s"] += 0.05                   # decoding every frame while active
+    sched.observe(False)
+    assert sched.state == "idle"
+    time.sleep(0.1)
+    grab["cpu_s"] += 0.005                  # a few throttled decodes
+    stats = sched.stats()
+    assert stats["active"]["grab_cpu_pct"] > stats["idle"]["grab_cpu_pct"] > 0
+    print(f"✓ active {stats['active']['grab_cpu_pct']}%, idle {stats['idle']['grab_cpu_pct']}%\n")
+
+
+def test_grabber_rate_skips_decodes():
+    """A throttled grabber reads every JPEG but decodes only a few"""
+    print("Testing camera decode throttle...")
+    pytest.importorskip("cv2")
+    from camera import FrameGrabber, SyntheticSource
+
+    grabber = FrameGrabber(SyntheticSource(width=320, height=180, fps=60, mjpg=True),
+                           detect_scale=2)
+    grabber.set_rate(5)
+    grabber.start()
+    try:
+        time.sleep(1.0)
+    finally:
+        grabber.stop()
+    stats = grabber.stats()
+    assert stats["frames"] <= 8, f"Expected ~5 decodes, got {stats['frames']}"
+    assert stats["skipped"] >= 40, "The other frames are read and dropped"
+    print(f"✓ {stats['frames']} decoded, {stats['skipped']} skipped in 1 s\n")
+
+
+def main():
+    print("=" * 50)
+    print("Detection Scheduler Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_idles_down_and_ramps_up()
+        test_paused_states_ignore_motion()
+        test_cpu_is_per_detection_thread()
+        test_grab_cpu_charged_per_state()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
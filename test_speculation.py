@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative interactions
+Drives the speculator with a fake session pool — no camera, YOLO or network required
+"""
+
+import asyncio
+import contextlib
+import sys
+import time
+
+import pytest
+
+from speculation import Speculator
+
+
+class FakePool:
+    """Hands out numbered sessions and records what was sent and closed."""
+
+    def __init__(self, connect_delay=0.01):
+        self.connect_delay = connect_delay
+        self.opened = []
+        self.closed = []
+
+    @contextlib.asynccontextmanager
+    async def session(self):
+        await asyncio.sleep(self.connect_delay)
+        session = {"sid": len(self.opened), "sent": []}
+        self.opened.append(session)
+        try:
+            yield session
+        finally:
+            self.closed.append(session["sid"])
+
+
+def _speculator(pool, **kwargs):
+    async def prepare(spec):
+        await asyncio.sleep(0.02)              # capture + upload
+        spec.session["sent"].append("image")
+        return "still"
+    return Speculator(pool, prepare, log=lambda msg: None, **kwargs)
+
+
+async def _settle(seconds=0.1):
+    await asyncio.sleep(seconds)
+
+
+def test_hit_hands_over_the_session():
+    """Motion opens a session with the image in it; the person event claims it"""
+    print("Testing speculative hit...")
+
+    async def scenario():
+        pool = FakePool()
+        spec_r = _speculator(pool)
+        spec_r.bind(asyncio.get_running_loop())
+        spec_r.on_motion(1.0, (10, 20, 110, 220))
+        spec_r.on_motion(1.1)                  # one speculation at a time
+        await _settle()
+
+        spec = spec_r.claim()
+        assert spec is not None and spec_r.current is None
+        assert spec.motion_box == (10, 20, 110, 220), "Crop hint for the still"
+        assert await spec_r.ready(spec) == "still"
+        assert spec.session["sent"] == ["image"], "Image is in before the prompt"
+        assert pool.closed == [], "The interaction owns the session until release"
+        await spec_r.release(spec)
+        assert pool.closed == [0] and len(pool.opened) == 1
+
+        stats = spec_r.stats()
+        assert stats["started"] == 1 and stats["hits"] == 1 and stats["hit_ratio"] == 1.0
+        assert stats["lead_ms_p50"] > 0, "Image was sent before the confirmation"
+
+        # Confirmed before the image went out: it still helps, but isn't a hit
+        spec_r.on_motion(2.0)
+        await asyncio.sleep(0)
+        spec = spec_r.claim()
+        assert await spec_r.ready(spec) == "still"
+        await spec_r.release(spec)
+        stats = spec_r.stats()
+        assert stats["hits"] == 1 and stats["late"] == 1 and stats["hit_ratio"] == 0.5
+        assert stats["wait_ms_p50"] > 0
+        return stats
+
+    stats = asyncio.run(scenario())
+    print(f"✓ Session handed over: {stats}\n")
+
+
+def test_no_person_cancels_and_backs_off():
+    """YOLO seeing nobody closes the session; the window catches the rest"""
+    print("Testing speculative misses...")
+
+    async def scenario():
+        pool = FakePool()
+        spec_r = _speculator(pool, window=0.3, reject_after=2, backoff=0.2)
+        spec_r.bind(asyncio.get_running_loop())
+
+        spec_r.on_motion(5.0)
+        await _settle(0.05)
+        spec_r.on_verdict(4.0, False)          # older than the motion: ignored
+        spec_r.on_verdict(5.0, False)
+        spec_r.on_verdict(5.1, True)
+        await _settle(0.01)
+        assert spec_r.current is not None
+        spec_r.on_verdict(5.2, False)
+        await _settle()
+        assert spec_r.current is None and pool.closed == [0]
+        assert spec_r.rejected == 1
+
+        spec_r.on_motion(6.0)                  # within the backoff
+        await _settle()
+        assert spec_r.started == 1 and spec_r.claim() is None
+
+        await _settle(0.2)
+        spec_r.on_motion(7.0)
+        await _settle(0.45)                    # nothing confirmed in the window
+        assert spec_r.expired == 1 and pool.closed == [0, 1]
+        stats = spec_r.stats()
+        assert stats["hit_ratio"] == 0.0 and stats["hits"] == 0
+
+        await _settle(0.25)
+        spec_r.on_motion(9.0)
+        await _settle(0.05)
+        await spec_r.close()                   # shutting down isn't a miss
+        await _settle(0.05)
+        assert spec_r.expired == 1 and pool.closed == [0, 1, 2]
+        return stats
+
+    stats = asyncio.run(scenario())
+    print(f"✓ Misses closed their sessions: {stats}\n")
+
+
+def test_failed_prepare_falls_back():
+    """A capture or upload error leaves the claim empty-handed, not stuck"""
+    print("Testing failed speculation...")
+
+    async def scenario():
+        pool = FakePool()
+
+        async def prepare(spec):
+            raise RuntimeError("camera unplugged")
+
+        spec_r = Speculator(pool, prepare, log=lambda msg: None)
+        spec_r.bind(asyncio.get_running_loop())
+        spec_r.on_motion(1.0)
+        await _settle()
+        spec = spec_r.claim()
+        assert await spec_r.ready(spec) is None
+        await spec_r.release(spec)
+        assert spec_r.failed == 1 and pool.closed == [0]
+
+        # can_start vetoes speculation (e.g. the porch is busy)
+        spec_r = Speculator(pool, prepare, can_start=lambda: False, log=lambda msg: None)
+        spec_r.bind(asyncio.get_running_loop())
+        spec_r.on_motion(2.0)
+        await _settle()
+        assert spec_r.started == 0
+
+    asyncio.run(scenario())
+    print("✓ Failures fall back to a normal interaction\n")
+
+
+def test_second_visitor_speculates_again(tmp_path, monkeypatch):
+    """After one visitor leaves, the next one's motion speculates again"""
+    print("Testing speculation across two visitors...")
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    pytest.importorskip("google.genai")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    from halloween_roaster import HalloweenRoaster
+    from scheduler import DetectionScheduler
+    from tracker import PersonTracker
+
+    roaster = HalloweenRoaster(
+        auto_detect=False, camera="synthetic", audio="synthetic", prewarm_live=False,
+    )
+    try:
+        roaster.tracker   = PersonTracker(max_lost=0.2)
+        roaster.scheduler = DetectionScheduler(log=lambda msg: None)
+
+        async def scenario():
+            roaster._ready = asyncio.get_running_loop().create_future()
+            roaster._ready.set_result(None)
+            assert roaster._can_speculate(), "Empty porch"
+
+            # First visitor confirmed and roasted; YOLO then sees nobody again
+            emb = np.ones(8, np.float32) / np.sqrt(8)
+            roaster.tracker.update(time.monotonic(), [(10, 10, 100, 200)], [emb])
+            roaster.tracker.mark_roasted()
+            assert not roaster._can_speculate(), "Roasted visitor still on the porch"
+            await asyncio.sleep(0.3)
+            assert roaster._can_speculate(), "They left: the next visitor gets a speculation"
+
+            roaster.tracker.update(time.monotonic(), [(300, 10, 400, 200)], [-emb])
+            assert [t.id for t in roaster.tracker.new_visitors()] == [2]
+
+        asyncio.run(scenario())
+    finally:
+        roaster.cleanup()
+    print("✓ Speculation re-arms between visitors\n")
+
+
+def test_speculative_still_is_cropped(tmp_path, monkeypatch):
+    """Without a person box yet, the still is cropped to the motion, spans kept apart"""
+    print("Testing the speculative still...")
+    pytest.importorskip("cv2")
+    pytest.importorskip("google.genai")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    from halloween_roaster import HalloweenRoaster
+    from timing import SpanTimer
+
+    roaster = HalloweenRoaster(
+        auto_detect=False, camera="synthetic", audio="synthetic", prewarm_live=False,
+        burst_frames=1, upload_edge=None,
+    )
+    try:
+        current = roaster.spans
+        spans   = SpanTimer()
+        still   = roaster.capture_image(spans, box_hint=(600, 200, 1000, 900))
+        assert still.width < 1920 and still.height < 1080, "Cropped to the motion box"
+        assert roaster._still_shows(still, (650, 250, 950, 850))
+        assert not roaster._still_shows(still, (200, 200, 1000, 900)), \
+            "A visitor reaching past the motion crop needs a fresh still"
+        assert "capture" in spans.spans and roaster.spans is current
+        assert "capture" not in current.spans, "A running roast's timings are left alone"
+
+        # Ring slot overwritten during the encode: encoded again from a copy
+        copies, torn = [], [True]
+        latest = roaster.grabber.latest
+        monkeypatch.setattr(roaster.grabber, "intact", lambda frame: not (torn and torn.pop()))
+        monkeypatch.setattr(roaster.grabber, "latest",
+                            lambda copy=False: copies.append(copy) or latest(copy))
+        again = roaster.capture_image(spans, box_hint=(600, 200, 1000, 900))
+        assert copies == [False, True] and again.region == still.region
+    finally:
+        roaster.cleanup()
+    print(f"✓ {still.width}x{still.height} crop\n")
+
+
+def main():
+    print("=" * 50)
+    print("Speculation Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_hit_hands_over_the_session()
+        test_no_person_cancels_and_backs_off()
+        test_failed_prepare_falls_back()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-door stations
+Station specs and the shared YOLO worker, with a fake model — no devices required
+"""
+
+import queue
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import detection_engine
+from detection_engine import YoloWorker
+from stations import StationSpec, parse_station
+
+
+def test_parse_station():
+    """NAME=CAMERA[@AUDIO] specs, with colons inside camera and audio specs"""
+    print("Testing station specs...")
+    assert parse_station("front=v4l2:0@pyaudio:1,2") == StationSpec("front", "v4l2:0", "pyaudio:1,2")
+    assert parse_station("side=file:/clips/side.mp4") == StationSpec("side", "file:/clips/side.mp4", "pyaudio")
+    for bad in ("front", "=v4l2", "front="):
+        with pytest.raises(ValueError):
+            parse_station(bad)
+    print("✓ Station specs parsed\n")
+
+
+def test_worker_slots_are_separate():
+    """Each door gets its own crop buffer in the shared worker's memory"""
+    print("Testing shared worker slots...")
+    worker = YoloWorker(slots=2)
+    try:
+        a, b = worker.attach(), worker.attach()
+        assert (a, b) == (0, 1)
+        with pytest.raises(RuntimeError):
+            worker.attach()
+
+        buf_a = worker.buffer(a, 4, 6)
+        buf_b = worker.buffer(b, 4, 6)
+        buf_a.fill(1)
+        buf_b.fill(2)
+        assert buf_a.max() == 1, "Slots must not overlap"
+        del buf_a, buf_b
+    finally:
+        worker.stop()
+    print("✓ Slots isolated\n")
+
+
+class _FakeBoxes:
+    def __init__(self, conf, xyxy):
+        self.conf = SimpleNamespace(tolist=lambda: conf)
+        self.xyxy = SimpleNamespace(tolist=lambda: xyxy)
+
+
+class _FakeModel:
+    """Finds one 'person' per crop, its bottom edge taken from the crop's first pixel."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, source, **kwargs):
+        crops = source if isinstance(source, list) else [source]
+        self.calls.append(len(crops))
+        return [SimpleNamespace(boxes=_FakeBoxes([0.9], [[0, 0, 5, int(c[0, 0, 0])]]))
+                for c in crops]
+
+
+def test_worker_batches_waiting_crops(monkeypatch):
+    """Crops queued by several doors are run as one batch and routed back per slot"""
+    print("Testing worker batching...")
+    import model_cache
+    model = _FakeModel()
+    monkeypatch.setattr(model_cache, "load_person_model", lambda *a, **k: (model, "pytorch"))
+
+    worker = YoloWorker(slots=3)
+    req_q  = queue.Queue()
+    res_qs = [queue.Queue() for _ in range(3)]
+    try:
+        for slot in range(3):
+            worker.buffer(slot, 8, 8).fill(10 + slot)
+            req_q.put((slot, 100 + slot, [(8, 8)]))
+        req_q.put(None)
+        thr = threading.Thread(
+            target=detection_engine._yolo_worker_main,
+            args=(worker.shm.name, req_q, res_qs, "yolo11n.pt", 320, 0.4),
+        )
+        thr.start()
+        thr.join(timeout=5)
+
+        assert model.calls == [1, 3], "Warm-up, then all three crops in one call"
+        for slot, res_q in enumerate(res_qs):
+            assert res_q.get_nowait() == ("ready", "pytorch")
+            assert res_q.get_nowait() == ("result", 100 + slot, [[(0.9, 0, 0, 5, 10 + slot)]], 3)
+    finally:
+        worker.stop()
+    print("✓ One YOLO call for three doors\n")
+
+
+def main():
+    print("=" * 50)
+    print("Station Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_parse_station()
+        test_worker_slots_are_separate()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for single-pass still encoding
+Uses synthetic frames — no camera required
+"""
+
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from still import StillEncoder, prepare_upload
+
+
+def _frame(shape=(1080, 1920, 3)):
+    img = np.zeros(shape, np.uint8)
+    img[200:800, 600:1200] = (0, 128, 255)
+    return img
+
+
+def test_encode_roundtrip():
+    """Encoded bytes are a valid JPEG of the same frame"""
+    print("Testing single-pass encode...")
+    enc   = StillEncoder(quality=85, backend="opencv")
+    still = enc.encode(_frame())
+    assert still.jpeg[:2] == b"\xff\xd8", "Output must be a JPEG"
+    assert (still.width, still.height) == (1920, 1080)
+    decoded = cv2.imdecode(np.frombuffer(still.jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (1080, 1920, 3)
+    assert abs(int(decoded[500, 900, 2]) - 255) < 8, "Channel order must stay BGR"
+    print(f"✓ {len(still.jpeg) / 1024:.0f} KB in {still.encode_ms:.1f} ms\n")
+
+
+def test_max_width_and_quality():
+    """max_width downscales before encoding; lower quality means fewer bytes"""
+    print("Testing resolution / quality settings...")
+    img   = _frame()
+    img[::2, ::2] = 40    # texture, so quality matters
+    small = StillEncoder(max_width=960, backend="opencv").encode(img)
+    assert (small.width, small.height) == (960, 540)
+
+    hi = StillEncoder(quality=90, backend="opencv").encode(img)
+    lo = StillEncoder(quality=90, backend="opencv").encode(img, quality=40)
+    assert len(lo.jpeg) < len(hi.jpeg)
+    assert StillEncoder(max_width=4000).resize(img) is img, "No-op resize must not copy"
+    print("✓ max_width / quality applied\n")
+
+
+def test_prepare_upload_crops_and_fits_budget():
+    """The upload is cropped to the person, scaled, and within the byte budget"""
+    print("Testing upload preparation...")
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)   # hard to compress
+    enc = StillEncoder(quality=90, backend="opencv")
+
+    full = prepare_upload(img, enc, long_edge=None, max_bytes=None)
+    crop = prepare_upload(img, enc, box=(800, 200, 1100, 1000), long_edge=512,
+                          max_bytes=60_000, min_quality=20)
+    assert max(crop.width, crop.height) == 512
+    assert crop.height > crop.width, "Person crop should stay portrait"
+    assert len(crop.jpeg) <= 60_000, f"Over budget: {len(crop.jpeg)} bytes"
+    assert crop.quality < 90, "Budget should have forced a lower quality"
+    print(f"✓ {len(full.jpeg) / 1024:.0f} KB full frame → "
+          f"{len(crop.jpeg) / 1024:.0f} KB crop (q{crop.quality})")
+
+    floor = prepare_upload(img, enc, max_bytes=1000, min_quality=50)
+    assert floor.quality == 50, "Quality never drops below min_quality"
+    print("✓ min_quality respected\n")
+
+
+def main():
+    print("=" * 50)
+    print("Still Encoding Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_encode_roundtrip()
+        test_max_width_and_quality()
+        test_prepare_upload_crops_and_fits_budget()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
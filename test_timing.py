@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the latency span / rolling percentile helpers
+Pure Python — no hardware required
+"""
+
+import sys
+import time
+
+from timing import RollingStats, SpanTimer
+
+
+def test_marks_and_spans():
+    """Marks are offsets from the origin; only the first mark of a name counts"""
+    print("Testing SpanTimer...")
+    origin = time.monotonic() - 0.5          # visitor appeared half a second ago
+    spans  = SpanTimer(origin=origin)
+    spans.mark("person", origin + 0.2)
+    spans.mark("person", origin + 0.4)
+    with spans.span("capture"):
+        time.sleep(0.01)
+    spans.mark("captured")
+
+    d = spans.as_dict()
+    assert d["marks_ms"]["person"] == 200.0, "Later marks of the same name are ignored"
+    assert d["marks_ms"]["captured"] >= 500
+    assert 5 <= d["spans_ms"]["capture"] < 500
+    print(f"✓ {d}\n")
+
+
+def test_rolling_percentiles():
+    """Percentiles cover only the last `window` samples"""
+    print("Testing RollingStats...")
+    stats = RollingStats(window=100)
+    for ms in range(1, 201):                 # only 101..200 stay in the window
+        stats.add("roast.first_audio", float(ms))
+    s = stats.summary()["roast.first_audio"]
+    assert s["n"] == 100 and s["max"] == 200.0
+    assert s["p50"] == 150.5 and s["p95"] == 195.1
+
+    spans = SpanTimer(origin=0.0)
+    spans.add("connect", 0.25)
+    stats.add_spans(spans)
+    line = stats.log_line(["connect", "roast.first_audio", "missing"])
+    assert "connect p50=250" in line and "missing" not in line
+    print(f"✓ {line}\n")
+
+
+def main():
+    print("=" * 50)
+    print("Timing Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_marks_and_spans()
+        test_rolling_percentiles()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
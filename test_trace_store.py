@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the background trace writer
+Writes to a temporary directory — no camera or API key required
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from trace_store import TraceWriter, load, query
+
+
+def _trace(i, mode="auto"):
+    return {
+        "timestamp":            f"2025-10-31T19:{i:02d}:00",
+        "mode":                 mode,
+        "exchanges_count":      i % 4,
+        "conversation_history": [{"role": "assistant", "content": f"roast {i}"}],
+    }
+
+
+def test_batched_write_and_index():
+    """Traces land in JSONL segments, images on disk, and the index finds them"""
+    print("Testing batched writes + index...")
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = TraceWriter(tmp, rotate_bytes=400)
+        writer.start()
+        ids = [writer.submit(_trace(i, "manual" if i % 5 == 0 else "auto"), jpeg=b"\xff\xd8jpeg")
+               for i in range(12)]
+        assert writer.flush(), "flush() should confirm the batch is on disk"
+        writer.close()
+
+        assert all(ids) and writer.stats()["written"] == 12
+        assert len(list(Path(tmp).glob("roasts_*.jsonl"))) > 1, "Segments should rotate"
+        print(f"✓ {writer.stats()}")
+
+        rows = query(tmp)
+        assert [r["id"] for r in rows] == ids, "Index returns traces in timestamp order"
+        chatty = query(tmp, mode="auto", min_exchanges=3)
+        assert chatty and all(r["mode"] == "auto" and r["exchanges_count"] >= 3 for r in chatty)
+        late = query(tmp, since="2025-10-31T19:10:00")
+        assert len(late) == 2
+
+        record = load(tmp, rows[7])
+        assert record["conversation_history"][0]["content"] == "roast 7"
+        assert (Path(tmp) / record["image"]).read_bytes() == b"\xff\xd8jpeg"
+        print("✓ Index lookups seek straight to the record\n")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """submit() never blocks the interaction path"""
+    print("Testing bounded queue...")
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = TraceWriter(tmp, max_queue=3)     # writer thread not started
+        results = [writer.submit(_trace(i)) for i in range(5)]
+        assert results.count(None) == 2 and writer.dropped == 2
+        writer.start()
+        writer.close()
+        assert writer.written == 3, "Queued traces are flushed on close()"
+    print("✓ Overflow is dropped and counted; close() drains the rest\n")
+
+
+def main():
+    print("=" * 50)
+    print("Trace Store Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_batched_write_and_index()
+        test_full_queue_drops_instead_of_blocking()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for visitor tracking
+Uses synthetic "costumes" (coloured boxes) — no camera or YOLO required
+"""
+
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tracker import PersonTracker, appearance, iou
+
+COSTUMES = {
+    "witch":   ((20, 20, 20), (120, 30, 140)),     # (top, bottom) BGR
+    "pumpkin": ((0, 120, 240), (0, 100, 200)),
+    "ghost":   ((240, 240, 240), (230, 230, 230)),
+}
+
+
+def _scene(*people, shape=(480, 640, 3)):
+    """A grey porch with each (costume, box) painted on it."""
+    img = np.full(shape, 90, np.uint8)
+    for name, (x0, y0, x1, y1) in people:
+        top, bottom = COSTUMES[name]
+        mid = (y0 + y1) // 2
+        img[y0:mid, x0:x1] = top
+        img[mid:y1, x0:x1] = bottom
+    return img
+
+
+def _feed(tracker, ts, *people):
+    img   = _scene(*people)
+    boxes = [box for _, box in people]
+    return tracker.update(ts, boxes, [appearance(img, b) for b in boxes])
+
+
+def test_iou_and_appearance():
+    """IoU is symmetric and the embedding tells costumes apart"""
+    print("Testing IoU and appearance...")
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+    assert abs(iou((0, 0, 10, 10), (5, 0, 15, 10)) - 1 / 3) < 1e-9
+
+    box   = (100, 100, 200, 400)
+    witch = appearance(_scene(("witch", box)), box)
+    moved = appearance(_scene(("witch", (300, 80, 410, 400))), (300, 80, 410, 400))
+    ghost = appearance(_scene(("ghost", box)), box)
+    assert witch.shape == (128,) and abs(np.linalg.norm(witch) - 1) < 1e-5
+    assert float(witch @ moved) > 0.95, "Same costume elsewhere should match"
+    assert float(witch @ ghost) < 0.5, "Different costumes should not"
+    print("✓ Embedding separates costumes\n")
+
+
+def test_lingering_visitor_is_one_track():
+    """A visitor who stays (even through a detection pause) is roasted once"""
+    print("Testing a lingering visitor...")
+    tracker = PersonTracker()
+    _feed(tracker, 0.0, ("witch", (100, 100, 200, 400)))
+    assert [t.id for t in tracker.new_visitors()] == [1]
+    tracker.mark_roasted()
+
+    for i in range(1, 10):
+        _feed(tracker, i * 0.2, ("witch", (100 + i * 3, 100, 200 + i * 3, 400)))
+    assert tracker.new_visitors() == []
+
+    # Detection paused for a 60 s roast: the track went to memory and comes back
+    tracks = _feed(tracker, 62.0, ("witch", (130, 100, 230, 400)))
+    assert tracks[0].id == 1 and tracks[0].roasted
+    assert tracker.new_visitors() == []
+    assert tracker.stats()["revived"] == 1
+    print("✓ No repeat roast\n")
+
+
+def test_new_group_triggers_right_away():
+    """Newcomers get their own tracks even seconds after the last roast"""
+    print("Testing a new group...")
+    tracker = PersonTracker()
+    _feed(tracker, 0.0, ("witch", (100, 100, 200, 400)))
+    tracker.mark_roasted()
+
+    _feed(tracker, 1.0, ("witch", (100, 100, 200, 400)),
+          ("pumpkin", (300, 120, 400, 400)), ("ghost", (450, 100, 560, 400)))
+    fresh = tracker.new_visitors()
+    assert sorted(t.id for t in fresh) == [2, 3]
+    tracker.mark_roasted([2])
+    assert [t.id for t in tracker.new_visitors()] == [3]
+    print("✓ New visitors trigger without a cooldown\n")
+
+
+def test_departure_settled_by_the_clock():
+    """A visitor who walked off leaves the porch without another detection"""
+    print("Testing departures without detections...")
+    tracker = PersonTracker(max_lost=2.0)
+    _feed(tracker, 0.0, ("witch", (100, 100, 200, 400)))
+    tracker.mark_roasted()
+    assert tracker.present(1.0) == 1
+    assert tracker.present(3.0) == 0, "Gone once unseen for max_lost"
+    assert list(tracker.memory) == [1]
+    print("✓ Departure noticed by the clock\n")
+
+
+def test_memory_is_bounded():
+    """Departed visitors live in a bounded LRU and are forgotten eventually"""
+    print("Testing the visitor memory...")
+    tracker = PersonTracker(memory=2, forget_after=100.0)
+    names = list(COSTUMES)
+    for i, name in enumerate(names):
+        _feed(tracker, i * 10.0, (name, (100, 100, 200, 400)))
+    _feed(tracker, 40.0)
+    assert len(tracker.memory) == 2 and tracker.stats()["forgotten"] == 1
+    assert list(tracker.memory) == [2, 3], "Least recently seen goes first"
+
+    _feed(tracker, 500.0)
+    assert len(tracker.memory) == 0, "Everyone is forgotten after forget_after"
+    print("✓ Memory bounded and expiring\n")
+
+
+def main():
+    print("=" * 50)
+    print("Visitor Tracker Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_iou_and_appearance()
+        test_lingering_visitor_is_one_track()
+        test_new_group_triggers_right_away()
+        test_departure_settled_by_the_clock()
+        test_memory_is_bounded()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive voice activity detector
+Generates WAV fixtures on the fly — no microphone required
+"""
+
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vad import EchoGate, VoiceActivityDetector, segments_from_pcm, segments_from_wav
+
+RATE = 16000
+
+
+def _clip(noise_rms, bursts, seconds=6.0, seed=0):
+    """Gaussian noise with 300 Hz 'speech' bursts at [(start_s, end_s, amplitude)]."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * RATE)
+    audio = rng.normal(0, noise_rms, n)
+    t = np.arange(n) / RATE
+    for start, end, amp in bursts:
+        sl = slice(int(start * RATE), int(end * RATE))
+        audio[sl] += amp * np.sin(2 * np.pi * 300 * t[sl])
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def _write_wav(path, samples):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(samples.tobytes())
+
+
+def test_quiet_porch_segments():
+    """One utterance on a quiet porch is found with accurate offsets"""
+    print("Testing quiet porch fixture...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "quiet.wav"
+        _write_wav(path, _clip(60, [(1.0, 2.5, 3000)]))
+        segs = segments_from_wav(path, hangover_s=0.5)
+    assert len(segs) == 1, f"Expected one utterance, got {segs}"
+    start, end = segs[0]
+    assert abs(start / RATE - 1.0) < 0.1, f"Speech start off: {start / RATE:.2f}s"
+    assert abs(end / RATE - 2.5) < 0.1, f"Speech end off: {end / RATE:.2f}s"
+    print(f"✓ Utterance at {start / RATE:.2f}s – {end / RATE:.2f}s\n")
+
+
+def test_noisy_street_adapts():
+    """Steady street noise above the old fixed gate does not count as speech"""
+    print("Testing noisy street fixture...")
+    vad = VoiceActivityDetector(hangover_s=0.5)
+    ambient = _clip(500, [], seconds=1.0, seed=1)
+    vad.calibrate(ambient.tobytes())
+    assert vad.threshold > 500, f"Threshold {vad.threshold:.0f} should sit above street noise"
+
+    segs_vad = VoiceActivityDetector(hangover_s=0.5)
+    segs_vad.noise_floor = vad.noise_floor
+    pcm = _clip(500, [(3.0, 4.0, 6000)], seed=2).tobytes()
+    segs = segments_from_pcm(pcm, segs_vad)
+    assert len(segs) == 1 and abs(segs[0][0] / RATE - 3.0) < 0.15, f"Unexpected segments {segs}"
+    print(f"✓ Noise floor {vad.noise_floor:.0f}, speech found at {segs[0][0] / RATE:.2f}s\n")
+
+
+def test_hangover_bridges_pauses():
+    """A short pause between words does not end the utterance"""
+    vad = VoiceActivityDetector(hangover_s=0.6)
+    pcm = _clip(60, [(1.0, 1.6, 3000), (1.9, 2.5, 3000)]).tobytes()
+    segs = segments_from_pcm(pcm, vad)
+    assert len(segs) == 1, f"0.3 s pause should be bridged, got {segs}"
+    print("✓ Hangover bridges short pauses\n")
+
+
+def test_energy_buffers_are_reused():
+    """rms() works in the preallocated buffer and matches a float reference"""
+    vad = VoiceActivityDetector()
+    buf = vad._buf32
+    chunk = _clip(0, [(0, 0.064, 20000)], seconds=0.064)[:1024]
+    expected = float(np.sqrt(np.mean(chunk.astype(np.float64) ** 2)))
+    assert abs(vad.rms(chunk.tobytes()) - expected) < 1e-3
+    assert vad._buf32 is buf, "rms() must not reallocate for CHUNK-sized input"
+    print("✓ Energy computed without per-chunk allocation\n")
+
+
+def test_echo_gate_barge_in():
+    """Our own roast leaking into the mic is ignored; a visitor over it is not"""
+    print("Testing echo-aware barge-in...")
+    gate = EchoGate(VoiceActivityDetector(), attack=2)
+    roast = _clip(0, [(0, 2.0, 8000)], seconds=2.0, seed=3)
+    fired = False
+    for off in range(0, roast.size - 1024, 1024):
+        out = roast[off:off + 1024]
+        gate.note_playback(out.tobytes())
+        mic = (out * 0.3).astype(np.int16)          # 30% echo coupling
+        fired |= gate.feed(mic.tobytes())
+    assert not fired, "Echo alone must not trigger barge-in"
+    assert 0.2 < gate.coupling < 0.4, f"Coupling should be learned, got {gate.coupling:.2f}"
+
+    visitor = _clip(0, [(0, 0.5, 9000)], seconds=0.5, seed=4)
+    for off in range(0, visitor.size - 1024, 1024):
+        out = roast[off:off + 1024]
+        gate.note_playback(out.tobytes())
+        mic = (out * 0.3 + visitor[off:off + 1024]).clip(-32768, 32767).astype(np.int16)
+        fired |= gate.feed(mic.tobytes())
+    assert fired, "Visitor talking over playback must trigger barge-in"
+    print(f"✓ Barge-in detected over echo (learned coupling {gate.coupling:.2f})\n")
+
+
+def main():
+    print("=" * 50)
+    print("Voice Activity Detector Tests")
+    print("=" * 50 + "\n")
+    try:
+        test_quiet_porch_segments()
+        test_noisy_street_adapts()
+        test_hangover_bridges_pauses()
+        test_energy_buffers_are_reused()
+        test_echo_gate_barge_in()
+        print("✓ ALL TESTS PASSED!")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
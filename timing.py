@@ -0,0 +1,143 @@
+"""
+Lightweight timing helpers for the Halloween Roaster.
+
+  - PhaseTimer:   one-off startup phases.
+  - SpanTimer:    per-interaction marks ("first audio byte at +1.8 s") and
+                  spans ("capture took 40 ms"), written into the trace.
+  - RollingStats: rolling percentiles of those numbers across visitors,
+                  printed as one log line after each interaction.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class PhaseTimer:
+    """
+    Records how long each named startup phase took and prints a report.
+
+        timer = PhaseTimer()
+        with timer.phase("camera"):
+            ...
+        timer.report()
+    """
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.monotonic() - start))
+
+    def add(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def as_dict(self) -> dict:
+        return {name: round(sec, 3) for name, sec in self.phases}
+
+    def report(self, title: str = "Startup timing"):
+        total = time.monotonic() - self.t0
+        print(f"⏱  {title} ({total:.2f}s total):")
+        width = max((len(name) for name, _ in self.phases), default=0)
+        for name, sec in self.phases:
+            print(f"    {name:<{width}}  {sec * 1000:8.1f} ms")
+
+
+class SpanTimer:
+    """
+    Latency marks and spans for one interaction, in ms.
+
+    Marks are offsets from `origin` — the monotonic timestamp of the camera
+    frame that triggered the interaction when there is one — so they read
+    as "time since the visitor was on camera".  Only the first mark of a
+    name counts.  Spans are plain durations.
+
+        spans = SpanTimer(origin=frame_ts)
+        spans.mark("person")
+        with spans.span("capture"):
+            ...
+        spans.as_dict()   # {"marks_ms": {...}, "spans_ms": {...}}
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.monotonic()
+        self.marks: Dict[str, float] = {}
+        self.spans: Dict[str, float] = {}
+
+    def mark(self, name: str, at: Optional[float] = None):
+        if name not in self.marks:
+            at = at if at is not None else time.monotonic()
+            self.marks[name] = (at - self.origin) * 1000
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] = seconds * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            "marks_ms": {k: round(v, 1) for k, v in self.marks.items()},
+            "spans_ms": {k: round(v, 1) for k, v in self.spans.items()},
+        }
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    pos  = (len(ordered) - 1) * pct / 100
+    lo   = int(pos)
+    hi   = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+class RollingStats:
+    """Rolling p50/p95 of named latencies over the last `window` samples."""
+
+    def __init__(self, window: int = 100):
+        self.window  = window
+        self.samples: Dict[str, deque] = {}
+
+    def add(self, name: str, ms: float):
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.window)
+        self.samples[name].append(ms)
+
+    def add_spans(self, spans: SpanTimer):
+        for name, ms in spans.marks.items():
+            self.add(name, ms)
+        for name, ms in spans.spans.items():
+            self.add(name, ms)
+
+    def summary(self, names: Optional[Iterable[str]] = None) -> dict:
+        out = {}
+        for name in (names if names is not None else sorted(self.samples)):
+            vals = self.samples.get(name)
+            if not vals:
+                continue
+            ordered = sorted(vals)
+            out[name] = {
+                "n":   len(ordered),
+                "p50": round(_percentile(ordered, 50), 1),
+                "p95": round(_percentile(ordered, 95), 1),
+                "max": round(ordered[-1], 1),
+            }
+        return out
+
+    def log_line(self, names: Iterable[str]) -> str:
+        parts = [
+            f"{name} p50={s['p50']:.0f} p95={s['p95']:.0f}"
+            for name, s in self.summary(names).items()
+        ]
+        return "⏱  " + (" | ".join(parts) if parts else "no samples yet") + " (ms)"
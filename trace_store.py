@@ -0,0 +1,253 @@
+"""
+Background trace storage for the Halloween Roaster.
+
+`run_interaction` used to write an image plus an indented JSON file per
+visitor on the interaction path, leaving thousands of loose files that
+had to be opened one by one to find anything.  Traces now go through a
+bounded queue to a writer thread that, once per batch:
+
+  - writes each costume JPEG to `images/<id>.jpg` (bytes as uploaded),
+  - appends the records to the current `roasts_*.jsonl` segment, rotated
+    once it passes `rotate_bytes`,
+  - adds one row per record to `index.sqlite3` — timestamp, mode,
+    exchanges_count and where the record lives — in a single transaction.
+
+`query()` and `load()` read the index and seek straight to a record, so
+nothing ever has to scan the segments.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+INDEX_FILE = "index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    id              TEXT PRIMARY KEY,
+    timestamp       TEXT NOT NULL,
+    mode            TEXT,
+    exchanges_count INTEGER,
+    segment         TEXT NOT NULL,
+    offset          INTEGER NOT NULL,
+    length          INTEGER NOT NULL,
+    image           TEXT
+);
+CREATE INDEX IF NOT EXISTS traces_ts   ON traces (timestamp);
+CREATE INDEX IF NOT EXISTS traces_mode ON traces (mode, exchanges_count);
+"""
+
+
+def new_trace_id() -> str:
+    """Unique, time-ordered id shared by a trace and its image/audio files."""
+    return "roast_" + datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+class TraceWriter:
+    """
+    Bounded, batched trace sink with a writer thread.
+
+    `submit()` never blocks the caller: when the queue is full the trace is
+    dropped and counted.  `close()` drains everything still queued.
+
+    Args:
+        root:         Directory holding segments, images and the index.
+        max_queue:    Traces that may wait for the writer.
+        batch_size:   Most traces written per transaction.
+        rotate_bytes: Start a new JSONL segment past this size.
+    """
+
+    def __init__(
+        self,
+        root,
+        max_queue: int = 64,
+        batch_size: int = 16,
+        rotate_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.root         = Path(root)
+        self.batch_size   = batch_size
+        self.rotate_bytes = rotate_bytes
+        (self.root / "images").mkdir(parents=True, exist_ok=True)
+
+        self._q: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._segment = None      # open file object of the current segment
+        self._db      = None      # sqlite3 connection, owned by the writer thread
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    # --------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything submitted so far is on disk."""
+        if self._thread is None:
+            return False
+        done = threading.Event()
+        try:
+            self._q.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        if self._thread is None:
+            return
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {"written": self.written, "dropped": self.dropped, "batches": self.batches}
+
+    # --------------------------------------------------------------------
+    # Producer API
+    # --------------------------------------------------------------------
+
+    def submit(
+        self, data: dict, jpeg: Optional[bytes] = None, trace_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Queue one trace. Returns its id, or None if it had to be dropped."""
+        trace_id = trace_id or new_trace_id()
+        try:
+            self._q.put_nowait(("trace", trace_id, data, jpeg))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return trace_id
+
+    # --------------------------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------------------------
+
+    def _run(self):
+        self._db = sqlite3.connect(str(self.root / INDEX_FILE))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._q.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                traces  = [item for item in batch if item is not None and item[0] == "trace"]
+                waiters = [item[1] for item in batch if item is not None and item[0] == "flush"]
+                stopping = any(item is None for item in batch)
+                if traces:
+                    try:
+                        self._write_batch(traces)
+                    except Exception as exc:   # keep the writer alive; the night goes on
+                        print(f"  ⚠️  Trace write failed: {exc}")
+                for evt in waiters:
+                    evt.set()
+        finally:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._db.close()
+
+    def _write_batch(self, traces: list):
+        rows = []
+        for _, trace_id, data, jpeg in traces:
+            image = None
+            if jpeg:
+                image = f"images/{trace_id}.jpg"
+                (self.root / image).write_bytes(jpeg)
+
+            record = dict(data, id=trace_id, image=image)
+            line   = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            seg    = self._segment_for(len(line))
+            offset = seg.tell()
+            seg.write(line)
+            rows.append((
+                trace_id, data.get("timestamp", ""), data.get("mode"),
+                data.get("exchanges_count"), Path(seg.name).name, offset, len(line), image,
+            ))
+
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        with self._db:
+            self._db.executemany("INSERT INTO traces VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.written += len(rows)
+        self.batches += 1
+
+    def _segment_for(self, nbytes: int):
+        seg = self._segment
+        if seg is not None and seg.tell() + nbytes > self.rotate_bytes and seg.tell() > 0:
+            seg.close()
+            seg = None
+        if seg is None:
+            name = "roasts_" + datetime.now().strftime("%Y%m%d_%H%M%S_%f") + ".jsonl"
+            seg  = open(self.root / name, "ab")
+            self._segment = seg
+        return seg
+
+
+# ----------------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------------
+
+def query(
+    root,
+    mode: Optional[str] = None,
+    min_exchanges: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Look traces up in the index (no segment scanning).  `since` / `until`
+    are ISO timestamps compared as strings.  Rows come back oldest first.
+    """
+    sql, args = "SELECT * FROM traces WHERE 1=1", []
+    if mode is not None:
+        sql += " AND mode = ?"
+        args.append(mode)
+    if min_exchanges is not None:
+        sql += " AND exchanges_count >= ?"
+        args.append(min_exchanges)
+    if since is not None:
+        sql += " AND timestamp >= ?"
+        args.append(since)
+    if until is not None:
+        sql += " AND timestamp < ?"
+        args.append(until)
+    sql += " ORDER BY timestamp"
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(limit)
+
+    db = sqlite3.connect(str(Path(root) / INDEX_FILE))
+    db.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in db.execute(sql, args)]
+    finally:
+        db.close()
+
+
+def load(root, row: dict) -> dict:
+    """Read the full trace record an index row points at."""
+    with open(Path(root) / row["segment"], "rb") as f:
+        f.seek(row["offset"])
+        return json.loads(f.read(row["length"]))
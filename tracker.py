@@ -0,0 +1,261 @@
+"""
+Visitor tracking for the Halloween Roaster.
+
+YOLO only says "there is a person in this frame".  The tracker ties those
+boxes together over time so an interaction is triggered once per visitor
+instead of once per cooldown window: someone lingering on the porch keeps
+their track and isn't roasted twice, while a new group walking up right
+after them gets new tracks and their own roast.
+
+Boxes are matched frame to frame by IoU, backed by a cheap appearance
+embedding (colour histograms of the upper and lower half of the box) that
+bridges missed detections and quick moves.  Tracks that leave the scene
+are kept in a bounded LRU for a while, so a visitor who is briefly out of
+frame — or simply unobserved while detection is paused for their roast —
+is recognised when they reappear.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from motion import Box
+
+EMBED_DIM = 128          # 2 halves × 4×4×4 BGR bins
+
+
+def iou(a: Box, b: Box) -> float:
+    """Intersection over union of two (x0, y0, x1, y1) boxes."""
+    ix = min(a[2], b[2]) - max(a[0], b[0])
+    iy = min(a[3], b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def appearance(bgr: np.ndarray, box: Box, samples: int = 2048) -> np.ndarray:
+    """
+    L2-normalised colour signature of `box` within `bgr`.  The box is
+    sampled on a sparse grid (~`samples` pixels), so the cost doesn't grow
+    with how close the visitor stands.
+    """
+    fh, fw = bgr.shape[:2]
+    x0, y0 = max(0, int(box[0])), max(0, int(box[1]))
+    x1, y1 = min(fw, int(box[2])), min(fh, int(box[3]))
+    if x1 - x0 < 1 or y1 - y0 < 2:
+        return np.zeros(EMBED_DIM, np.float32)
+    step  = max(1, int(np.sqrt((x1 - x0) * (y1 - y0) / samples)))
+    patch = bgr[y0:y1:step, x0:x1:step] >> 6          # 4 levels per channel
+    idx   = (patch[..., 0].astype(np.intp) << 4) | (patch[..., 1] << 2) | patch[..., 2]
+    mid   = max(1, idx.shape[0] // 2)                   # costume top / bottom
+    vec   = np.concatenate([
+        np.bincount(idx[:mid].ravel(), minlength=64),
+        np.bincount(idx[mid:].ravel(), minlength=64),
+    ]).astype(np.float32)
+    np.sqrt(vec, out=vec)                               # damp the dominant colour
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class Track:
+    """One visitor as seen over time."""
+
+    __slots__ = ("id", "box", "embedding", "confidence",
+                 "first_seen", "last_seen", "hits", "roasted")
+
+    def __init__(self, track_id: int, ts: float, box: Box, embedding: np.ndarray,
+                 confidence: float):
+        self.id         = track_id
+        self.box        = box
+        self.embedding  = embedding
+        self.confidence = confidence
+        self.first_seen = ts
+        self.last_seen  = ts
+        self.hits       = 1
+        self.roasted    = False
+
+    def observe(self, ts: float, box: Box, embedding: np.ndarray, confidence: float):
+        self.box        = box
+        self.confidence = confidence
+        self.last_seen  = ts
+        self.hits      += 1
+        # Slow-moving average: one odd frame (arm across the body) doesn't
+        # overwrite who this is
+        emb  = 0.7 * self.embedding + 0.3 * embedding
+        norm = np.linalg.norm(emb)
+        self.embedding = emb / norm if norm else emb
+
+
+class PersonTracker:
+    """
+    IoU + appearance tracker with a bounded memory of departed visitors.
+
+    Args:
+        iou_threshold:    Minimum IoU to continue a track frame to frame.
+        match_similarity: Appearance similarity an IoU match must also reach.
+        reid_similarity:  Similarity that matches without overlap (a quick
+                          move, or a visitor coming back from memory).
+        min_hits:         Detections before a track counts as a visitor.
+        max_lost:         Seconds unseen before a track moves to memory.
+        memory:           Departed tracks remembered (least recent dropped).
+        forget_after:     Seconds after which a departed visitor counts as
+                          new again.
+
+    Thread-safe: the detection thread updates it, the roaster marks tracks
+    as roasted.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        match_similarity: float = 0.5,
+        reid_similarity: float = 0.9,
+        min_hits: int = 1,
+        max_lost: float = 2.0,
+        memory: int = 64,
+        forget_after: float = 900.0,
+    ):
+        self.iou_threshold    = iou_threshold
+        self.match_similarity = match_similarity
+        self.reid_similarity  = reid_similarity
+        self.min_hits         = min_hits
+        self.max_lost         = max_lost
+        self.memory_size      = memory
+        self.forget_after     = forget_after
+
+        self.active: List[Track] = []
+        self.memory: "OrderedDict[int, Track]" = OrderedDict()
+        self._next_id = 1
+        self._lock    = threading.Lock()
+
+        self.created   = 0
+        self.revived   = 0
+        self.forgotten = 0
+
+    # --------------------------------------------------------------------
+    # Updates (detection thread)
+    # --------------------------------------------------------------------
+
+    def update(
+        self,
+        ts: float,
+        boxes: Sequence[Box],
+        embeddings: Sequence[np.ndarray],
+        confidences: Optional[Sequence[float]] = None,
+    ) -> List[Track]:
+        """Feed one frame's person boxes; returns the track of each box."""
+        confidences = confidences if confidences is not None else [1.0] * len(boxes)
+        with self._lock:
+            self._expire(ts)
+
+            # Greedy assignment, best (IoU + similarity) pairs first
+            pairs = []
+            for ti, track in enumerate(self.active):
+                for di, (box, emb) in enumerate(zip(boxes, embeddings)):
+                    overlap = iou(track.box, box)
+                    sim     = float(track.embedding @ emb)
+                    if ((overlap >= self.iou_threshold and sim >= self.match_similarity)
+                            or sim >= self.reid_similarity):
+                        pairs.append((overlap + sim, ti, di))
+            pairs.sort(reverse=True)
+
+            assigned: List[Optional[Track]] = [None] * len(boxes)
+            used = set()
+            for _, ti, di in pairs:
+                if ti in used or assigned[di] is not None:
+                    continue
+                used.add(ti)
+                assigned[di] = self.active[ti]
+
+            for di, (box, emb, conf) in enumerate(zip(boxes, embeddings, confidences)):
+                track = assigned[di]
+                if track is None:
+                    track = self._revive(box, emb)
+                    if track is None:
+                        track = Track(self._next_id, ts, box, emb, conf)
+                        self._next_id += 1
+                        self.created  += 1
+                        self.active.append(track)
+                        assigned[di] = track
+                        continue
+                track.observe(ts, box, emb, conf)
+                assigned[di] = track
+            return assigned
+
+    def _revive(self, box: Box, emb: np.ndarray) -> Optional[Track]:
+        """
+        Bring back the best-matching remembered visitor: one who looks the
+        same, or who is standing where they were last seen (e.g. right
+        through their own roast) and looks similar.
+        """
+        best, best_score = None, 0.0
+        for track in self.memory.values():
+            sim = float(track.embedding @ emb)
+            if sim < self.reid_similarity and not (
+                    sim >= self.match_similarity and iou(track.box, box) >= 0.5):
+                continue
+            if sim > best_score:
+                best, best_score = track, sim
+        if best is None:
+            return None
+        del self.memory[best.id]
+        self.active.append(best)
+        self.revived += 1
+        return best
+
+    def _expire(self, ts: float):
+        still = []
+        for track in self.active:
+            if ts - track.last_seen > self.max_lost:
+                self.memory[track.id] = track
+                self.memory.move_to_end(track.id)
+            else:
+                still.append(track)
+        self.active = still
+        # Oldest departures first: drop the ones past `forget_after` and
+        # anything beyond the memory bound
+        while self.memory:
+            oldest = next(iter(self.memory.values()))
+            if len(self.memory) <= self.memory_size and ts - oldest.last_seen <= self.forget_after:
+                break
+            self.memory.popitem(last=False)
+            self.forgotten += 1
+
+    # --------------------------------------------------------------------
+    # Consumer API (roaster)
+    # --------------------------------------------------------------------
+
+    def new_visitors(self) -> List[Track]:
+        """Confirmed tracks on the porch that haven't been roasted yet."""
+        with self._lock:
+            return [t for t in self.active if not t.roasted and t.hits >= self.min_hits]
+
+    def present(self, now: float) -> int:
+        """
+        Tracks still on the porch at `now`.  `update` only runs when YOLO
+        sees someone, so departures are settled here by the clock too.
+        """
+        with self._lock:
+            self._expire(now)
+            return len(self.active)
+
+    def mark_roasted(self, track_ids: Optional[Sequence[int]] = None):
+        """Mark the given tracks (default: everyone on the porch) as roasted."""
+        with self._lock:
+            for track in self.active:
+                if track_ids is None or track.id in track_ids:
+                    track.roasted = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active":     len(self.active),
+                "remembered": len(self.memory),
+                "created":    self.created,
+                "revived":    self.revived,
+                "forgotten":  self.forgotten,
+            }
@@ -0,0 +1,253 @@
+"""
+Voice activity detection for the Halloween Roaster's microphone.
+
+Replaces the fixed `rms > 300` gate with an energy detector whose
+threshold follows an adaptive noise floor, so the same settings work on a
+quiet porch and on a busy street.  Energy is computed into preallocated
+buffers — nothing is allocated per 1024-sample chunk — and hangover
+smoothing keeps short pauses between words from ending the utterance.
+"""
+
+import wave
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def pcm_rms(data: bytes, buf: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    RMS of an int16 PCM chunk, squared in place inside the int32 scratch
+    buffer `buf`.  Returns (rms, buf) — `buf` is only replaced when the
+    chunk is larger than it.
+    """
+    samples = np.frombuffer(data, np.int16)   # view, no copy
+    n = samples.shape[0]
+    if n == 0:
+        return 0.0, buf
+    if n > buf.shape[0]:
+        buf = np.empty(n, np.int32)
+    view = buf[:n]
+    np.copyto(view, samples, casting="unsafe")
+    np.multiply(view, view, out=view)         # int16² fits in int32
+    return float(np.sqrt(view.sum(dtype=np.int64) / n)), buf
+
+
+class VoiceActivityDetector:
+    """
+    Streaming energy VAD with an adaptive noise floor.
+
+    Feed consecutive 16-bit mono PCM chunks to `feed()`; it returns
+    "start" when speech begins, "end" when it has stopped for
+    `hangover_s` seconds, and None otherwise.  `speech_start` and
+    `speech_end` are sample offsets from the last `reset()`.
+
+    Args:
+        rate:          Sample rate in Hz.
+        chunk:         Samples per chunk (buffers are sized for this; larger
+                       chunks are handled, just not allocation-free).
+        ratio:         Speech threshold as a multiple of the noise floor.
+        min_rms:       Threshold never drops below this (mic self-noise).
+        initial_floor: Noise floor assumed before any ambient audio is seen.
+        attack:        Consecutive loud chunks needed to declare speech.
+        hangover_s:    Seconds of quiet that end an utterance.
+    """
+
+    def __init__(
+        self,
+        rate: int = 16000,
+        chunk: int = 1024,
+        ratio: float = 3.0,
+        min_rms: float = 120.0,
+        initial_floor: float = 100.0,
+        attack: int = 2,
+        hangover_s: float = 2.0,
+    ):
+        self.rate        = rate
+        self.chunk       = chunk
+        self.ratio       = ratio
+        self.min_rms     = min_rms
+        self.attack      = attack
+        self.hangover    = max(1, round(hangover_s * rate / chunk))
+        self.noise_floor = float(initial_floor)
+
+        # Floor tracking: falls fast, rises slowly — and even more slowly
+        # while we think someone is talking, so steady street noise that
+        # starts out "loud" is eventually absorbed into the floor.
+        self.alpha_down        = 0.3
+        self.alpha_up          = 0.05
+        self.alpha_up_speech   = 0.005
+
+        self._buf32 = np.empty(chunk, np.int32)
+        self.reset()
+
+    # --------------------------------------------------------------------
+    # State
+    # --------------------------------------------------------------------
+
+    def reset(self, hangover_s: Optional[float] = None):
+        """Start a new utterance. The learned noise floor is kept."""
+        if hangover_s is not None:
+            self.hangover = max(1, round(hangover_s * self.rate / self.chunk))
+        self.samples_seen  = 0
+        self.in_speech     = False
+        self.heard_speech  = False
+        self.speech_start: Optional[int] = None
+        self.speech_end:   Optional[int] = None
+        self.last_rms      = 0.0
+        self._loud_run     = 0
+        self._quiet_run    = 0
+        self._run_start    = 0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_rms, self.noise_floor * self.ratio)
+
+    # --------------------------------------------------------------------
+    # Energy
+    # --------------------------------------------------------------------
+
+    def rms(self, data: bytes) -> float:
+        """RMS of one int16 chunk using the preallocated int32 buffer."""
+        rms, self._buf32 = pcm_rms(data, self._buf32)
+        return rms
+
+    def _update_floor(self, rms: float, speech: bool):
+        if rms < self.noise_floor:
+            alpha = self.alpha_down
+        else:
+            alpha = self.alpha_up_speech if speech else self.alpha_up
+        self.noise_floor += alpha * (rms - self.noise_floor)
+
+    def calibrate(self, data: bytes):
+        """Learn the noise floor from audio known to contain no speech."""
+        step = self.chunk * 2
+        for off in range(0, len(data) - step + 1, step):
+            rms = self.rms(data[off:off + step])
+            self.noise_floor += self.alpha_down * (rms - self.noise_floor)
+
+    # --------------------------------------------------------------------
+    # Streaming
+    # --------------------------------------------------------------------
+
+    def feed(self, data: bytes) -> Optional[str]:
+        """Process one chunk; returns "start", "end" or None."""
+        n     = len(data) // 2
+        start = self.samples_seen
+        self.samples_seen += n
+
+        rms  = self.rms(data)
+        loud = rms > self.threshold
+        self.last_rms = rms
+        self._update_floor(rms, self.in_speech or loud)
+
+        if not self.in_speech:
+            if loud:
+                if self._loud_run == 0:
+                    self._run_start = start
+                self._loud_run += 1
+                if self._loud_run >= self.attack:
+                    self.in_speech    = True
+                    self.heard_speech = True
+                    self.speech_start = self._run_start
+                    self.speech_end   = self.samples_seen
+                    self._quiet_run   = 0
+                    return "start"
+            else:
+                self._loud_run = 0
+            return None
+
+        if loud:
+            self._quiet_run = 0
+            self.speech_end = self.samples_seen
+            return None
+        self._quiet_run += 1
+        if self._quiet_run >= self.hangover:
+            self.in_speech = False
+            self._loud_run = 0
+            return "end"
+        return None
+
+
+class EchoGate:
+    """
+    Barge-in detector for while the speaker is playing.
+
+    The mic hears our own roast through the speaker, so the plain VAD would
+    fire on it.  The gate tracks how loud recent playback was and how much
+    of it leaks into the mic (`coupling`, learned while nobody is talking);
+    the visitor only counts as talking when the mic is clearly louder than
+    that expected echo.
+
+    `note_playback()` is called from the playback thread with each chunk as
+    it is written to the device; `feed()` from the capture side.
+    """
+
+    def __init__(
+        self,
+        vad: VoiceActivityDetector,
+        margin: float = 2.5,
+        attack: int = 3,
+        initial_coupling: float = 0.5,
+        hold_chunks: int = 4,
+    ):
+        self.vad      = vad
+        self.margin   = margin
+        self.attack   = attack
+        self.coupling = initial_coupling
+        self._recent  = deque(maxlen=hold_chunks)   # playback RMS, peak-held
+        self._buf32   = np.empty(2048, np.int32)
+        self._loud_run = 0
+
+    @property
+    def playback_rms(self) -> float:
+        return max(self._recent, default=0.0)
+
+    def note_playback(self, data: bytes):
+        rms, self._buf32 = pcm_rms(data, self._buf32)
+        self._recent.append(rms)
+
+    def reset(self):
+        self._recent.clear()
+        self._loud_run = 0
+
+    def feed(self, data: bytes) -> bool:
+        """True once the visitor is judged to be talking over playback."""
+        rms  = self.vad.rms(data)
+        echo = self.coupling * self.playback_rms
+        if rms > max(self.vad.threshold, echo * self.margin):
+            self._loud_run += 1
+            return self._loud_run >= self.attack
+        self._loud_run = 0
+        if self.playback_rms > self.vad.threshold:
+            # Nobody talking — learn how much of the speaker reaches the mic
+            self.coupling += 0.05 * (rms / self.playback_rms - self.coupling)
+        return False
+
+
+# ----------------------------------------------------------------------------
+# Offline helpers (fixtures / tuning)
+# ----------------------------------------------------------------------------
+
+def segments_from_pcm(
+    pcm: bytes, vad: Optional[VoiceActivityDetector] = None
+) -> List[Tuple[int, int]]:
+    """Run the VAD over a PCM blob and return [(start_sample, end_sample), ...]."""
+    vad  = vad or VoiceActivityDetector()
+    step = vad.chunk * 2
+    segs = []
+    for off in range(0, len(pcm) - step + 1, step):
+        if vad.feed(pcm[off:off + step]) == "end":
+            segs.append((vad.speech_start, vad.speech_end))
+    if vad.in_speech:
+        segs.append((vad.speech_start, vad.speech_end))
+    return segs
+
+
+def segments_from_wav(path, **vad_kwargs) -> List[Tuple[int, int]]:
+    """Run the VAD over a 16-bit mono WAV file (e.g. a recorded porch clip)."""
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono PCM")
+        vad = VoiceActivityDetector(rate=wf.getframerate(), **vad_kwargs)
+        return segments_from_pcm(wf.readframes(wf.getnframes()), vad)